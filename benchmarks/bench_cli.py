@@ -0,0 +1,316 @@
+"""CLI hot paths: window listing, selection parsing and JSON persistence."""
+import builtins
+import contextlib
+import io
+import os
+import tempfile
+
+from harness import benchmark, timeit
+
+SIZES = (100, 1000, 5000)
+
+
+@contextlib.contextmanager
+def scripted_input(answer):
+    original = builtins.input
+    builtins.input = lambda prompt="": answer
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+@contextlib.contextmanager
+def quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _sizes(ctx):
+    return SIZES[:2] if ctx.quick else SIZES
+
+
+@benchmark("cli.list_windows")
+def bench_list_windows(ctx):
+    top_window = ctx.cli()
+    metrics = {}
+    for n in _sizes(ctx):
+        ctx.reset_desktop(n)
+        with quiet():
+            stats = timeit(top_window.list_windows, repeat=ctx.repeat)
+        ctx.desktop.calls.clear()
+        with quiet():
+            top_window.list_windows()
+        metrics["n=%d" % n] = {"wall_s": stats, "native_calls": sum(ctx.desktop.calls.values())}
+    return metrics
+
+
+@benchmark("cli.select_multiple_windows")
+def bench_select_multiple_windows(ctx):
+    top_window = ctx.cli()
+    metrics = {}
+    for n in _sizes(ctx):
+        ctx.reset_desktop(n)
+        with quiet():
+            windows = top_window.list_windows()
+        answer = ",".join(str(i) for i in range(1, len(windows) + 1, 2))
+        with scripted_input(answer), quiet():
+            indices = timeit(lambda: top_window.select_multiple_windows(windows), repeat=ctx.repeat)
+        with scripted_input("all"), quiet():
+            select_all = timeit(lambda: top_window.select_multiple_windows(windows), repeat=ctx.repeat)
+        metrics["n=%d" % n] = {"wall_s": indices, "all_wall_s": select_all}
+    return metrics
+
+
+@benchmark("persistence.json")
+def bench_json_persistence(ctx):
+    top_window = ctx.cli()
+    window_manager = ctx.window_manager_module()
+    titles = ["Window title number %d - Some Application" % i for i in range(200)]
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cli_file = os.path.join(tmp, "cli_data.json")
+        original = top_window.WINDOW_DATA_FILE
+        top_window.WINDOW_DATA_FILE = cli_file
+        try:
+            metrics["cli_save"] = {"wall_s": timeit(lambda: top_window.save_window_data(titles),
+                                                     repeat=ctx.repeat, number=20)}
+            metrics["cli_load"] = {"wall_s": timeit(top_window.load_window_data,
+                                                     repeat=ctx.repeat, number=20)}
+        finally:
+            top_window.WINDOW_DATA_FILE = original
+
+        manager = window_manager.WindowManager(data_file=os.path.join(tmp, "gui_data.json"))
+        metrics["gui_save"] = {"wall_s": timeit(lambda: manager.save_previous_windows(titles),
+                                                 repeat=ctx.repeat, number=20)}
+        metrics["gui_load"] = {"wall_s": timeit(manager.load_previous_windows,
+                                                 repeat=ctx.repeat, number=20)}
+    return metrics
+
+
+@benchmark("state.topmost_watchdog")
+def bench_topmost_watchdog(ctx):
+    top_window = ctx.cli()
+    metrics = {}
+    for pinned in (10, 100):
+        hwnds = ctx.reset_desktop(1000)[:pinned]
+        for hwnd in hwnds:
+            top_window.set_window_always_on_top(top_window.gw.Win32Window(hwnd))
+        watchdog = top_window.watchdog
+        ctx.desktop.calls.clear()
+        watchdog.sweep()
+        quiet_calls = sum(ctx.desktop.calls.values())
+        idle = timeit(watchdog.sweep, repeat=ctx.repeat, number=10)
+
+        def drop_some():
+            for hwnd in hwnds[::10]:
+                ctx.desktop.windows[hwnd].ex_style &= ~0x8
+        fight = timeit(watchdog.sweep, repeat=ctx.repeat, setup=drop_some)
+        metrics["pinned=%d" % pinned] = {"idle_wall_s": idle, "fight_wall_s": fight,
+                                         "idle_native_calls": quiet_calls}
+        watchdog.fight_counts.clear()
+        watchdog._recent_fights.clear()
+    return metrics
+
+
+@benchmark("state.reaper")
+def bench_reaper(ctx):
+    top_window = ctx.cli()
+    metrics = {}
+    for pinned in (50, 500):
+        hwnds = ctx.reset_desktop(2000)[:pinned]
+        for hwnd in hwnds:
+            top_window.set_window_always_on_top(top_window.gw.Win32Window(hwnd))
+        idle = timeit(top_window.reaper.sweep, repeat=ctx.repeat)
+        # Close half of the pinned windows and let Windows reuse one handle
+        for hwnd in hwnds[::2]:
+            ctx.desktop.destroy_window(hwnd)
+        ctx.desktop.reuse_hwnd(hwnds[1], "Reused handle")
+        live = len(hwnds) // 2 - 1
+        ctx.desktop.calls.clear()
+        with quiet():
+            top_window.restore_all_windows()
+        metrics["pinned=%d" % pinned] = {
+            "idle_sweep_wall_s": idle,
+            "restore_set_window_pos_calls": ctx.desktop.calls["win32gui.SetWindowPos"],
+            "wasted_native_calls": ctx.desktop.calls["win32gui.SetWindowPos"] - live,
+            "left_pinned": len(top_window.topmost_windows),
+        }
+    return metrics
+
+
+@benchmark("cli.scripted_pin")
+def bench_scripted_pin(ctx):
+    import io
+    top_window = ctx.cli()
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        original = top_window.WINDOW_DATA_FILE
+        top_window.WINDOW_DATA_FILE = os.path.join(tmp, "cli_data.json")
+        try:
+            for n in _sizes(ctx):
+                ctx.reset_desktop(n)
+                argv = ["pin", "-e", "notepad.exe", "-e", "slack*", "--title", "/[02468]$/"]
+                stats = timeit(lambda: top_window.run_command(argv, out=io.StringIO()), repeat=ctx.repeat)
+                ctx.desktop.calls.clear()
+                top_window.run_command(argv, out=io.StringIO())
+                metrics["n=%d" % n] = {
+                    "wall_s": stats,
+                    "enumerations": ctx.desktop.calls["pygetwindow.getAllWindows"],
+                    "native_calls": sum(ctx.desktop.calls.values()),
+                }
+        finally:
+            top_window.WINDOW_DATA_FILE = original
+    return metrics
+
+
+@benchmark("hotkey.toggle_latency")
+def bench_hotkey_latency(ctx):
+    """Press-to-pinned latency of the hotkey path must not depend on the window count."""
+    from gui.hotkey import HotkeyService
+    top_window = ctx.cli()
+    window_manager = ctx.window_manager_module()
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        original = top_window.WINDOW_DATA_FILE
+        top_window.WINDOW_DATA_FILE = os.path.join(tmp, "cli_data.json")
+        try:
+            for n in ((10, 1000) if ctx.quick else (10, 1000, 10000)):
+                hwnds = ctx.reset_desktop(n)
+                ctx.desktop.foreground = hwnds[n // 2]
+                manager = window_manager.WindowManager(data_file=os.path.join(tmp, "gui_data.json"))
+                cli = HotkeyService(top_window.toggle_foreground_window)
+                gui = HotkeyService(manager.toggle_foreground)
+                with quiet():
+                    for _ in range(20):
+                        cli.handle_press()
+                        gui.handle_press()
+                metrics["n=%d" % n] = {"cli_median_ms": cli.stats()["median_ms"], "cli_max_ms": cli.stats()["max_ms"],
+                                       "gui_median_ms": gui.stats()["median_ms"], "gui_max_ms": gui.stats()["max_ms"]}
+        finally:
+            top_window.WINDOW_DATA_FILE = original
+    return metrics
+
+
+@benchmark("profile.switch")
+def bench_profile_switch(ctx):
+    """Switch between two saved profiles: one enumeration and one batch per switch."""
+    top_window = ctx.cli()
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        original = top_window.WINDOW_DATA_FILE
+        top_window.WINDOW_DATA_FILE = os.path.join(tmp, "cli_data.json")
+        try:
+            for n in ((100, 1000) if ctx.quick else (100, 1000, 5000)):
+                ctx.reset_desktop(n)
+                sink = io.StringIO()
+                for name, exe in (("coding", "chrome*"), ("meeting", "notepad*")):
+                    top_window.run_command(["pin", "-e", exe], out=sink)
+                    top_window.run_command(["profile", "save", name, "-e", exe], out=sink)
+                    top_window.run_command(["restore-all"], out=sink)
+                flip = iter(("coding", "meeting") * 1000)
+                ctx.desktop.calls.clear()
+                stats = timeit(lambda: top_window.run_command(["profile", "apply", next(flip)], out=io.StringIO()),
+                               repeat=ctx.repeat, number=1)
+                switches = stats["runs"]
+                metrics["n=%d" % n] = {
+                    "switch_s": stats,
+                    "windows_per_profile": n // 8,
+                    "enumerations_per_switch": ctx.desktop.calls["pygetwindow.getAllWindows"] / switches,
+                    "setwindowpos_per_switch": ctx.desktop.calls["win32gui.SetWindowPos"] / switches,
+                }
+        finally:
+            top_window.WINDOW_DATA_FILE = original
+    return metrics
+
+
+@benchmark("async.concurrent_pin")
+def bench_async_pin(ctx):
+    """Hundreds of concurrent pin() coroutines: enumerations, batches and event-loop lag."""
+    import asyncio
+    import time
+    from gui.async_api import AsyncWindows
+
+    async def scenario(hwnds, concurrent):
+        lags = []
+        done = asyncio.Event()
+
+        async def ticker():  # döngü ne kadar geç uyanıyor
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - start - 0.001)
+
+        async with AsyncWindows(max_concurrency=8) as api:
+            tick = asyncio.ensure_future(ticker())
+            start = time.perf_counter()
+            results = await asyncio.gather(*(api.pin(h) for h in hwnds[:concurrent]))
+            pin_s = time.perf_counter() - start
+            listed = await api.list_windows("notepad*")
+            start = time.perf_counter()
+            unpinned = await api.unpin()
+            unpin_s = time.perf_counter() - start
+            done.set()
+            await tick
+            return {
+                "pin_all_s": pin_s,
+                "unpin_all_s": unpin_s,
+                "pinned_ok": sum(1 for r in results for w in r if w["ok"]),
+                "unpinned": len(unpinned),
+                "listed_notepad": len(listed),
+                "enumerations": api.enumerations,
+                "max_loop_lag_ms": max(lags) * 1000 if lags else 0.0,
+            }
+
+    metrics = {}
+    for n in ((1000,) if ctx.quick else (1000, 5000)):
+        hwnds = ctx.reset_desktop(n)
+        ctx.desktop.calls.clear()
+        case = asyncio.run(scenario(hwnds, 300))
+        case["setwindowpos_calls"] = ctx.desktop.calls["win32gui.SetWindowPos"]
+        metrics["n=%d" % n] = case
+    return metrics
+
+
+@benchmark("trace.replay")
+def bench_trace_replay(ctx):
+    """Record a Teams rename storm with TraceRecorder, then replay it event by event."""
+    import random
+    import replay
+    from gui.window_events import WindowWatcher
+    from gui.window_trace import TraceRecorder, read_trace
+
+    rng = random.Random(7)
+    metrics = {}
+    for n in ((200,) if ctx.quick else (200, 2000)):
+        hwnds = ctx.reset_desktop(n)
+        path = os.path.join(tempfile.mkdtemp(), "storm.jsonl.gz")
+        recorder = TraceRecorder(path)
+        watcher = WindowWatcher()
+        watcher.windows = watcher.snapshot()
+        teams = [h for h in hwnds if ctx.desktop.windows[h].exe_path.endswith("Teams.exe")]
+        recorder.snapshot(watcher.windows, pinned=teams[:3])  # CLI'dan devralınanlar
+        watcher.subscribe(recorder.on_window_event)
+        for i in range(2000):
+            hwnd = rng.choice(teams)
+            ctx.desktop.rename_window(hwnd, "Chat (%d) | Microsoft Teams" % i)  # okunmamış sayacı
+            watcher.update(hwnd)
+            if i % 50 == 0:
+                recorder.command(hwnd, True)
+                recorder.style(hwnd, False)
+            if i % 200 == 0:
+                new = ctx.desktop.add_window("Meeting %d | Microsoft Teams" % i,
+                                             "C:\\Program Files\\Teams.exe", "TeamsWebView")
+                watcher.update(new)
+                ctx.desktop.destroy_window(new)
+                watcher.update(new)
+        recorder.close()
+        header, events = read_trace(path)
+        report = replay.Replay(ctx.desktop)
+        snapshot, timed = replay.split_trace(events)
+        report.load(snapshot)
+        case = report.run(timed)
+        case["trace_bytes"] = os.path.getsize(path)
+        case["recorded_events"] = recorder.count
+        metrics["n=%d" % n] = case
+    return metrics
@@ -0,0 +1,687 @@
+"""GUI hot paths: grid refresh, hover animations and the icon cache."""
+import contextlib
+import os
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+
+from harness import benchmark, timeit
+
+SIZES = (20, 100, 400)
+
+
+def _sizes(ctx):
+    return SIZES[:2] if ctx.quick else SIZES
+
+
+def pump(root, duration):
+    """Run the Tk event loop for ``duration`` seconds without entering mainloop."""
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        root.update()
+        time.sleep(0.001)
+
+
+@contextlib.contextmanager
+def count_after_callbacks():
+    """Count ``after`` registrations and how many of those callbacks actually ran."""
+    counts = {"scheduled": 0, "executed": 0}
+    original = tk.Misc.after
+
+    def counting_after(self, ms, func=None, *args):
+        if func is None:
+            return original(self, ms)
+        counts["scheduled"] += 1
+
+        def wrapped(*a):
+            counts["executed"] += 1
+            return func(*a)
+        return original(self, ms, wrapped, *args)
+
+    tk.Misc.after = counting_after
+    try:
+        yield counts
+    finally:
+        tk.Misc.after = original
+
+
+@benchmark("gui.refresh", gui=True)
+def bench_refresh(ctx):
+    app = ctx.gui_app()
+    metrics = {}
+    for n in _sizes(ctx):
+        ctx.reset_desktop(n)
+        app._refresh()
+        stats = timeit(app._refresh, repeat=max(3, ctx.repeat // 2))
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        app._refresh()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        stat_diff = after.compare_to(before, "filename")
+        metrics["n=%d" % n] = {
+            "wall_s": stats,
+            "alloc_peak_bytes": peak,
+            "alloc_net_bytes": sum(s.size_diff for s in stat_diff),
+            "alloc_net_blocks": sum(s.count_diff for s in stat_diff),
+        }
+    return metrics
+
+
+@benchmark("gui.grouped_view", gui=True)
+def bench_grouped_view(ctx):
+    """Per-window grid vs. one card per app: refresh time and widget count."""
+    app = ctx.gui_app()
+    metrics = {}
+    try:
+        for n in _sizes(ctx):
+            ctx.reset_desktop(n)
+            case = {}
+            for grouped in (False, True):
+                app._set_grouped(grouped)
+                name = "grouped" if grouped else "flat"
+                case[name + "_refresh_s"] = timeit(app._refresh, repeat=max(3, ctx.repeat // 2))
+                case[name + "_cards"] = len(app.scroll_frame.winfo_children())
+            group = next(iter(app._groups.values()))
+            start = time.perf_counter()
+            group._minimize_window(None)  # sağ tık: genişlet
+            app.root.update_idletasks()
+            case["expand_s"] = time.perf_counter() - start
+            case["expanded_cards"] = len(app.scroll_frame.winfo_children())
+            ctx.desktop.calls.clear()
+            group._on_click(None)
+            case["batch_pin_setwindowpos"] = ctx.desktop.calls["win32gui.SetWindowPos"]
+            case["batch_pinned"] = sum(1 for e in group.entries if e.hwnd in app.manager.topmost_hwnds)
+            metrics["n=%d" % n] = case
+    finally:
+        app._set_grouped(False)
+        app.manager.topmost_hwnds.clear()
+    return metrics
+
+
+@benchmark("gui.layout_transaction", gui=True)
+def bench_layout_transaction(ctx):
+    """Populate 10..2000 cards with and without the layout transaction: time per card and layout passes."""
+    app = ctx.gui_app()
+    counts = {"configure": 0, "scrollregion": 0}
+    binding = app.scroll_frame.bind("<Configure>")
+    app.scroll_frame.bind("<Configure>", lambda e: counts.__setitem__("configure", counts["configure"] + 1), add="+")
+    update = app._update_scrollregion
+
+    def counted_update():
+        counts["scrollregion"] += 1
+        update()
+    app._update_scrollregion = counted_update
+
+    def populate():
+        app._refresh()
+        app.root.update_idletasks()
+
+    metrics = {}
+    sizes = (10, 100, 500) if ctx.quick else (10, 100, 500, 2000)
+    try:
+        for n in sizes:
+            ctx.reset_desktop(n)
+            case = {}
+            for batched in (True, False):
+                name = "batched" if batched else "per_card"
+                if batched:
+                    app.__dict__.pop("layout_transaction", None)
+                    app.__dict__.pop("_schedule_scrollregion", None)
+                else:
+                    # Eski davranış: her <Configure> hemen scrollregion'ı yeniden hesaplar
+                    app.layout_transaction = contextlib.nullcontext
+                    app._schedule_scrollregion = app._update_scrollregion
+                populate()
+                counts.update(configure=0, scrollregion=0)
+                stats = timeit(populate, repeat=max(3, ctx.repeat // 2))
+                runs = stats["runs"]
+                case[name + "_s"] = stats
+                case[name + "_per_card_us"] = stats["median"] / n * 1e6
+                case[name + "_configure_events"] = counts["configure"] / runs
+                case[name + "_scrollregion_updates"] = counts["scrollregion"] / runs
+            metrics["n=%d" % n] = case
+    finally:
+        app.__dict__.pop("layout_transaction", None)
+        app.__dict__.pop("_schedule_scrollregion", None)
+        app.__dict__.pop("_update_scrollregion", None)
+        app.scroll_frame.bind("<Configure>", binding)
+    first, last = metrics["n=%d" % sizes[1]], metrics["n=%d" % sizes[-1]]
+    # 1.0 = doğrusal; ilk boyut sabit maliyet taşıdığı için 100'den ölçülür
+    metrics["per_card_growth_batched"] = last["batched_per_card_us"] / first["batched_per_card_us"]
+    metrics["per_card_growth_per_card"] = last["per_card_per_card_us"] / first["per_card_per_card_us"]
+    return metrics
+
+
+@benchmark("gui.hover_animation", gui=True)
+def bench_hover_animation(ctx):
+    app = ctx.gui_app()
+    ctx.reset_desktop(8)
+    app._refresh()
+    pump(app.root, 0.3)
+    cards = [w for w in app.scroll_frame.winfo_children() if hasattr(w, "card")]
+    card = cards[0]
+    with count_after_callbacks() as single:
+        card._on_enter(None)
+        card._on_leave(None)
+        pump(app.root, 0.6)
+    with count_after_callbacks() as sweep:
+        for c in cards:
+            c._on_enter(None)
+            c._on_leave(None)
+        pump(app.root, 0.6)
+    # Aynı tarama, animations=false ile (VDI ayarı)
+    app.config.update({"animations": False})
+    try:
+        with count_after_callbacks() as still:
+            for c in cards:
+                c._on_enter(None)
+                c._on_leave(None)
+            pump(app.root, 0.6)
+    finally:
+        app.config.update({"animations": True})
+    return {
+        "single_hover": {"after_scheduled": single["scheduled"], "after_executed": single["executed"]},
+        "sweep_%d_cards" % len(cards): {"after_scheduled": sweep["scheduled"],
+                                         "after_executed": sweep["executed"]},
+        "sweep_animations_off": {"after_scheduled": still["scheduled"], "after_executed": still["executed"]},
+    }
+
+
+@benchmark("gui.icon_cache", gui=True)
+def bench_icon_cache(ctx):
+    app = ctx.gui_app()
+    manager = app.manager
+    counts = {"hits": 0, "misses": 0}
+    original = manager.get_window_icon
+
+    def counting_get_window_icon(hwnd):
+        counts["hits" if hwnd in manager.icon_cache else "misses"] += 1
+        return original(hwnd)
+
+    ctx.reset_desktop(100)
+    manager.icon_cache.clear()
+    manager.get_window_icon = counting_get_window_icon
+    try:
+        app._refresh()
+        cold = dict(counts)
+        app._refresh()
+    finally:
+        del manager.get_window_icon
+    warm_hits = counts["hits"] - cold["hits"]
+    warm_total = warm_hits + counts["misses"] - cold["misses"]
+    total = counts["hits"] + counts["misses"]
+    return {
+        "refresh_x2": {
+            "hit_rate": counts["hits"] / total if total else 0.0,
+            "warm_hit_rate": warm_hits / warm_total if warm_total else 0.0,
+            "cache_entries": len(manager.icon_cache),
+        }
+    }
+
+
+@benchmark("gui.drag", gui=True)
+def bench_drag(ctx):
+    """Replay a 1000 Hz mouse drag and count geometry updates and window-system queries."""
+    import types
+    app = ctx.gui_app()
+    root = app.root
+    counts = {"geometry": 0, "winfo": 0}
+    original_geometry, original_x, original_y = root.geometry, root.winfo_x, root.winfo_y
+
+    def geometry(*args):
+        if args:
+            counts["geometry"] += 1
+        return original_geometry(*args)
+
+    def winfo(fn):
+        def wrapper():
+            counts["winfo"] += 1
+            return fn()
+        return wrapper
+
+    root.geometry, root.winfo_x, root.winfo_y = geometry, winfo(original_x), winfo(original_y)
+    try:
+        samples = 500
+        start = time.perf_counter()
+        app._start_drag(types.SimpleNamespace(x=10, y=10, x_root=110, y_root=110))
+        for i in range(samples):
+            app._do_drag(types.SimpleNamespace(x=10 + i, y=10, x_root=110 + i, y_root=110))
+            root.update()
+            time.sleep(0.001)
+        app._stop_drag(types.SimpleNamespace(x=10, y=10, x_root=110 + samples, y_root=110))
+        elapsed = time.perf_counter() - start
+        queries_during_drag = counts["winfo"]
+        pump(root, 0.8)
+    finally:
+        del root.geometry, root.winfo_x, root.winfo_y
+    return {"samples=%d" % samples: {
+        "geometry_updates": counts["geometry"],
+        "winfo_queries_during_drag": queries_during_drag,
+        "winfo_queries_total": counts["winfo"],
+        "drag_wall_s": elapsed,
+    }}
+
+
+@benchmark("gui.thumbnails")
+def bench_thumbnails(ctx):
+    """Background thumbnail refresh must stay inside its CPU share and byte budget."""
+    from PIL import Image
+    from gui.thumbnails import ThumbnailCache
+
+    def fake_capture(hwnd, cost_s=0.004):
+        end = time.thread_time() + cost_s
+        while time.thread_time() < end:
+            pass
+        return Image.new("RGB", (220, 140))
+
+    metrics = {}
+    for share in (0.05, 0.2):
+        cache = ThumbnailCache(capture=fake_capture, max_bytes=10 * 220 * 140 * 3,
+                               refresh_interval=0.2, cpu_share=share)
+        cache.set_visible(range(1, 21))
+        cache.start()
+        duration = 1.0 if ctx.quick else 3.0
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            for hwnd in range(1, 6):  # hovered cards
+                cache.request(hwnd)
+            time.sleep(0.05)
+        cache.stop()
+        stats = cache.stats()
+        metrics["share=%.2f" % share] = {
+            "cpu_share": stats["cpu_share"],
+            "captures": stats.get("captures", 0),
+            "bytes": stats["bytes"],
+            "budget_bytes": cache.max_bytes,
+            "evicted": stats.get("evicted", 0),
+            "hit_rate": stats.get("hits", 0) / max(stats.get("hits", 0) + stats.get("misses", 0), 1),
+        }
+    return metrics
+
+
+@benchmark("gui.handoff", gui=True)
+def bench_handoff(ctx):
+    """CLI menu -> GUI switch in-process vs. the old approach of spawning a new interpreter."""
+    import subprocess
+    import sys
+    top_window = ctx.cli()
+    metrics = {}
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import tkinter, PIL.Image, pystray"], capture_output=True)
+    metrics["subprocess_baseline_s"] = time.perf_counter() - start
+
+    for pinned in (5, 50):
+        hwnds = ctx.reset_desktop(200)[:pinned]
+        for hwnd in hwnds:
+            top_window.set_window_always_on_top(top_window.gw.Win32Window(hwnd))
+        ctx.desktop.calls.clear()
+        app = top_window.handoff_to_gui()
+        try:
+            app.root.update()
+            still_on_top = sum(1 for h in hwnds if app.manager.is_always_on_top(h))
+            metrics["pinned=%d" % pinned] = {
+                "handoff_ms": app.handoff_ms,
+                "setwindowpos_during_switch": ctx.desktop.calls["win32gui.SetWindowPos"],
+                "still_on_top": still_on_top,
+                "adopted": len(app.manager.topmost_hwnds),
+            }
+        finally:
+            app._close()
+            app.root.destroy()
+    return metrics
+
+
+@benchmark("gui.icon_processing")
+def bench_icon_processing(ctx):
+    """Alpha recovery + accent color: one batched NumPy pass vs. one call per icon."""
+    from gui import icon_processing
+    window_manager = ctx.window_manager_module()
+    metrics = {"has_numpy": icon_processing.HAS_NUMPY}
+    for n in ((50, 200) if ctx.quick else (50, 200, 1000)):
+        hwnds = ctx.reset_desktop(n)
+        manager = window_manager.WindowManager(data_file=os.path.join(tempfile.mkdtemp(), "data.json"))
+        renders = []
+        for hwnd in hwnds:
+            hicon, owned = manager._find_icon(hwnd)
+            renders.append(manager.render_icon(hicon))
+        blacks = [black for black, _ in renders]
+        whites = [white for _, white in renders]
+        size = (manager.ICON_SIZE, manager.ICON_SIZE)
+        batched = timeit(lambda: icon_processing.process_batch(blacks, whites, size), repeat=ctx.repeat)
+        single = timeit(lambda: [icon_processing.process_batch([b], [w], size) for b, w in renders],
+                        repeat=max(3, ctx.repeat // 2))
+
+        def cold_prefetch():
+            manager.icon_cache.clear()
+            manager.prefetch_icons(hwnds)
+        prefetch = timeit(cold_prefetch, repeat=max(3, ctx.repeat // 2))
+        accents = [img.info.get("accent") for img in manager.icon_cache.values()]
+        metrics["n=%d" % n] = {
+            "batched_s": batched,
+            "per_icon_s": single,
+            "prefetch_cold_s": prefetch,
+            "with_accent": sum(1 for a in accents if a),
+        }
+    return metrics
+
+
+@benchmark("icons.dpi_variants")
+def bench_dpi_variants(ctx):
+    """Panel moving between 100%, 150% and 200% monitors: icons rendered per move.
+
+    Every move renders only the sizes not seen before (``renders``); moving
+    back to a known scale renders nothing. ``draws`` counts DrawIconEx calls
+    (two per icon: on black and on white).
+    """
+    window_manager = ctx.window_manager_module()
+    n = 100 if ctx.quick else 400
+    hwnds = ctx.reset_desktop(n)
+    manager = window_manager.WindowManager(data_file=os.path.join(tempfile.mkdtemp(), "data.json"))
+    calls = ctx.desktop.calls
+    metrics = {"windows": n}
+    for step, scale in enumerate((1.0, 1.5, 1.0, 2.0, 1.5, 1.0)):
+        draws = calls["win32gui.DrawIconEx"]
+        start = time.perf_counter()
+        rendered = manager.prefetch_icons(hwnds, scale)
+        elapsed = time.perf_counter() - start
+        icon = manager.get_window_icon(hwnds[0], scale)
+        metrics["%d:scale=%.2f" % (step, scale)] = {
+            "renders": rendered,
+            "draws": calls["win32gui.DrawIconEx"] - draws,
+            "seconds": elapsed,
+            "icon_px": icon.width if icon else 0,
+        }
+    variants = manager.icon_variants
+    metrics["variant_bytes"] = variants.total_bytes
+    metrics["variant_sizes"] = {str(k): v for k, v in sorted(variants.sizes().items())}
+
+    # Bütçe küçükse en eski boyut atılır; geri dönüş yalnız eksikleri çizer
+    variants.resize(n * 48 * 48 * 4)
+    metrics["budget_evicted"] = variants.counters["evicted"]
+    metrics["rerender_after_evict"] = manager.prefetch_icons(hwnds, 2.0)
+    manager.cleanup()
+    return metrics
+
+
+@benchmark("gui.tooltip", gui=True)
+def bench_tooltip(ctx):
+    """Sweep the pointer across the grid: Toplevels created and geometry calls made."""
+    import types
+    app = ctx.gui_app()
+    ctx.reset_desktop(24)
+    app._refresh()
+    pump(app.root, 0.2)
+    tooltip = app.tooltip
+    cards = [app._cards[h].card for h in app._grid_order]
+    created_before = tooltip.created
+    counts = {"geometry": 0}
+    original = None
+
+    def counting_geometry(*args):
+        counts["geometry"] += 1
+        return original(*args)
+
+    start = time.perf_counter()
+    for i, card in enumerate(cards):
+        event = types.SimpleNamespace(x_root=100 + i * 60, y_root=100)
+        tooltip._enter(card, "card %d" % i, None, event)
+        if original is None:
+            pump(app.root, tooltip.delay / 1000.0 + 0.05)  # first hover waits for the delay
+            original = tooltip.window.wm_geometry
+            tooltip.window.wm_geometry = counting_geometry
+        for step in range(20):  # 1 kHz motion samples
+            tooltip._motion(types.SimpleNamespace(x_root=event.x_root + step, y_root=100))
+            app.root.update()
+            time.sleep(0.001)
+        tooltip._leave(card)
+    elapsed = time.perf_counter() - start
+    pump(app.root, 0.2)
+    if original is not None:
+        del tooltip.window.wm_geometry
+    return {"cards=%d" % len(cards): {
+        "toplevels_created": tooltip.created - created_before,
+        "geometry_calls": counts["geometry"],
+        "motion_events": 20 * len(cards),
+        "sweep_wall_s": elapsed,
+    }}
+
+
+@benchmark("config.reload")
+def bench_config_reload(ctx):
+    """Perf config polling: cost of an unchanged poll and of a live reload + apply."""
+    import json
+    window_manager = ctx.window_manager_module()
+    tmp = tempfile.mkdtemp()
+    manager = window_manager.WindowManager(data_file=os.path.join(tmp, "data.json"))
+    config = manager.config
+    poll = timeit(config.reload_if_changed, repeat=ctx.repeat, number=1000)
+
+    flip = iter(range(10 ** 9))
+
+    def edit_and_reload():
+        n = next(flip)
+        with open(config.path, "w") as f:
+            json.dump({"watchdog_min_ms": 200 + n % 2 * 100, "thumbnail_cache_mb": 4 + n % 2,
+                       "animations": bool(n % 2)}, f)
+        os.utime(config.path, ns=(n, n))  # aynı boyut/saniye içinde de değişiklik görünsün
+        return config.reload_if_changed()
+    reload = timeit(edit_and_reload, repeat=ctx.repeat, number=20)
+    changed = edit_and_reload()
+    applied = (manager.watchdog.min_interval == config.watchdog_min_ms
+               and manager.thumbnails.max_bytes == int(config.thumbnail_cache_mb * 1024 * 1024))
+    with open(config.path, "w") as f:
+        json.dump({"grid_columns": "four", "edge_check_ms": 5}, f)
+    config.reload_if_changed()
+    return {
+        "unchanged_poll_s": poll,
+        "write_and_reload_s": reload,
+        "changed_keys": sorted(changed),
+        "applied_live": applied,
+        "rejected_values": len(config.errors),
+    }
+
+
+class _ManualRoot:
+    """Just enough of ``tk.Tk`` for the stall detector: ``after`` jobs run when ``pump`` says so."""
+
+    def __init__(self):
+        self.jobs = {}
+        self._next = 0
+
+    def after(self, ms, func):
+        self._next += 1
+        self.jobs[self._next] = (time.monotonic() + ms / 1000.0, func)
+        return self._next
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def pump(self, duration):
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            now = time.monotonic()
+            for job, (due, func) in list(self.jobs.items()):
+                if due <= now:
+                    del self.jobs[job]
+                    func()
+            time.sleep(0.005)
+
+
+def _blocking_refresh(seconds):
+    time.sleep(seconds)  # donmuş olay döngüsü
+
+
+@benchmark("stall.detector")
+def bench_stall_detector(ctx):
+    """Heartbeat and sampling cost, and whether a blocked loop is caught with its stack."""
+    from gui.stall_detector import StallDetector, stall_log_path
+    tmp = tempfile.mkdtemp()
+    root = _ManualRoot()
+    detector = StallDetector(root, stall_log_path(tmp), threshold_ms=200)
+    detector._main_id = __import__("threading").get_ident()
+    beat = timeit(detector._beat, repeat=ctx.repeat, number=1000)
+    sample = timeit(detector.sample, repeat=ctx.repeat, number=100)
+    root.jobs.clear()
+
+    detector.start()
+    root.pump(1.0)
+    false_positives = detector.stalls
+    _blocking_refresh(0.6)
+    root.pump(0.3)
+    detector.stop()
+    duration, samples, top = detector.last_stall or (0.0, 0, ())
+    with open(detector.log_path) as f:
+        logged = "_blocking_refresh" in f.read()
+    return {
+        "heartbeat_s": beat,
+        "sample_s": sample,
+        "healthy_false_stalls": false_positives,
+        "stalls": detector.stalls,
+        "stall_ms": duration * 1000,
+        "stall_samples": samples,
+        "culprit_found": bool(top) and top[-1][2] == "_blocking_refresh",
+        "logged_with_stack": logged,
+    }
+
+
+class _VirtualRoot:
+    """``after`` jobs on a virtual clock: ``advance`` runs them in due order without sleeping."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.jobs = {}
+        self._next = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, func):
+        self._next += 1
+        self.jobs[self._next] = (self.now + ms / 1000.0, self._next, func)
+        return self._next
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def advance(self, seconds):
+        end = self.now + seconds
+        while self.jobs:
+            job, (due, _, func) = min(self.jobs.items(), key=lambda item: item[1][:2])
+            if due > end:
+                break
+            del self.jobs[job]
+            self.now = max(self.now, due)
+            func()
+        self.now = end
+
+
+@benchmark("power.wakeups")
+def bench_power_wakeups(ctx):
+    """Timer wakeups per minute in each power state, with the panel's jobs at default settings.
+
+    Runs on a virtual clock, so every phase covers a full simulated minute.
+    ``resume_jobs`` counts the jobs that ran at the instant the panel was shown again.
+    """
+    from gui.power_state import PowerState, ACTIVE, HIDDEN
+    from gui.stall_detector import StallDetector, stall_log_path
+    window_manager = ctx.window_manager_module()
+    ctx.reset_desktop(50)
+    manager = window_manager.WindowManager(data_file=os.path.join(tempfile.mkdtemp(), "data.json"))
+    c, watchdog = manager.config, manager.watchdog
+    root = _VirtualRoot()
+    battery, idle = [False], [0.0]
+    power = PowerState(root, battery=lambda: battery[0], idle=lambda: idle[0], clock=root.clock)
+    detector = StallDetector(root, stall_log_path(tempfile.mkdtemp()),
+                             on_beat=lambda: power.count_wakeup("stall_heartbeat"))
+
+    # TopWindowApp._start_timers ve _on_power_change ile aynı işler
+    slow = lambda state: None if state == HIDDEN else c.low_power_poll_s * 1000
+    power.every("edge_check", lambda: None, lambda: c.edge_check_ms, slow)
+    power.every("topmost", watchdog.sweep, lambda: watchdog.interval, lambda state: watchdog.max_interval)
+    power.every("config", c.reload_if_changed, lambda: c.watch_ms, slow)
+    power.every("leaks", lambda: None, lambda: (c.leak_check_s or 60) * 1000)
+    power.every("power", power.poll, lambda: c.low_power_poll_s * 1000, slow)
+    power.every("inbox", lambda: None, lambda: c.inbox_ms, lambda state: c.inbox_low_power_ms)
+
+    def on_change(old, new):
+        if new != ACTIVE:
+            detector.stop()
+        else:
+            detector._beat()
+    power.subscribe(on_change)
+    detector._beat()
+
+    metrics = {}
+    for phase, setup in (("active", lambda: None),
+                         ("hidden", lambda: power.set_hidden(True)),
+                         ("battery", lambda: (power.set_hidden(False), battery.__setitem__(0, True))),
+                         ("idle", lambda: (battery.__setitem__(0, False), idle.__setitem__(0, 3600.0))),
+                         ("active_again", lambda: idle.__setitem__(0, 0.0))):
+        setup()
+        root.advance(60.0)
+        metrics[phase] = {"state": power.state, "wakeups_per_min": power.wakeups_per_minute(),
+                          "suspended": power.suspended()}
+
+    power.set_hidden(True)
+    root.advance(10.0)
+    before = sum(power.fired.values())
+    power.set_hidden(False)
+    root.advance(0.0)
+    metrics["resume_jobs"] = sum(power.fired.values()) - before
+    metrics["state_changes"] = power.changes
+
+    noop = power.every("noop", lambda: None, lambda: 10 ** 9)
+    metrics["fire_overhead_s"] = timeit(lambda: power._fire(noop), repeat=ctx.repeat, number=1000)
+    power.cancel_all()
+    detector.stop()
+    manager.cleanup()
+    return metrics
+
+
+@benchmark("power.panel", gui=True)
+def bench_power_panel(ctx):
+    """Real wakeups of a running panel while shown and while hidden to the tray."""
+    app = ctx.gui_app()
+    ctx.reset_desktop(40)
+    app._refresh()
+    pump(app.root, 2.0)
+    shown = app.power.wakeups_per_minute(2.0)
+    app._hide_to_tray()
+    pump(app.root, 2.0)
+    hidden = app.power.wakeups_per_minute(2.0)
+    app._refresh()  # gizliyken ikon işi gösterilene kadar ertelenir
+    refresh_deferred = app._refresh_pending
+    start = time.perf_counter()
+    app._show_panel()
+    app.root.update()
+    resumed_s = time.perf_counter() - start
+    pump(app.root, 0.2)
+    return {
+        "shown_wakeups_per_min": shown,
+        "hidden_wakeups_per_min": hidden,
+        "hidden_suspended": app.power.suspended() if app.power.low_power else [],
+        "refresh_deferred": refresh_deferred,
+        "show_s": resumed_s,
+        "state_after_show": app.power.state,
+    }
+
+
+@benchmark("soak.manager")
+def bench_soak_manager(ctx):
+    """Thousands of enumerate/icon/pin cycles with window churn; growth of every leak probe."""
+    import soak
+    return soak.soak_manager(ctx.desktop, cycles=600 if ctx.quick else 3000)
+
+
+@benchmark("soak.panel", gui=True)
+def bench_soak_panel(ctx):
+    """Refresh and hover the grid thousands of times; Tk images, canvas items and after jobs must not grow."""
+    import soak
+    app = ctx.gui_app()
+    return soak.soak_panel(app, ctx.desktop, cycles=300 if ctx.quick else 2000)
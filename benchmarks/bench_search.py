@@ -0,0 +1,128 @@
+"""Window search: index build and per-keystroke query latency."""
+import time
+
+from harness import benchmark, summarize, timeit
+from bench_cli import quiet, scripted_input
+
+TYPED_QUERIES = ("chrome", "notes 99", "teams.exe", "code*")
+
+
+@benchmark("search.window_index")
+def bench_window_index(ctx):
+    from gui.window_index import WindowIndex
+    top_window = ctx.cli()
+    metrics = {}
+    for n in ((1000,) if ctx.quick else (1000, 10000)):
+        ctx.reset_desktop(n)
+        windows = top_window.gw.getAllWindows()
+        index = WindowIndex()
+        build = timeit(lambda: index.rebuild(windows), repeat=3)
+        case = {"build_wall_s": build}
+        for query in TYPED_QUERIES:
+            samples = []
+            for _ in range(ctx.repeat):
+                index.search("")
+                for i in range(1, len(query) + 1):
+                    start = time.perf_counter()
+                    index.search(query[:i])
+                    samples.append(time.perf_counter() - start)
+            stats = summarize(samples)
+            stats["max"] = max(samples)
+            case["keystroke_wall_s[%s]" % query] = stats
+        metrics["n=%d" % n] = case
+    return metrics
+
+
+@benchmark("cli.select_by_query")
+def bench_select_by_query(ctx):
+    top_window = ctx.cli()
+    ctx.reset_desktop(1000)
+    with quiet():
+        windows = top_window.list_windows()
+    metrics = {}
+    for query in ("chrome*", "/chat \\d+0/", "notes 9"):
+        with scripted_input(query), quiet():
+            metrics[query] = {"wall_s": timeit(lambda: top_window.select_multiple_windows(windows),
+                                                repeat=ctx.repeat)}
+    return metrics
+
+
+@benchmark("history.rank")
+def bench_usage_history(ctx):
+    """Pin/unpin append cost and ranking a whole desktop by usage (budget: one 16 ms frame)."""
+    import os
+    import tempfile
+    from gui.usage_history import UsageHistory
+    from gui.window_index import WindowIndex
+    from sim_backend import SAMPLE_APPS
+    top_window = ctx.cli()
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        history = UsageHistory(os.path.join(tmp, "history.db"))
+        apps = [(exe, cls) for exe, cls, _ in SAMPLE_APPS] + [("app%d.exe" % i, "Cls%d" % i) for i in range(500)]
+        pins = iter(range(10 ** 9))
+        metrics["record_wall_s"] = timeit(lambda: history.record(*apps[next(pins) % len(apps)], "title", True),
+                                          repeat=ctx.repeat, number=50)
+        metrics["record_many_100_wall_s"] = timeit(
+            lambda: history.record_many([(exe, cls, "t") for exe, cls in apps[:100]]), repeat=ctx.repeat)
+        history.close()
+
+        def load():
+            fresh = UsageHistory(history.path)
+            fresh.has_data()
+            fresh.close()
+        metrics["open_and_load_wall_s"] = timeit(load, repeat=ctx.repeat)
+        reopened = UsageHistory(history.path)
+        for n in ((1000,) if ctx.quick else (1000, 10000)):
+            ctx.reset_desktop(n)
+            index = WindowIndex()
+            index.rebuild(top_window.gw.getAllWindows())
+            rank = timeit(lambda: index.reorder(reopened.rank_key()), repeat=ctx.repeat)
+            metrics["n=%d" % n] = {"rank_wall_s": rank, "under_frame": rank["median"] < 0.016}
+        reopened.close()
+    return metrics
+
+
+@benchmark("filter.pipeline")
+def bench_filter_pipeline(ctx):
+    """Ghost windows (tool, owned, tiny, denied exe) dropped before the icon pass; per-stage rejections."""
+    import os
+    import sys
+    import tempfile
+    from gui.window_filter import WindowFilter
+    import pygetwindow as gw
+    con = sys.modules["win32con"]
+    window_manager = ctx.window_manager_module()
+    manager = window_manager.WindowManager(data_file=os.path.join(tempfile.mkdtemp(), "data.json"))
+    settings = {"min_width": 120, "min_height": 60, "exe_deny": ["mpc-hc64.exe"]}
+    metrics = {}
+    for n in ((1000,) if ctx.quick else (1000, 5000)):
+        hwnds = ctx.reset_desktop(n)
+        # Gerçek masaüstlerindeki hayaletler: araç pencereleri, sahipli açılır pencereler, 1x1 yardımcılar
+        for i in range(n // 2):
+            owner = hwnds[i % len(hwnds)]
+            kind = i % 3
+            ctx.desktop.add_window("ghost %d" % i, "C:\\Apps\\helper.exe", "Ghost",
+                                   ex_style=con.WS_EX_TOOLWINDOW if kind == 0 else 0,
+                                   owner=owner if kind == 1 else 0,
+                                   rect=(0, 0, 1, 1) if kind == 2 else (100, 100, 900, 700))
+        windows = gw.getAllWindows()
+        case = {}
+        for name, window_filter in (("title_only", WindowFilter({"tool_windows": False, "owned": False,
+                                                                   "cloaked": False})),
+                                    ("pipeline", WindowFilter(settings))):
+            stats = timeit(lambda: window_filter.windows(windows), repeat=ctx.repeat)
+            kept = window_filter.windows(windows)
+            manager.icon_cache.clear()
+            manager.icon_cache_max = len(windows)
+            start = time.perf_counter()
+            rendered = manager.prefetch_icons(w._hWnd for w in kept)
+            case[name] = {
+                "filter_s": stats,
+                "kept": len(kept),
+                "icons_rendered": rendered,
+                "icon_pass_s": time.perf_counter() - start,
+                "rejected_per_run": {k: v // (stats["runs"] + 1) for k, v in window_filter.rejected.items()},
+            }
+        metrics["n=%d" % n] = case
+    return metrics
@@ -0,0 +1,77 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python benchmarks/compare.py OLD.json NEW.json [--threshold 0.10]
+
+Timing metrics are compared on their median. Metrics ending in ``hit_rate``
+are higher-is-better; everything else is lower-is-better. Exits with 1 when
+any metric regressed by more than the threshold.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import harness
+
+HIGHER_IS_BETTER = ("hit_rate",)
+
+
+def flatten(benchmarks):
+    """{bench: {case: {metric: value|stats}}} -> {"bench/case/metric": number}"""
+    flat = {}
+
+    def walk(prefix, node):
+        if isinstance(node, dict):
+            if "median" in node and "runs" in node:
+                flat[prefix] = node["median"]
+                return
+            for key, value in node.items():
+                walk("%s/%s" % (prefix, key) if prefix else key, value)
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            flat[prefix] = node
+
+    walk("", benchmarks)
+    return flat
+
+
+def report(old, new, threshold=0.10, out=sys.stdout):
+    """Print a comparison table and return the list of regressed metric names."""
+    old_flat, new_flat = flatten(old["benchmarks"]), flatten(new["benchmarks"])
+    regressions = []
+    print("\n%s -> %s" % (old.get("commit"), new.get("commit")), file=out)
+    for key in sorted(set(old_flat) & set(new_flat)):
+        before, after = old_flat[key], new_flat[key]
+        if before == 0:
+            change = 0.0 if after == 0 else float("inf")
+        else:
+            change = (after - before) / abs(before)
+        worse = -change if key.endswith(HIGHER_IS_BETTER) else change
+        flag = ""
+        if worse > threshold:
+            flag = "REGRESSION"
+            regressions.append(key)
+        elif worse < -threshold:
+            flag = "improved"
+        print("%-60s %12.6g %12.6g %+8.1f%% %s" % (key, before, after, change * 100, flag), file=out)
+    for key in sorted(set(new_flat) - set(old_flat)):
+        print("%-60s %12s %12.6g %9s new" % (key, "-", new_flat[key], ""), file=out)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change counted as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+    regressions = report(harness.load_result(args.old), harness.load_result(args.new), args.threshold)
+    if regressions:
+        print("\n%d regression(s)" % len(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
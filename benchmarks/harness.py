@@ -0,0 +1,114 @@
+"""Benchmark registry, timing helpers and result-file format."""
+import atexit
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+SCHEMA_VERSION = 1
+
+# name -> (function, needs_gui)
+REGISTRY = {}
+
+
+def benchmark(name, gui=False):
+    """Register ``func(ctx)`` as a benchmark. It returns a dict of metrics."""
+    def decorator(func):
+        REGISTRY[name] = (func, gui)
+        return func
+    return decorator
+
+
+def timeit(func, repeat=7, number=1, setup=None):
+    """Run ``func`` ``repeat`` times and return wall-clock statistics in seconds."""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return summarize(samples)
+
+
+def summarize(samples):
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "runs": len(samples),
+    }
+
+
+def git_revision():
+    """Return (short commit hash, dirty flag) for the working tree."""
+    try:
+        rev = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                      cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True).strip()
+        dirty = bool(subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"],
+                                             cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True).strip())
+        return rev, dirty
+    except Exception:
+        return "unknown", False
+
+
+def ensure_display():
+    """Make sure Tk has a display, starting Xvfb if none is set. Returns True if Tk works."""
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        xvfb = shutil.which("Xvfb")
+        if xvfb:
+            display = ":%d" % (90 + os.getpid() % 9)
+            proc = subprocess.Popen([xvfb, display, "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            atexit.register(proc.terminate)
+            os.environ["DISPLAY"] = display
+            time.sleep(0.5)
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.destroy()
+        return True
+    except Exception:
+        return False
+
+
+def new_result(quick):
+    rev, dirty = git_revision()
+    return {
+        "schema": SCHEMA_VERSION,
+        "commit": rev,
+        "dirty": dirty,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "benchmarks": {},
+    }
+
+
+def default_result_path(result):
+    suffix = "-dirty" if result["dirty"] else ""
+    return os.path.join(RESULTS_DIR, "%s%s.json" % (result["commit"], suffix))
+
+
+def save_result(result, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+
+
+def load_result(path):
+    with open(path, "r") as f:
+        return json.load(f)
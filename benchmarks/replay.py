@@ -0,0 +1,277 @@
+"""Replay a window-event trace against the simulated backend.
+
+Traces are recorded in the field with ``TOPWINDOW_TRACE=trace.jsonl.gz``
+(see ``gui/window_trace.py``). The replay rebuilds the starting desktop
+from the trace, then applies every event to a ``SimDesktop`` and times
+how the app reacts to it:
+
+- ``create`` / ``destroy`` / ``rename``: ``WindowWatcher.update`` and the
+  ``WindowIndex`` add, remove or rename that follows it
+- ``style``: the window loses (or regains) WS_EX_TOPMOST, then one
+  watchdog sweep runs
+- ``pin`` / ``unpin``: ``WindowManager.set_topmost`` / ``unset_topmost``
+
+With ``--gui`` the same events drive a real ``TopWindowApp``: its
+watcher runs the subscribed ``_on_window_event`` and Tk is pumped after
+each event, as in the running panel. Pins also repaint the cards. With
+``--full-refresh`` every create and destroy is followed by one
+``_refresh()`` of the panel, timed on its own as ``full_refresh``.
+
+Examples::
+
+    python benchmarks/replay.py trace.jsonl.gz                # as fast as possible
+    python benchmarks/replay.py trace.jsonl.gz --speed 10     # 10x real time
+    python benchmarks/replay.py trace.jsonl.gz --gui -o replay.json
+    python benchmarks/replay.py trace.jsonl.gz --gui --full-refresh
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import harness
+import sim_backend
+
+sys.path.insert(0, harness.REPO_ROOT)
+
+WS_EX_TOPMOST = sim_backend.CONSTANTS['WS_EX_TOPMOST']
+
+
+def split_trace(events):
+    """(starting desktop, timed events): the leading t=0 creates and pins are the snapshot."""
+    count = 0
+    for event in events:
+        if event[0] != 0 or event[1] not in ("C", "P"):
+            break
+        count += 1
+    return events[:count], events[count:]
+
+
+def latency_stats(samples):
+    """Milliseconds: count, median, p95 and max of one event class."""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+class Replay:
+    """Feeds trace events to a simulated desktop and the app code that watches it.
+
+    ``desktop`` must already be installed with ``sim_backend.install``.
+    Without ``app`` a bare ``WindowManager``, ``WindowWatcher`` and
+    ``WindowIndex`` are used, wired the way the panel wires them.
+    ``full_refresh`` (only with ``app``) times one ``app._refresh()``
+    after each create or destroy as a separate ``full_refresh`` class.
+    """
+
+    def __init__(self, desktop, app=None, full_refresh=False):
+        import pygetwindow as gw
+        from gui.window_events import CREATED, DESTROYED, RENAMED, WindowWatcher
+        from gui.window_index import WindowIndex
+        from gui.window_manager import WindowManager
+        from gui.window_info import describe_window
+
+        self.desktop = desktop
+        self.app = app
+        self.full_refresh = full_refresh and app is not None
+        self.gw = gw
+        self.hwnds = {}  # izdeki hwnd -> simülasyon hwnd'si
+        if app is not None:
+            self.manager, self.watcher, self.index = app.manager, app.watcher, app.window_index
+        else:
+            self.manager = WindowManager(os.path.join(tempfile.mkdtemp(), "top_window_data.json"))
+            self.watcher = WindowWatcher()
+            self.index = WindowIndex()
+            self.watcher.subscribe(self._follow_index)
+        self._kinds = (CREATED, DESTROYED, RENAMED)
+        self._describe = describe_window
+
+    def _follow_index(self, event):
+        created, destroyed, renamed = self._kinds
+        if event.kind == created:
+            exe, class_name = self._describe(event.hwnd)
+            self.index.add(self.gw.Win32Window(event.hwnd), exe, class_name, title=event.title)
+        elif event.kind == destroyed:
+            self.index.remove(event.hwnd)
+            self.manager.thumbnails.invalidate(event.hwnd)
+        elif event.kind == renamed:
+            self.index.rename(event.hwnd, event.title)
+            self.manager.thumbnails.mark_stale(event.hwnd)
+
+    def _create(self, event):
+        _, _, hwnd, title, exe, class_name = event[:6]
+        self.hwnds[hwnd] = self.desktop.add_window(title, "C:\\Apps\\%s" % (exe or "app.exe"),
+                                                   class_name or "SimWindow")
+        return self.hwnds[hwnd]
+
+    def load(self, snapshot):
+        """Build the starting desktop and take the initial snapshot (not timed).
+
+        Windows pinned when recording started are pinned here too, so the
+        replayed ``style`` events find them in the watchdog.
+        """
+        self.desktop.clear()
+        self.hwnds.clear()
+        for event in snapshot:
+            if event[1] == "C":
+                self._create(event)
+        for event in snapshot:
+            if event[1] == "P" and event[2] in self.hwnds:
+                self.manager.set_topmost(self.gw.Win32Window(self.hwnds[event[2]]))
+        self.watcher.windows = self.watcher.snapshot()
+        if self.app is not None:
+            self.app._refresh()
+            self.app.root.update()
+        else:
+            self.index.rebuild([self.gw.Win32Window(h) for h in self.watcher.windows])
+
+    def apply(self, event):
+        """Change the desktop, then run the app's reaction; returns the reaction callable."""
+        code, hwnd = event[1], event[2]
+        if code == "C":
+            sim = self._create(event)
+            return lambda: self._react(self.watcher.update(sim))
+        sim = self.hwnds.get(hwnd)
+        if sim is None or sim not in self.desktop.windows:
+            return None
+        if code == "D":
+            self.desktop.destroy_window(sim)
+            return lambda: self._react(self.watcher.update(sim))
+        if code == "R":
+            self.desktop.rename_window(sim, event[3])
+            return lambda: self._react(self.watcher.update(sim, renamed=True))
+        if code == "S":
+            window = self.desktop.windows[sim]
+            if event[3]:
+                window.ex_style |= WS_EX_TOPMOST
+            else:
+                window.ex_style &= ~WS_EX_TOPMOST
+            return lambda: self._react(self.manager.watchdog.sweep(), pinned=True)
+        if code in ("P", "U"):
+            window = self.gw.Win32Window(sim)
+            action = self.manager.set_topmost if code == "P" else self.manager.unset_topmost
+            return lambda: self._react(action(window), pinned=True)
+        return None
+
+    def _react(self, result, pinned=False):
+        # Panel yeni/kapanan pencerede _refresh çağırmaz; abonelik + Tk yeter
+        app = self.app
+        if app is None:
+            return result
+        if pinned:
+            app._update_card_visuals()
+        app.root.update()
+        return result
+
+    def _refresh(self):
+        self.app._refresh()
+        self.app.root.update()
+
+    def run(self, events, speed=0.0):
+        """Replay ``events`` (after ``load``); returns per-class latency and CPU.
+
+        ``speed`` 1.0 keeps the recorded timing, 10.0 is ten times faster
+        and 0 replays as fast as possible.
+        """
+        from gui.window_trace import EVENT_NAMES
+        wall, cpu = {}, {}
+        skipped = 0
+        start = time.perf_counter()
+        for event in events:
+            if speed > 0:
+                delay = event[0] / 1000.0 / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            react = self.apply(event)
+            if react is None:
+                skipped += 1
+                continue
+            t0, c0 = time.perf_counter(), time.thread_time()
+            react()
+            c1, t1 = time.thread_time(), time.perf_counter()
+            name = EVENT_NAMES.get(event[1], event[1])
+            wall.setdefault(name, []).append(t1 - t0)
+            cpu[name] = cpu.get(name, 0.0) + (c1 - c0)
+            if self.full_refresh and event[1] in ("C", "D"):
+                t0, c0 = time.perf_counter(), time.thread_time()
+                self._refresh()
+                c1, t1 = time.thread_time(), time.perf_counter()
+                wall.setdefault("full_refresh", []).append(t1 - t0)
+                cpu["full_refresh"] = cpu.get("full_refresh", 0.0) + (c1 - c0)
+        result = {"events": len(events), "skipped": skipped,
+                  "elapsed_s": time.perf_counter() - start, "classes": {}}
+        for name, samples in wall.items():
+            stats = latency_stats(samples)
+            stats["cpu_ms"] = cpu[name] * 1000
+            result["classes"][name] = stats
+        return result
+
+
+def replay_trace(desktop, path, speed=0.0, app=None, full_refresh=False):
+    """Load a trace file and replay it; returns the report dict."""
+    from gui.window_trace import read_trace
+    header, events = read_trace(path)
+    snapshot, timed = split_trace(events)
+    replay = Replay(desktop, app, full_refresh)
+    replay.load(snapshot)
+    report = replay.run(timed, speed)
+    report["trace"] = {"path": path, "start": header.get("start"), "windows": len(snapshot)}
+    return report
+
+
+def print_report(report):
+    print("%d events, %d skipped, %.2f s" % (report["events"], report["skipped"], report["elapsed_s"]))
+    print("%-12s %7s %10s %10s %10s %10s" % ("event", "count", "median ms", "p95 ms", "max ms", "cpu ms"))
+    for name, s in sorted(report["classes"].items()):
+        print("%-12s %7d %10.3f %10.3f %10.3f %10.1f" % (
+            name, s["count"], s["median_ms"], s["p95_ms"], s["max_ms"], s["cpu_ms"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", help="trace file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="1 = recorded timing, 10 = ten times faster, 0 = as fast as possible (default)")
+    parser.add_argument("--gui", action="store_true", help="drive a real TopWindowApp (needs a display)")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="with --gui, also time a full panel refresh after each create/destroy")
+    parser.add_argument("-o", "--output", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    desktop = sim_backend.SimDesktop()
+    sim_backend.install(desktop)
+    app = None
+    if args.gui:
+        if not harness.ensure_display():
+            print("no display for --gui")
+            return 1
+        from gui import modern_ui
+        from gui.usage_history import UsageHistory, history_path
+        app = modern_ui.TopWindowApp()
+        app.manager.data_file = os.path.join(tempfile.mkdtemp(), "top_window_data.json")
+        app.manager.history.close()
+        app.manager.history = UsageHistory(history_path(app.manager.data_file))
+    try:
+        report = replay_trace(desktop, args.trace, args.speed, app, args.full_refresh)
+    finally:
+        if app is not None:
+            app.root.destroy()
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
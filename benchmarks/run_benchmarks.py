@@ -0,0 +1,147 @@
+"""Run the TopWindow benchmark suite against the simulated window backend.
+
+Examples::
+
+    python benchmarks/run_benchmarks.py                 # full run, saved under benchmarks/results/
+    python benchmarks/run_benchmarks.py --quick -k cli  # subset, fewer sizes
+    python benchmarks/compare.py results/abc1234.json results/def5678.json
+"""
+import argparse
+import fnmatch
+import os
+import sys
+import traceback
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import harness
+import sim_backend
+
+sys.path.insert(0, harness.REPO_ROOT)
+
+# Benchmark modules register themselves on import
+BENCH_MODULES = ["bench_cli", "bench_gui", "bench_search"]
+
+
+class Context:
+    """Shared state handed to every benchmark function."""
+
+    def __init__(self, desktop, quick, has_gui):
+        self.desktop = desktop
+        self.quick = quick
+        self.repeat = 3 if quick else 7
+        self.has_gui = has_gui
+        self._app = None
+        self._cli_ready = False
+
+    def cli(self):
+        import top_window
+        if not self._cli_ready:
+            # Never touch the real data file (or usage history) from a benchmark
+            import tempfile
+            top_window.WINDOW_DATA_FILE = os.path.join(tempfile.mkdtemp(), "top_window_data.json")
+            self._cli_ready = True
+        return top_window
+
+    def window_manager_module(self):
+        from gui import window_manager
+        return window_manager
+
+    def reset_desktop(self, count):
+        """Replace the simulated desktop with ``count`` fresh windows."""
+        self.desktop.clear()
+        hwnds = self.desktop.populate(count)
+        self.cli().topmost_windows.clear()
+        if self._app is not None:
+            self._app.manager.topmost_hwnds.clear()
+            self._app.manager.icon_cache.clear()
+            self._app.manager.icon_variants.clear()
+        return hwnds
+
+    def gui_app(self):
+        if self._app is None:
+            import tempfile
+            from gui import modern_ui
+            from gui.usage_history import UsageHistory, history_path
+            self._app = modern_ui.TopWindowApp()
+            # Never touch the real data file from a benchmark
+            self._app.manager.data_file = os.path.join(tempfile.mkdtemp(), "top_window_data.json")
+            self._app.manager.history.close()
+            self._app.manager.history = UsageHistory(history_path(self._app.manager.data_file))
+            self._app.manager.previous_windows = []
+            self._app._grouped = False  # benchmarks start from the per-window grid
+        return self._app
+
+    def close(self):
+        if self._app is not None:
+            try:
+                self._app.root.destroy()
+            except Exception:
+                pass
+            self._app = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="only run benchmarks whose name matches this glob (substring if no wildcard)")
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and repeats")
+    parser.add_argument("-o", "--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a previous result file")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    desktop = sim_backend.SimDesktop()
+    sim_backend.install(desktop)
+    for name in BENCH_MODULES:
+        __import__(name)
+
+    def selected(name):
+        if not args.filter:
+            return True
+        return any(fnmatch.fnmatch(name, p if any(c in p for c in "*?[") else "*%s*" % p)
+                   for p in args.filter)
+
+    names = [n for n in harness.REGISTRY if selected(n)]
+    if args.list:
+        for name in names:
+            print(name)
+        return 0
+
+    has_gui = any(harness.REGISTRY[n][1] for n in names) and harness.ensure_display()
+    ctx = Context(desktop, args.quick, has_gui)
+    result = harness.new_result(args.quick)
+    failures = 0
+    try:
+        for name in names:
+            func, needs_gui = harness.REGISTRY[name]
+            if needs_gui and not has_gui:
+                print("%-32s skipped (no display)" % name)
+                result["benchmarks"][name] = {"skipped": "no display"}
+                continue
+            print("%-32s ..." % name, end="", flush=True)
+            try:
+                result["benchmarks"][name] = func(ctx)
+                print(" ok")
+            except Exception:
+                failures += 1
+                print(" FAILED")
+                traceback.print_exc()
+                result["benchmarks"][name] = {"error": traceback.format_exc(limit=3)}
+    finally:
+        ctx.close()
+
+    path = args.output or harness.default_result_path(result)
+    harness.save_result(result, path)
+    print("\nResults written to %s" % path)
+
+    if args.compare:
+        import compare
+        regressions = compare.report(harness.load_result(args.compare), result)
+        failures += len(regressions)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
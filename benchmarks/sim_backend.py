@@ -0,0 +1,381 @@
+"""Simulated Win32 window backend for headless benchmarks.
+
+Installs fake ``pygetwindow``, ``win32gui``, ``win32con``, ``win32ui``,
+``win32process``, ``win32api`` and ``pystray`` modules into ``sys.modules``
+so ``top_window.py`` and the ``gui`` package can be imported and driven on
+Linux. All state lives in a ``SimDesktop`` instance; every native call is
+counted in ``desktop.calls`` so benchmarks can report call volumes as well
+as wall time.
+
+Usage::
+
+    desktop = SimDesktop()
+    desktop.populate(1000)
+    install(desktop)          # must run before importing the app modules
+    import top_window
+"""
+import collections
+import sys
+import types
+import zlib
+
+
+class error(Exception):
+    """Stand-in for ``pywintypes.error``."""
+
+
+# Only the constants the app actually touches.
+CONSTANTS = {
+    'HWND_TOPMOST': -1,
+    'HWND_NOTOPMOST': -2,
+    'HWND_TOP': 0,
+    'SWP_NOSIZE': 0x0001,
+    'SWP_NOMOVE': 0x0002,
+    'SWP_NOZORDER': 0x0004,
+    'SWP_NOACTIVATE': 0x0010,
+    'GWL_STYLE': -16,
+    'GWL_EXSTYLE': -20,
+    'WS_VISIBLE': 0x10000000,
+    'WS_EX_TOPMOST': 0x00000008,
+    'WS_EX_TOOLWINDOW': 0x00000080,
+    'WS_EX_APPWINDOW': 0x00040000,
+    'WM_GETICON': 0x007F,
+    'ICON_SMALL': 0,
+    'ICON_BIG': 1,
+    'GCL_HICON': -14,
+    'DI_MASK': 0x0001,
+    'DI_IMAGE': 0x0002,
+    'DI_NORMAL': 0x0003,
+    'SW_HIDE': 0,
+    'SW_SHOW': 5,
+    'SW_MINIMIZE': 6,
+    'SW_RESTORE': 9,
+    'GW_OWNER': 4,
+    'MONITOR_DEFAULTTONEAREST': 2,
+}
+
+SAMPLE_APPS = [
+    ("chrome.exe", "Chrome_WidgetWin_1", "{n} - Google Chrome"),
+    ("Code.exe", "Chrome_WidgetWin_1", "module_{n}.py - Visual Studio Code"),
+    ("explorer.exe", "CabinetWClass", "Folder {n}"),
+    ("Teams.exe", "TeamsWebView", "Chat {n} | Microsoft Teams"),
+    ("notepad.exe", "Notepad", "notes_{n}.txt - Notepad"),
+    ("WINWORD.EXE", "OpusApp", "Report {n} - Word"),
+    ("slack.exe", "Chrome_WidgetWin_1", "Slack | channel-{n}"),
+    ("mpc-hc64.exe", "MediaPlayerClassicW", "video_{n}.mkv"),
+]
+
+
+class SimWindow:
+    def __init__(self, hwnd, title, exe_path, class_name, pid,
+                 rect=(100, 100, 900, 700), visible=True, ex_style=0, owner=0):
+        self.hwnd = hwnd
+        self.title = title
+        self.exe_path = exe_path
+        self.class_name = class_name
+        self.pid = pid
+        self.rect = rect
+        self.visible = visible
+        self.ex_style = ex_style
+        self.owner = owner
+        self.minimized = False
+
+
+class SimDesktop:
+    """In-memory model of the window list and the native calls made on it."""
+
+    def __init__(self):
+        self.windows = collections.OrderedDict()  # hwnd -> SimWindow, z-order
+        self.calls = collections.Counter()
+        self.foreground = 0
+        self._next_hwnd = 0x10000
+        self._next_pid = 1000
+        self._pids = {}  # exe_path -> pid
+        self._icons = {}  # hicon -> (r, g, b)
+        self._next_hicon = 0x500000
+
+    # ── Desktop manipulation ────────────────────────────────────
+    def add_window(self, title, exe_path="C:\\Apps\\app.exe", class_name="SimWindow",
+                   **kwargs):
+        hwnd = self._next_hwnd
+        self._next_hwnd += 4
+        pid = self._pids.get(exe_path)
+        if pid is None:
+            pid = self._pids[exe_path] = self._next_pid
+            self._next_pid += 4
+        self.windows[hwnd] = SimWindow(hwnd, title, exe_path, class_name, pid, **kwargs)
+        self.foreground = hwnd
+        return hwnd
+
+    def populate(self, count):
+        """Add ``count`` windows spread across a handful of sample apps."""
+        hwnds = []
+        for n in range(count):
+            exe, cls, fmt = SAMPLE_APPS[n % len(SAMPLE_APPS)]
+            hwnds.append(self.add_window(fmt.format(n=n), "C:\\Program Files\\%s" % exe, cls))
+        return hwnds
+
+    def destroy_window(self, hwnd):
+        self.windows.pop(hwnd, None)
+
+    def reuse_hwnd(self, hwnd, title, exe_path="C:\\Apps\\other.exe", class_name="SimWindow"):
+        """Destroy ``hwnd`` and hand the same handle to a new window of another process."""
+        self.destroy_window(hwnd)
+        saved = self._next_hwnd
+        self._next_hwnd = hwnd
+        self.add_window(title, exe_path, class_name)
+        self._next_hwnd = saved
+        return hwnd
+
+    def rename_window(self, hwnd, title):
+        self.windows[hwnd].title = title
+
+    def clear(self):
+        self.windows.clear()
+        self.calls.clear()
+
+    def _get(self, hwnd):
+        win = self.windows.get(hwnd)
+        if win is None:
+            raise error(1400, 'SimDesktop', 'Invalid window handle.')
+        return win
+
+    def _icon_for(self, exe_path):
+        color = zlib.crc32(exe_path.encode('utf-8', 'replace')).to_bytes(4, 'little')[:3]
+        hicon = self._next_hicon
+        self._next_hicon += 1
+        self._icons[hicon] = tuple(color)
+        return hicon
+
+
+def _counted(desktop, name, func):
+    def wrapper(*args, **kwargs):
+        desktop.calls[name] += 1
+        return func(*args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+
+def _module(name, desktop, functions, attrs=None):
+    mod = types.ModuleType(name)
+    mod.__dict__['SIM_DESKTOP'] = desktop
+    for fname, func in functions.items():
+        setattr(mod, fname, _counted(desktop, '%s.%s' % (name, fname), func))
+    for key, value in (attrs or {}).items():
+        setattr(mod, key, value)
+    return mod
+
+
+# ═══════════════════════════════════════════════════════════════
+# Fake GDI objects
+# ═══════════════════════════════════════════════════════════════
+class _Bitmap:
+    def __init__(self):
+        self.width = self.height = 0
+        self.bits = b''
+
+    def CreateCompatibleBitmap(self, dc, width, height):
+        self.width, self.height = width, height
+        self.bits = bytearray(width * height * 4)
+
+    def GetInfo(self):
+        return {'bmWidth': self.width, 'bmHeight': self.height, 'bmBitsPixel': 32}
+
+    def GetBitmapBits(self, as_string=False):
+        return bytes(self.bits)
+
+    def GetHandle(self):
+        return id(self)
+
+
+class _DC:
+    def __init__(self, desktop):
+        self.desktop = desktop
+        self.bitmap = None
+
+    def CreateCompatibleDC(self, *args):
+        return _DC(self.desktop)
+
+    def SelectObject(self, obj):
+        self.bitmap = obj
+
+    def GetSafeHdc(self):
+        return self
+
+    def FillSolidRect(self, rect, color):
+        if self.bitmap is not None:
+            r, g, b = color & 0xFF, (color >> 8) & 0xFF, (color >> 16) & 0xFF
+            self.bitmap.bits[:] = bytes((b, g, r, 0)) * (len(self.bitmap.bits) // 4)
+
+    def DeleteDC(self):
+        self.bitmap = None
+
+
+def _draw_icon(desktop, hdc, x, y, hicon, cx, cy, step, brush, flags):
+    """Paint an opaque square with a 2px transparent (black) border."""
+    bitmap = getattr(hdc, 'bitmap', None)
+    if bitmap is None or hicon not in desktop._icons:
+        return
+    r, g, b = desktop._icons[hicon]
+    width = bitmap.width
+    for row in range(2, min(cy, bitmap.height) - 2):
+        start = (row * width + 2) * 4
+        count = min(cx, width) - 4
+        bitmap.bits[start:start + count * 4] = bytes((b, g, r, 0)) * count
+
+
+# ═══════════════════════════════════════════════════════════════
+# Fake modules
+# ═══════════════════════════════════════════════════════════════
+def build_modules(desktop):
+    con = types.SimpleNamespace(**CONSTANTS)
+
+    def SetWindowPos(hwnd, insert_after, x, y, cx, cy, flags):
+        win = desktop._get(hwnd)
+        if insert_after == con.HWND_TOPMOST:
+            win.ex_style |= con.WS_EX_TOPMOST
+        elif insert_after == con.HWND_NOTOPMOST:
+            win.ex_style &= ~con.WS_EX_TOPMOST
+        if not flags & con.SWP_NOMOVE or not flags & con.SWP_NOSIZE:
+            left, top, right, bottom = win.rect
+            if not flags & con.SWP_NOMOVE:
+                left, top = x, y
+            if not flags & con.SWP_NOSIZE:
+                right, bottom = left + cx, top + cy
+            else:
+                right, bottom = left + (win.rect[2] - win.rect[0]), top + (win.rect[3] - win.rect[1])
+            win.rect = (left, top, right, bottom)
+
+    def GetWindowLong(hwnd, index):
+        win = desktop._get(hwnd)
+        if index == con.GWL_EXSTYLE:
+            return win.ex_style
+        return con.WS_VISIBLE if win.visible else 0
+
+    def EnumWindows(callback, extra):
+        for hwnd in list(desktop.windows):
+            if callback(hwnd, extra) is False:
+                break
+
+    def ExtractIconEx(path, index, count=1):
+        return [desktop._icon_for(path)], [desktop._icon_for(path)]
+
+    def SendMessageTimeout(hwnd, msg, wparam, lparam, flags, timeout):
+        desktop._get(hwnd)
+        return 1, 0
+
+    win32gui = _module('win32gui', desktop, {
+        'SetWindowPos': SetWindowPos,
+        'GetWindowLong': GetWindowLong,
+        'GetWindowText': lambda hwnd: desktop.windows[hwnd].title if hwnd in desktop.windows else '',
+        'GetClassName': lambda hwnd: desktop._get(hwnd).class_name,
+        'GetWindowRect': lambda hwnd: desktop._get(hwnd).rect,
+        'GetParent': lambda hwnd: desktop._get(hwnd).owner,
+        'GetWindow': lambda hwnd, cmd: desktop._get(hwnd).owner if cmd == con.GW_OWNER else 0,
+        'IsWindow': lambda hwnd: hwnd in desktop.windows,
+        'IsWindowVisible': lambda hwnd: hwnd in desktop.windows and desktop.windows[hwnd].visible,
+        'IsIconic': lambda hwnd: desktop._get(hwnd).minimized,
+        'GetForegroundWindow': lambda: desktop.foreground,
+        'EnumWindows': EnumWindows,
+        'ShowWindow': lambda hwnd, cmd: setattr(desktop._get(hwnd), 'minimized', cmd == con.SW_MINIMIZE),
+        'GetDC': lambda hwnd: 1,
+        'ReleaseDC': lambda hwnd, hdc: 1,
+        'DeleteObject': lambda handle: None,
+        'DestroyIcon': lambda hicon: desktop._icons.pop(hicon, None),
+        'ExtractIconEx': ExtractIconEx,
+        'SendMessageTimeout': SendMessageTimeout,
+        'GetClassLong': lambda hwnd, index: 0,
+        'DrawIconEx': lambda *args: _draw_icon(desktop, *args),
+    }, {'error': error})
+
+    win32con = _module('win32con', desktop, {}, CONSTANTS)
+
+    win32ui = _module('win32ui', desktop, {
+        'CreateDCFromHandle': lambda handle: _DC(desktop),
+        'CreateBitmap': _Bitmap,
+    })
+
+    win32process = _module('win32process', desktop, {
+        'GetWindowThreadProcessId': lambda hwnd: (desktop._get(hwnd).pid + 1, desktop._get(hwnd).pid),
+        'GetModuleFileNameEx': lambda handle, module: handle,
+    })
+
+    def OpenProcess(access, inherit, pid):
+        for win in desktop.windows.values():
+            if win.pid == pid:
+                return win.exe_path
+        raise error(87, 'OpenProcess', 'The parameter is incorrect.')
+
+    win32api = _module('win32api', desktop, {
+        'OpenProcess': OpenProcess,
+        'CloseHandle': lambda handle: None,
+        'MonitorFromWindow': lambda hwnd, flags: 1,
+        'GetMonitorInfo': lambda monitor: {'Monitor': (0, 0, 1920, 1080), 'Work': (0, 0, 1920, 1040)},
+    })
+
+    class Win32Window:
+        """Subset of ``pygetwindow.Win32Window`` backed by the simulated desktop."""
+
+        def __init__(self, hwnd):
+            self._hWnd = hwnd
+
+        @property
+        def title(self):
+            return win32gui.GetWindowText(self._hWnd)
+
+        @property
+        def visible(self):
+            return win32gui.IsWindowVisible(self._hWnd)
+
+        def __repr__(self):
+            return '<Win32Window hwnd=%#x title=%r>' % (self._hWnd, self.title)
+
+    pygetwindow = _module('pygetwindow', desktop, {
+        'getAllWindows': lambda: [Win32Window(hwnd) for hwnd in desktop.windows],
+    }, {'Win32Window': Win32Window})
+
+    class Icon:
+        def __init__(self, name, image=None, title=None, menu=None):
+            self.name, self.icon, self.title, self.menu = name, image, title, menu
+            self.visible = False
+
+        def run_detached(self, setup=None):
+            self.visible = True
+
+        def run(self, setup=None):
+            self.visible = True
+
+        def stop(self):
+            self.visible = False
+
+        def update_menu(self):
+            pass
+
+    class MenuItem:
+        def __init__(self, text, action=None, **kwargs):
+            self.text, self.action = text, action
+
+    class Menu:
+        SEPARATOR = None
+
+        def __init__(self, *items):
+            self.items = items
+
+    pystray = _module('pystray', desktop, {}, {'Icon': Icon, 'MenuItem': MenuItem, 'Menu': Menu})
+
+    return {
+        'pygetwindow': pygetwindow,
+        'win32gui': win32gui,
+        'win32con': win32con,
+        'win32ui': win32ui,
+        'win32process': win32process,
+        'win32api': win32api,
+        'pystray': pystray,
+    }
+
+
+def install(desktop):
+    """Register the simulated modules; returns them keyed by module name."""
+    modules = build_modules(desktop)
+    sys.modules.update(modules)
+    return modules
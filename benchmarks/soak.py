@@ -0,0 +1,150 @@
+"""Soak test: run thousands of refresh/hover cycles and fail if anything keeps growing.
+
+Windows keep opening, closing and being pinned on the simulated desktop
+while the app works through its usual cycle. A ``LeakSentinel`` samples
+every probe at regular intervals (with tracemalloc on). The run fails when
+a probe trends upward.
+
+- default: the ``WindowManager`` cycle (enumerate, reap, prefetch icons,
+  pin / unpin). Runs headless.
+- ``--gui``: a full ``TopWindowApp`` (grid refresh, hover in and out of
+  cards, Tk images, canvas items, after jobs). Needs a display.
+
+Icon handles on the simulated desktop stand in for GDI objects: every
+icon the app extracts must be destroyed again.
+
+Examples::
+
+    python benchmarks/soak.py --cycles 5000
+    python benchmarks/soak.py --gui --cycles 2000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import harness
+import sim_backend
+
+sys.path.insert(0, harness.REPO_ROOT)
+
+
+def _churn(desktop, rng, hwnds):
+    """Close one window and open another of a sample app."""
+    victim = rng.choice(hwnds)
+    hwnds.remove(victim)
+    desktop.destroy_window(victim)
+    exe, cls, fmt = rng.choice(sim_backend.SAMPLE_APPS)
+    hwnds.append(desktop.add_window(fmt.format(n=rng.randrange(10 ** 6)), "C:\\Program Files\\%s" % exe, cls))
+
+
+def _run(sentinel, cycles, samples, step):
+    every = max(1, cycles // samples)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        for i in range(cycles):
+            step(i)
+            if i % every == every - 1:
+                sentinel.sample()
+    finally:
+        if started:
+            tracemalloc.stop()
+    return {
+        "cycles": cycles,
+        "samples": len(sentinel.samples),
+        "leaking": sentinel.leaking(),
+        "growth": {name: last - first for name, (first, last, _) in sentinel.trends().items()},
+    }
+
+
+def soak_manager(desktop, cycles=2000, windows=100, samples=30, seed=1):
+    """Manager cycle on the simulated desktop; returns a result dict with ``leaking``."""
+    import pygetwindow as gw
+    from gui.leak_sentinel import LeakSentinel, manager_probes
+    from gui.window_manager import WindowManager
+
+    rng = random.Random(seed)
+    desktop.clear()
+    hwnds = desktop.populate(windows)
+    manager = WindowManager(os.path.join(tempfile.mkdtemp(), "top_window_data.json"))
+    probes = manager_probes(manager)
+    probes["icon_handles"] = (lambda: len(desktop._icons), 0)
+    sentinel = LeakSentinel(probes)
+
+    def step(i):
+        _churn(desktop, rng, hwnds)
+        visible = manager.get_visible_windows()
+        manager.prefetch_icons(w._hWnd for w in visible)
+        window = gw.Win32Window(rng.choice(hwnds))
+        manager.toggle_topmost(window)
+
+    result = _run(sentinel, cycles, samples, step)
+    manager.cleanup()
+    return result
+
+
+def soak_panel(app, desktop, cycles=1000, windows=40, samples=30, seed=1):
+    """Refresh and hover cycle on a running ``TopWindowApp``."""
+    from gui.leak_sentinel import LeakSentinel, app_probes
+
+    rng = random.Random(seed)
+    desktop.clear()
+    hwnds = desktop.populate(windows)
+    probes = app_probes(app)
+    probes["icon_handles"] = (lambda: len(desktop._icons), 0)
+    sentinel = LeakSentinel(probes)
+
+    def step(i):
+        if i % 10 == 0:
+            _churn(desktop, rng, hwnds)
+            app._refresh()
+        cards = [c for c in app._cards.values() if c.winfo_exists()]
+        card = rng.choice(cards)
+        card._on_enter(None)
+        app.root.update()
+        if i % 7 == 0:
+            card._on_click(None)
+        card._on_leave(None)
+        app.root.update()
+
+    return _run(sentinel, cycles, samples, step)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=5000)
+    parser.add_argument("--windows", type=int, default=100)
+    parser.add_argument("--gui", action="store_true", help="soak a full TopWindowApp (needs a display)")
+    args = parser.parse_args(argv)
+
+    desktop = sim_backend.SimDesktop()
+    sim_backend.install(desktop)
+    if args.gui:
+        if not harness.ensure_display():
+            print("no display for --gui")
+            return 2
+        from gui import modern_ui
+        app = modern_ui.TopWindowApp()
+        app.manager.data_file = os.path.join(tempfile.mkdtemp(), "top_window_data.json")
+        try:
+            result = soak_panel(app, desktop, args.cycles, args.windows)
+        finally:
+            app.root.destroy()
+    else:
+        result = soak_manager(desktop, args.cycles, args.windows)
+    for name, growth in sorted(result["growth"].items()):
+        print("%-18s %+d%s" % (name, growth, "   GROWING" if name in result["leaking"] else ""))
+    print("%d cycles, %d samples: %s" % (result["cycles"], result["samples"],
+                                         "FAIL" if result["leaking"] else "ok"))
+    return 1 if result["leaking"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
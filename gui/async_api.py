@@ -0,0 +1,252 @@
+"""asyncio ile pencere yönetimi (otomasyon betikleri için kütüphane API'si).
+
+    import asyncio
+    from gui.async_api import AsyncWindows
+
+    async def main():
+        async with AsyncWindows() as api:
+            for w in await api.list_windows("chrome*"):
+                print(w["hwnd"], w["title"])
+            await api.pin("notepad*")
+            async for event in api.watch():
+                print(event.kind, event.title)
+
+Blocking pywin32 calls run on a private thread pool and at most
+``max_concurrency`` of them are in flight at once, so the caller's event
+loop never blocks. Concurrent callers share one window enumeration. The
+index it builds is reused for ``index_ttl`` seconds, so a few hundred
+concurrent ``pin()`` calls enumerate the desktop once. Each call is one
+DeferWindowPos batch. Windows pinned here stay on top after the script
+exits, like ``top_window.py pin``.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import time
+
+import pygetwindow as gw
+import win32con
+import win32gui
+try:
+    from .window_index import WindowIndex
+    from .window_info import describe_window
+    from .window_batch import set_topmost_many
+    from .window_events import WindowWatcher
+    from .window_filter import WindowFilter
+except ImportError:
+    from window_index import WindowIndex
+    from window_info import describe_window
+    from window_batch import set_topmost_many
+    from window_events import WindowWatcher
+    from window_filter import WindowFilter
+
+DESCRIBE_CHUNK = 64  # bir işçiye verilen pencere sayısı (exe/sınıf sorgusu)
+
+
+def _listable_windows(window_filter):
+    """One enumeration, through the same kind of filter as the CLI and the GUI."""
+    return window_filter.windows(gw.getAllWindows())
+
+
+def _describe_chunk(hwnds):
+    pid_cache = {}
+    return {hwnd: describe_window(hwnd, pid_cache) for hwnd in hwnds}
+
+
+def _build(windows, described):
+    index = WindowIndex()
+    index.rebuild(windows, describe=lambda hwnd, cache: described.get(hwnd, ("", "")))
+    return index
+
+
+def _topmost_flags(hwnds):
+    flags = {}
+    for hwnd in hwnds:
+        try:
+            flags[hwnd] = bool(win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOPMOST)
+        except Exception:
+            flags[hwnd] = False
+    return flags
+
+
+def record(entry, **extra):
+    """JSON-friendly dict for an indexed window (same keys as ``top_window.py list``)."""
+    data = {"hwnd": entry.hwnd, "title": entry.title, "exe": entry.exe, "class": entry.class_name}
+    data.update(extra)
+    return data
+
+
+class AsyncWindows:
+    """Asenkron pencere API'si: list_windows, pin, unpin, watch.
+
+    A matcher can be:
+    - a search string (same syntax as the CLI and the GUI search box:
+      ``chrome``, ``code*``, ``/regex/``)
+    - an hwnd, or a list or set of hwnds
+    - a callable that takes an ``IndexedWindow`` (``.hwnd``, ``.title``,
+      ``.exe``, ``.class_name``)
+    - ``None`` for every window (``list_windows`` only; ``pin`` needs a
+      matcher, and ``unpin()`` without one releases only the windows this
+      instance pinned)
+
+    ``window_filter`` is a ``WindowFilter`` (default rules if omitted).
+
+    Bind one instance to one event loop. ``close()``, or leaving ``async
+    with``, stops the watcher and the thread pool.
+    """
+
+    def __init__(self, max_concurrency=8, index_ttl=1.0, watch_queue_size=1024, window_filter=None):
+        self.max_concurrency = max_concurrency
+        self.window_filter = window_filter or WindowFilter()
+        self.index_ttl = index_ttl
+        self.watch_queue_size = watch_queue_size
+        self.enumerations = 0
+        self.dropped_events = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_concurrency, thread_name_prefix="AsyncWindows")
+        self._limit = None     # asyncio.Semaphore, ilk kullanımda (doğru döngüde) oluşur
+        self._index = None
+        self._index_time = 0.0
+        self._building = None  # devam eden numaralandırma (paylaşılır)
+        self._watcher = None
+        self._watch_lock = None
+        self.pinned = set()    # bu nesnenin sabitlediği hwnd'ler (unpin() bunları bırakır)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        self._executor.shutdown(wait=False)
+
+    # ── Yürütücü ────────────────────────────────────────────────
+    async def _run(self, func, *args):
+        """Run one blocking call on the pool, at most ``max_concurrency`` at a time."""
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.max_concurrency)
+        async with self._limit:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    # ── İndeks ──────────────────────────────────────────────────
+    async def _build_index(self):
+        windows = await self._run(_listable_windows, self.window_filter)
+        self.enumerations += 1
+        hwnds = [w._hWnd for w in windows]
+        chunks = [hwnds[i:i + DESCRIBE_CHUNK] for i in range(0, len(hwnds), DESCRIBE_CHUNK)]
+        described = {}
+        for part in await asyncio.gather(*(self._run(_describe_chunk, chunk) for chunk in chunks)):
+            described.update(part)
+        index = await self._run(_build, windows, described)  # trigram indeksi de döngüyü bekletmesin
+        self._index, self._index_time = index, time.monotonic()
+        return index
+
+    async def index(self, refresh=False):
+        """The current ``WindowIndex`` (re-enumerated when older than ``index_ttl``)."""
+        fresh = self._index is not None and time.monotonic() - self._index_time < self.index_ttl
+        if fresh and not refresh:
+            return self._index
+        if self._building is None:
+            self._building = asyncio.ensure_future(self._build_index())
+            self._building.add_done_callback(lambda task: setattr(self, "_building", None))
+        # shield: bir çağıranın iptali diğerlerinin beklediği numaralandırmayı durdurmasın
+        return await asyncio.shield(self._building)
+
+    @staticmethod
+    def _select(index, matcher):
+        if matcher is None:
+            return list(index.ordered())
+        if isinstance(matcher, str):
+            return index.search_entries(matcher)
+        if isinstance(matcher, int):
+            entry = index.get(matcher)
+            return [entry] if entry is not None else []
+        if callable(matcher):
+            return [e for e in index.ordered() if matcher(e)]
+        wanted = set(matcher)
+        return [e for e in index.ordered() if e.hwnd in wanted]
+
+    # ── API ─────────────────────────────────────────────────────
+    async def list_windows(self, matcher=None, refresh=True):
+        """Matching windows as dicts with a ``topmost`` flag, in enumeration order."""
+        entries = self._select(await self.index(refresh), matcher)
+        flags = await self._run(_topmost_flags, [e.hwnd for e in entries])
+        return [record(e, topmost=flags.get(e.hwnd, False)) for e in entries]
+
+    async def pin(self, matcher):
+        """Pin every matching window in one batch; returns their records with ``ok``."""
+        if matcher is None:
+            raise ValueError("pin() needs a matcher; None would pin every window")
+        return await self._set_topmost(matcher, True)
+
+    async def unpin(self, matcher=None):
+        """Unpin matching windows that are on top; with no matcher, the ones this object pinned."""
+        if matcher is None:
+            matcher = set(self.pinned)
+            if not matcher:
+                return []
+        return await self._set_topmost(matcher, False)
+
+    async def _set_topmost(self, matcher, topmost):
+        entries = self._select(await self.index(), matcher)
+        if entries and not topmost:
+            # Zaten üstte olmayanlara dokunma
+            flags = await self._run(_topmost_flags, [e.hwnd for e in entries])
+            entries = [e for e in entries if flags.get(e.hwnd)]
+        if not entries:
+            return []
+        results = await self._run(set_topmost_many, [e.hwnd for e in entries], topmost)
+        done = {hwnd for hwnd, ok in results.items() if ok}
+        if topmost:
+            self.pinned |= done
+        else:
+            self.pinned -= done
+        action = "pin" if topmost else "unpin"
+        return [record(e, action=action, ok=results.get(e.hwnd, False)) for e in entries]
+
+    async def watch(self, kinds=None):
+        """Async iterator of ``WindowEvent`` (created / destroyed / renamed).
+
+        One ``WindowWatcher`` is shared by every ``watch()`` of this object.
+        Events are handed to the loop with ``call_soon_threadsafe``. If a
+        consumer falls more than ``watch_queue_size`` events behind, the
+        oldest are dropped (``dropped_events``).
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(self.watch_queue_size)
+
+        def deliver(event):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped_events += 1
+            queue.put_nowait(event)
+
+        def on_event(event):  # izleyici thread'i
+            if kinds is None or event.kind in kinds:
+                loop.call_soon_threadsafe(deliver, event)
+
+        watcher = await self._start_watcher()
+        watcher.subscribe(on_event)
+        try:
+            while True:
+                event = await queue.get()
+                if self._index is not None:
+                    self._index_time = 0.0  # pencere kümesi değişti; sonraki çağrı yeniden sayar
+                yield event
+        finally:
+            watcher.unsubscribe(on_event)
+
+    async def _start_watcher(self):
+        if self._watch_lock is None:
+            self._watch_lock = asyncio.Lock()
+        async with self._watch_lock:
+            if self._watcher is None:
+                watcher = WindowWatcher(accept=self.window_filter,
+                                        accept_title=self.window_filter.accept_title)
+                await self._run(watcher.start)  # ilk anlık görüntü + hook kurulumu bloklar
+                self._watcher = watcher
+        return self._watcher
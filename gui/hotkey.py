@@ -0,0 +1,126 @@
+import collections
+import ctypes
+import threading
+import time
+
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+WM_HOTKEY = 0x0312
+WM_QUIT = 0x0012
+
+DEFAULT_HOTKEY = "ctrl+alt+t"
+
+_MODIFIERS = {"ctrl": MOD_CONTROL, "control": MOD_CONTROL, "alt": MOD_ALT,
+              "shift": MOD_SHIFT, "win": MOD_WIN}
+_NAMED_KEYS = {"space": 0x20, "pause": 0x13, "insert": 0x2D, "home": 0x24, "end": 0x23}
+
+
+def parse_hotkey(text):
+    """'ctrl+alt+t' -> (modifiers, virtual key code)."""
+    modifiers, vk = 0, None
+    for part in text.lower().replace(" ", "").split("+"):
+        if part in _MODIFIERS:
+            modifiers |= _MODIFIERS[part]
+        elif part in _NAMED_KEYS:
+            vk = _NAMED_KEYS[part]
+        elif len(part) == 1 and part.isalnum():
+            vk = ord(part.upper())
+        elif part.startswith("f") and part[1:].isdigit() and 1 <= int(part[1:]) <= 24:
+            vk = 0x70 + int(part[1:]) - 1
+        else:
+            raise ValueError("Unknown key in hotkey: %r" % part)
+    if vk is None:
+        raise ValueError("Hotkey needs a non-modifier key: %r" % text)
+    return modifiers, vk
+
+
+class HotkeyService:
+    """Global kısayol: basıldığında callback'i kendi thread'inde çağırır.
+
+    RegisterHotKey is bound to a dedicated thread with its own message
+    loop, so the callback runs immediately on WM_HOTKEY without waiting for
+    the Tk or input() loop. The time from the message to the callback
+    returning is recorded in ``latencies_ms``. A callback may return a
+    follow-up callable (printing, saving, UI refresh); it runs after the
+    latency has been recorded.
+    """
+
+    def __init__(self, callback, hotkey=DEFAULT_HOTKEY, hotkey_id=0x5457):
+        self.callback = callback
+        self.hotkey = hotkey
+        self.modifiers, self.vk = parse_hotkey(hotkey)
+        self.hotkey_id = hotkey_id
+        self.latencies_ms = collections.deque(maxlen=200)
+        self.presses = 0
+        self.registered = False
+        self._thread = None
+        self._thread_id = None
+
+    def start(self):
+        """Register the hotkey; returns False if it is taken or unsupported."""
+        if self._thread and self._thread.is_alive():
+            return self.registered
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="HotkeyService", daemon=True)
+        self._thread.start()
+        ready.wait(2.0)
+        return self.registered
+
+    def stop(self, timeout=None):
+        """Unregister; with ``timeout`` wait until the key is free for another owner."""
+        if self._thread_id:
+            try:
+                ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            except Exception:
+                pass
+        if timeout and self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def handle_press(self):
+        """Run the callback once and record its latency (also used by tests/benchmarks)."""
+        start = time.perf_counter()
+        try:
+            followup = self.callback()
+        finally:
+            self.presses += 1
+            self.latencies_ms.append((time.perf_counter() - start) * 1000.0)
+        if callable(followup):
+            followup()
+
+    def stats(self):
+        if not self.latencies_ms:
+            return {"presses": self.presses}
+        ordered = sorted(self.latencies_ms)
+        return {
+            "presses": self.presses,
+            "last_ms": self.latencies_ms[-1],
+            "median_ms": ordered[len(ordered) // 2],
+            "max_ms": ordered[-1],
+        }
+
+    def _run(self, ready):
+        try:
+            from ctypes import wintypes
+            user32 = ctypes.windll.user32
+            self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+            self.registered = bool(user32.RegisterHotKey(None, self.hotkey_id,
+                                                         self.modifiers | MOD_NOREPEAT, self.vk))
+        except Exception:
+            self.registered = False
+        ready.set()
+        if not self.registered:
+            return
+        msg = wintypes.MSG()
+        try:
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                if msg.message == WM_HOTKEY and msg.wParam == self.hotkey_id:
+                    try:
+                        self.handle_press()
+                    except Exception:
+                        pass
+        finally:
+            user32.UnregisterHotKey(None, self.hotkey_id)
+            self.registered = False
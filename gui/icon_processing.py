@@ -0,0 +1,142 @@
+"""İkon son işleme: alfa kurtarma ve baskın renk (NumPy ile, toplu).
+
+``DrawIconEx`` renders into a plain BGRX bitmap, so the icon's transparency
+is lost: transparent pixels come out black. Rendering the icon twice, once
+on black and once on white, recovers it without any per-pixel Python::
+
+    alpha = 255 - max(white - black)        (over B, G, R)
+    color = black * 255 / alpha             (un-premultiply)
+
+Every icon of a refresh goes through ``process_batch`` together. The raw
+buffers are viewed as one ``(N, H, W, 4)`` array, and the dominant color of
+all icons comes from a single ``bincount``. Without NumPy the icons are
+returned as plain RGB (the old behaviour) and have no accent color.
+"""
+from PIL import Image
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # isteğe bağlı bağımlılık
+    np = None
+    HAS_NUMPY = False
+
+OPAQUE = 200        # alpha above this counts as part of the icon
+MIN_CHROMA = 48     # max(r,g,b) - min(r,g,b) below this is "gray"
+BIN_BITS = 3        # per channel for the dominant-color histogram (8 bins)
+BINS = 1 << BIN_BITS
+
+_UNPREMULTIPLY = None  # (alpha << 8 | value) -> value * 255 / alpha, built on first use
+
+
+def _unpremultiply_table():
+    global _UNPREMULTIPLY
+    if _UNPREMULTIPLY is None:
+        alpha = np.maximum(np.arange(256, dtype=np.uint32), 1)[:, None]
+        value = np.arange(256, dtype=np.uint32)[None, :]
+        _UNPREMULTIPLY = np.minimum(value * 255 // alpha, 255).astype(np.uint8).ravel()
+    return _UNPREMULTIPLY
+
+
+def _view(buffers, size):
+    """Stack raw BGRX buffers into one (N, H, W, 4) uint8 array."""
+    width, height = size
+    data = np.frombuffer(b"".join(buffers), dtype=np.uint8)
+    return data.reshape(len(buffers), height, width, 4)
+
+
+def recover_alpha(black, white):
+    """(N,H,W,4) BGRX on black + on white -> (N,H,W,4) straight RGBA."""
+    # Doygun uint8 çıkarma (beyaz < siyah gürültüsü 0'a iner), kanal kanal
+    spread = None
+    for c in range(3):
+        w, b = white[..., c], black[..., c]
+        diff = w - np.minimum(w, b)
+        spread = diff if spread is None else np.maximum(spread, diff, out=spread)
+    alpha = 255 - spread
+
+    rgba = np.empty(black.shape, dtype=np.uint8)
+    rgb = rgba[..., :3]
+    rgb[...] = black[..., 2::-1]  # BGR -> RGB
+    rgba[..., 3] = alpha
+    # Yalnız yarı saydam kenar pikselleri: renk = siyah * 255 / alfa (tablodan)
+    partial = (alpha > 0) & (alpha < 255)
+    if partial.any():
+        index = (alpha[partial].astype(np.uint16) << 8)[:, None] | rgb[partial]
+        rgb[partial] = _unpremultiply_table()[index]
+    return rgba
+
+
+def dominant_colors(rgba):
+    """Dominant (r, g, b) per icon in one histogram pass; None for blank icons.
+
+    Opaque, saturated pixels vote; if an icon has none (gray/black logos) its
+    opaque pixels vote instead. The winning bin's mean color is returned.
+    """
+    count = rgba.shape[0]
+    pixels = rgba.reshape(count, -1, 4)
+    r, g, b = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    opaque = pixels[..., 3] > OPAQUE
+    # Kanal kanal işlem: küçük son eksende max()/min() çok yavaş
+    chroma = np.maximum(np.maximum(r, g), b) - np.minimum(np.minimum(r, g), b)
+    colorful = opaque & (chroma >= MIN_CHROMA)
+    has_color = colorful.any(axis=1)
+    voters = np.where(has_color[:, None], colorful, opaque)
+
+    shift = 8 - BIN_BITS
+    bins = (((r >> shift).astype(np.int32) << (2 * BIN_BITS))
+            | ((g >> shift) << BIN_BITS).astype(np.int32) | (b >> shift))
+    nbins = BINS ** 3
+    # Tüm ikonlar tek bincount: her ikonun kutuları kendi ofsetinde
+    keys = (bins + np.arange(count, dtype=np.int32)[:, None] * nbins)[voters]
+    hist = np.bincount(keys, minlength=count * nbins).reshape(count, nbins)
+    best = hist.argmax(axis=1)
+    votes = hist[np.arange(count), best]
+    # Kazanan kutudaki piksellerin ortalaması (ikon başına bir matris çarpımı)
+    winners = (voters & (bins == best[:, None])).astype(np.float32)[:, None, :]
+    sums = np.matmul(winners, pixels[..., :3].astype(np.float32))[:, 0]
+    means = sums / np.maximum(votes, 1)[:, None]
+    return [tuple(int(v) for v in means[i]) if votes[i] else None for i in range(count)]
+
+
+def process_batch(black_buffers, white_buffers, size=(32, 32)):
+    """Raw BGRX renders -> list of PIL images with ``info['accent']`` set.
+
+    ``white_buffers`` may be None (no white pass); then alpha is not
+    recovered and only the accent color is computed.
+    """
+    if not black_buffers:
+        return []
+    if not HAS_NUMPY:
+        return [_plain_image(buf, size) for buf in black_buffers]
+
+    black = _view(black_buffers, size)
+    if white_buffers is not None:
+        rgba = recover_alpha(black, _view(white_buffers, size))
+    else:
+        rgba = np.empty(black.shape, dtype=np.uint8)
+        rgba[..., :3] = black[..., 2::-1]
+        rgba[..., 3] = 255
+    accents = dominant_colors(rgba)
+    images = []
+    for i, accent in enumerate(accents):
+        img = Image.fromarray(rgba[i])  # (H, W, 4) uint8 -> RGBA
+        img.info['accent'] = accent
+        images.append(img)
+    return images
+
+
+def _plain_image(buffer, size):
+    img = Image.frombuffer('RGB', size, buffer, 'raw', 'BGRX', 0, 1)
+    img.info['accent'] = None
+    return img
+
+
+def tint(accent, base, amount=0.22):
+    """Blend ``accent`` (r, g, b) into the ``base`` hex color; base if no accent."""
+    if not accent:
+        return base
+    br, bg, bb = int(base[1:3], 16), int(base[3:5], 16), int(base[5:7], 16)
+    r, g, b = accent
+    mix = lambda a, c: int(round(c + (a - c) * amount))
+    return "#%02x%02x%02x" % (mix(r, br), mix(g, bg), mix(b, bb))
@@ -0,0 +1,88 @@
+import collections
+
+BASE_ICON_SIZE = 32   # %100 ölçekte (96 DPI) ikon boyutu
+SCALE_STEP = 0.25     # Windows ölçek adımları: %100, %125, %150, %175, %200...
+
+
+def quantize_scale(scale):
+    """Round a display scale to the nearest Windows step (at least 1.0)."""
+    try:
+        scale = float(scale)
+    except (TypeError, ValueError):
+        return 1.0
+    return max(1.0, round(scale / SCALE_STEP) * SCALE_STEP)
+
+
+def icon_size(scale):
+    """Icon edge in pixels for a display scale (32 at 100%, 48 at 150%...)."""
+    return int(round(BASE_ICON_SIZE * quantize_scale(scale)))
+
+
+class IconVariantCache:
+    """Ölçeklenmiş ikonlar: (hwnd, boyut) başına, bellek bütçeli LRU.
+
+    The 100% icons stay in the manager's ``icon_cache``. This table only
+    holds the larger renders for high-DPI monitors, so a panel that never
+    leaves a 100% screen keeps it empty. Entries are evicted least recently
+    used first once ``total_bytes`` passes ``max_bytes``.
+
+    ``discard(hwnd)`` drops every size of a window and ``__iter__`` yields
+    hwnds, so the reaper can register it like any other table.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()  # (hwnd, size) -> (image, nbytes)
+        self.total_bytes = 0
+        self.counters = collections.Counter()
+
+    def get(self, hwnd, size):
+        entry = self.entries.get((hwnd, size))
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+        self.entries.move_to_end((hwnd, size))
+        self.counters["hits"] += 1
+        return entry[0]
+
+    def has(self, hwnd, size):
+        return (hwnd, size) in self.entries
+
+    def put(self, hwnd, size, img):
+        nbytes = img.width * img.height * len(img.getbands())
+        old = self.entries.pop((hwnd, size), None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self.entries[(hwnd, size)] = (img, nbytes)
+        self.total_bytes += nbytes
+        self._evict()
+
+    def resize(self, max_bytes):
+        """Change the memory budget; evicts least recently used entries if needed."""
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self.counters["evicted"] += 1
+
+    def discard(self, hwnd):
+        """Drop every size of a window (reaper)."""
+        for key in [k for k in self.entries if k[0] == hwnd]:
+            self.total_bytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def sizes(self):
+        """{size: entry count}"""
+        return collections.Counter(size for _, size in self.entries)
+
+    def __iter__(self):
+        return iter({hwnd for hwnd, _ in self.entries})
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,169 @@
+import ctypes
+import datetime
+import os
+import sys
+import time
+import tracemalloc
+
+LEAK_LOG_FILE = "gui_leak_log.txt"
+
+
+def leak_log_path(folder):
+    """Leak report that lives next to gui_error_log.txt."""
+    return os.path.join(folder, LEAK_LOG_FILE)
+
+
+def gui_resources(kind):
+    """GDI (0) or USER (1) handle count of this process; None off Windows."""
+    if sys.platform != "win32":
+        return None
+    try:
+        user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+        return user32.GetGuiResources(kernel32.GetCurrentProcess(), kind)
+    except Exception:
+        return None
+
+
+def _widgets(widget):
+    stack, found = [widget], []
+    while stack:
+        w = stack.pop()
+        found.append(w)
+        stack.extend(w.winfo_children())
+    return found
+
+
+def manager_probes(manager):
+    """{name: (count function, tolerance)} for the WindowManager's tables."""
+    return {
+        "icon_cache": (lambda: len(manager.icon_cache), 0),
+        "icon_variants": (lambda: len(manager.icon_variants), 0),
+        "thumbnails": (lambda: len(manager.thumbnails), 0),
+        "topmost_titles": (lambda: len(manager.topmost_titles), 0),
+        "reaper_identities": (lambda: len(manager.reaper), 0),
+        "gdi_objects": (lambda: gui_resources(0), 8),
+        "user_objects": (lambda: gui_resources(1), 8),
+    }
+
+
+def app_probes(app):
+    """Manager probes plus the Tk side of the panel.
+
+    Card-related counts are taken relative to the cards on screen, so they
+    do not move when the user simply has more windows open.
+    """
+    root = app.root
+
+    def images_beyond_cards():
+        # Her kartın bir ikonu var; fazlası yok edilmiş kartlardan kalmıştır
+        return len(root.tk.splitlist(root.tk.call("image", "names"))) - len(app._cards)
+
+    def canvas_items_max():
+        return max([len(w.find_all()) for w in _widgets(root) if w.winfo_class() == "Canvas"] or [0])
+
+    def widgets_beyond_cards():
+        return len(_widgets(root)) - 3 * len(app._cards)  # çerçeve, gölge, tuval
+
+    probes = manager_probes(app.manager)
+    probes.update({
+        "photo_images": (images_beyond_cards, 2),
+        "canvas_items": (canvas_items_max, 0),
+        "widgets": (widgets_beyond_cards, 0),
+        "after_jobs": (lambda: len(root.tk.splitlist(root.tk.call("after", "info"))), 4),
+    })
+    return probes
+
+
+class LeakSentinel:
+    """Uzun oturumlarda büyüyen sayaçları yakalayan nöbetçi.
+
+    Each ``sample()`` reads every probe (a function that returns a count,
+    or None where it does not apply). When tracemalloc is tracing it also
+    reads the traced memory. A probe is reported as leaking when it trends
+    upward: the lowest value in the last third of the samples is still
+    above the highest value in the first third plus the probe's
+    tolerance. A count that rises and falls back, e.g. with the number of
+    open windows, is not reported.
+
+    ``report()`` lists the growth of every probe since the baseline. With
+    tracemalloc it also lists the source lines that allocated the most
+    since the baseline snapshot.
+    """
+
+    def __init__(self, probes, history=60, memory_tolerance=256 * 1024, log_path=None):
+        self.probes = dict(probes)
+        self.history = history
+        self.memory_tolerance = memory_tolerance
+        self.log_path = log_path
+        self.samples = []  # [(time, {name: count})]
+        self.reported = set()
+        self._snapshot = None
+
+    def sample(self):
+        counts = {}
+        for name, (probe, _) in self.probes.items():
+            try:
+                value = probe()
+            except Exception:
+                value = None
+            if value is not None:
+                counts[name] = value
+        if tracemalloc.is_tracing():
+            counts["traced_bytes"] = tracemalloc.get_traced_memory()[0]
+            if self._snapshot is None:
+                self._snapshot = tracemalloc.take_snapshot()
+        self.samples.append((time.time(), counts))
+        # Bellek sınırlı kalsın: her ikinci örnek atılır, taban ve son örnek kalır
+        if len(self.samples) > self.history:
+            self.samples = self.samples[:1] + self.samples[1:-1:2] + self.samples[-1:]
+        return counts
+
+    def _tolerance(self, name):
+        if name == "traced_bytes":
+            return self.memory_tolerance
+        return self.probes[name][1]
+
+    def trends(self):
+        """{name: (baseline, latest, growing)} over the kept samples."""
+        result = {}
+        if not self.samples:
+            return result
+        third = max(1, len(self.samples) // 3)
+        head, tail = self.samples[:third], self.samples[-third:]
+        for name in self.samples[-1][1]:
+            values = [c[name] for _, c in self.samples if name in c]
+            early = [c[name] for _, c in head if name in c]
+            late = [c[name] for _, c in tail if name in c]
+            growing = (len(self.samples) >= 6 and bool(early) and bool(late)
+                       and min(late) > max(early) + self._tolerance(name))
+            result[name] = (values[0], values[-1], growing)
+        return result
+
+    def leaking(self):
+        return sorted(name for name, (_, _, growing) in self.trends().items() if growing)
+
+    def report(self, top=10):
+        lines = []
+        for name, (first, last, growing) in sorted(self.trends().items()):
+            lines.append("%-18s %10d -> %-10d %+d%s" % (name, first, last, last - first,
+                                                       "   GROWING" if growing else ""))
+        if self._snapshot is not None and tracemalloc.is_tracing():
+            lines.append("top allocations since baseline:")
+            for stat in tracemalloc.take_snapshot().compare_to(self._snapshot, "lineno")[:top]:
+                lines.append("  %s" % stat)
+        return "\n".join(lines)
+
+    def check(self):
+        """Sample once; write a report the first time a probe starts growing."""
+        self.sample()
+        leaking = set(self.leaking())
+        new = leaking - self.reported
+        self.reported = leaking
+        if new and self.log_path:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write("\n--- Growing: %s at %s (%d samples) ---\n%s\n" % (
+                        ", ".join(sorted(new)), datetime.datetime.now(), len(self.samples), self.report()))
+            except Exception:
+                pass
+        return sorted(new)
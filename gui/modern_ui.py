@@ -1,14 +1,40 @@
 import tkinter as tk
 try:
-    from .window_manager import WindowManager
+    from .window_manager import WindowManager, DEFAULT_DATA_FILE
+    from .window_index import WindowIndex, group_by_app, app_key
+    from .hotkey import HotkeyService
+    from .tray import TrayService, SHOW, HIDE, EXIT, UNPIN, PROFILE, SAVE_PROFILE
+    from .window_events import WindowWatcher, DESTROYED, RENAMED
+    from .icon_processing import tint
+    from .window_trace import TraceRecorder
+    from .stall_detector import StallDetector, stall_log_path
+    from .leak_sentinel import LeakSentinel, app_probes, leak_log_path
+    from .perf_config import PerfConfig, config_path
+    from .window_info import window_scale, enable_dpi_awareness
+    from .icon_variants import quantize_scale
+    from .power_state import PowerState, ACTIVE, HIDDEN, IDLE
 except ImportError:
-    from window_manager import WindowManager
+    from window_manager import WindowManager, DEFAULT_DATA_FILE
+    from window_index import WindowIndex, group_by_app, app_key
+    from hotkey import HotkeyService
+    from tray import TrayService, SHOW, HIDE, EXIT, UNPIN, PROFILE, SAVE_PROFILE
+    from window_events import WindowWatcher, DESTROYED, RENAMED
+    from icon_processing import tint
+    from window_trace import TraceRecorder
+    from stall_detector import StallDetector, stall_log_path
+    from leak_sentinel import LeakSentinel, app_probes, leak_log_path
+    from perf_config import PerfConfig, config_path
+    from window_info import window_scale, enable_dpi_awareness
+    from icon_variants import quantize_scale
+    from power_state import PowerState, ACTIVE, HIDDEN, IDLE
+import contextlib
 import ctypes
 import os
+import queue
 import sys
+import tracemalloc
 from PIL import Image
-import pystray
-from pystray import MenuItem as item
+import pygetwindow as gw
 import win32gui
 
 # Pillow kontrolü
@@ -65,43 +91,135 @@ def load_icon(filename, size=(20, 20)):
         return None
 
 class ToolTip:
-    """Modern Tooltip - Fare Takipli"""
-    def __init__(self, widget, text):
-        self.widget = widget
-        self.text = text
-        self.tooltip = None
-        self.widget.bind("<Enter>", self.show)
-        self.widget.bind("<Leave>", self.hide)
-        self.widget.bind("<Motion>", self.move)
-
-    def show(self, event=None):
-        if self.tooltip or not self.text: return
-        x, y = event.x_root + 12, event.y_root + 12
-        self.tooltip = tk.Toplevel(self.widget)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.attributes('-topmost', True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
-        
-        self.tooltip.update_idletasks()
+    """Modern Tooltip - Fare Takipli (uygulama genelinde tek pencere)
+
+    The Toplevel is built once, on first use, and is only withdrawn and
+    re-shown afterwards. Hovering a widget shows the tooltip after
+    ``delay`` ms. Moving straight to the next attached widget swaps the
+    text and image in place with no new delay. ``<Motion>`` moves are
+    coalesced to one geometry call every ``motion_ms``.
+    """
+    def __init__(self, root, delay=350, motion_ms=30, hide_grace=60):
+        self.root = root
+        self.delay = delay
+        self.motion_ms = motion_ms
+        self.hide_grace = hide_grace
+        self.window = None
+        self.visible = False
+        self.owner = None            # widget the tooltip currently describes
+        self._content = (None, None)  # (text, image_provider)
+        self._pos = (0, 0)
+        self._show_job = None
+        self._hide_job = None
+        self._move_job = None
+        self.photo = None
+        self.created = 0             # Toplevel count (benchmarks: stays at 1)
+
+    def attach(self, widget, text, image_provider=None):
+        """Show ``text`` (and ``image_provider()``'s image) while hovering ``widget``
+
+        ``text`` may also be a callable; it is called each time the tooltip opens.
+        """
+        widget.bind("<Enter>", lambda e: self._enter(widget, text, image_provider, e), add="+")
+        widget.bind("<Leave>", lambda e: self._leave(widget), add="+")
+        widget.bind("<Motion>", self._motion, add="+")
+
+    def _build(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.withdraw()
+        self.window.wm_overrideredirect(True)
+        self.window.attributes('-topmost', True)
+        self.created += 1
+        
+        self.window.update_idletasks()
         try:
-            hwnd = ctypes.windll.user32.GetParent(self.tooltip.winfo_id())
+            hwnd = ctypes.windll.user32.GetParent(self.window.winfo_id())
             set_rounded_corners(hwnd, 3)
         except: pass
         
-        frame = tk.Frame(self.tooltip, bg=COLORS['bg_card'], padx=1, pady=1)
-        frame.pack()
-        label = tk.Label(frame, text=self.text, bg=COLORS['bg_card'], fg=COLORS['text'],
+        self.frame = tk.Frame(self.window, bg=COLORS['bg_card'], padx=1, pady=1)
+        self.frame.pack()
+        self.label = tk.Label(self.frame, bg=COLORS['bg_card'], fg=COLORS['text'],
                         font=("Segoe UI", 9), padx=10, pady=6)
-        label.pack()
+        self.label.pack(side="bottom")
+        self.image_label = tk.Label(self.frame, bg=COLORS['bg_card'], bd=0, padx=4, pady=4)
+
+    def _cancel(self, name):
+        job = getattr(self, name)
+        if job:
+            self.root.after_cancel(job)
+            setattr(self, name, None)
+
+    def _enter(self, widget, text, image_provider, event):
+        if not text:
+            return
+        self._cancel("_hide_job")
+        self.owner = widget
+        self._content = (text, image_provider)
+        self._pos = (event.x_root, event.y_root)
+        if self.visible:
+            self._show()  # bir karttan diğerine: gecikme yok, sadece içerik
+        else:
+            self._cancel("_show_job")
+            self._show_job = self.root.after(self.delay, self._show)
 
-    def move(self, event=None):
-        if self.tooltip:
-            self.tooltip.wm_geometry(f"+{event.x_root + 12}+{event.y_root + 12}")
+    def _leave(self, widget):
+        if self.owner is not widget:
+            return
+        self._cancel("_show_job")
+        self._cancel("_hide_job")
+        # Komşu karta geçerken titremesin diye kısa bir bekleme
+        self._hide_job = self.root.after(self.hide_grace, self.hide)
+
+    def _motion(self, event):
+        self._pos = (event.x_root, event.y_root)
+        if self.visible and not self._move_job:
+            self._move_job = self.root.after(self.motion_ms, self._apply_move)
+
+    def _apply_move(self):
+        self._move_job = None
+        if self.visible:
+            self.window.wm_geometry(f"+{self._pos[0] + 12}+{self._pos[1] + 12}")
+
+    def _show(self):
+        self._show_job = None
+        if self.owner is None:
+            return
+        if self.window is None:
+            self._build()
+        text = self._content[0]
+        self.label.configure(text=text() if callable(text) else text)
+        self.image_label.pack_forget()
+        self.photo = None
+        self.update_image()
+        self.window.wm_geometry(f"+{self._pos[0] + 12}+{self._pos[1] + 12}")
+        if not self.visible:
+            self.window.deiconify()
+            self.window.lift()
+            self.visible = True
+
+    def update_image(self):
+        """Show the provider's current thumbnail above the title, if any"""
+        provider = self._content[1]
+        if self.window is None or not provider or not HAS_PILLOW:
+            return
+        img = provider()
+        if img is None:
+            return
+        self.photo = ImageTk.PhotoImage(img)
+        self.image_label.configure(image=self.photo)
+        if not self.image_label.winfo_manager():
+            self.image_label.pack(side="top", before=self.label)
 
     def hide(self, event=None):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+        self._cancel("_show_job")
+        self._cancel("_hide_job")
+        self._cancel("_move_job")
+        self.owner = None
+        if self.visible:
+            self.window.withdraw()
+            self.visible = False
+            self.photo = None
 
 class RoundedCard(tk.Canvas):
     """Canvas tabanlı yuvarlak köşeli kart"""
@@ -117,17 +235,41 @@ class RoundedCard(tk.Canvas):
         """Smoothly scale the card"""
         current_scale = getattr(self, '_current_scale', 1.0)
         scale_step = (target_scale - current_scale) / steps
+        if getattr(self, '_scale_job', None):
+            self.after_cancel(self._scale_job)
+        self._scale_target = target_scale
         
         def step(count):
             if count < steps:
                 scale = current_scale + scale_step * (count + 1)
                 self.scale("all", 0, 0, scale / getattr(self, '_current_scale', 1.0), scale / getattr(self, '_current_scale', 1.0))
                 self._current_scale = scale
-                self.after(delay, lambda: step(count + 1))
+                self._scale_job = self.after(delay, lambda: step(count + 1))
             else:
                 self._current_scale = target_scale
+                self._scale_job = None
                 
         step(0)
+
+    def finish_animations(self):
+        """Jump every running effect to its end state (no more after() wakeups)."""
+        job = getattr(self, '_scale_job', None)
+        if job:
+            self.after_cancel(job)
+            self._scale_job = None
+            factor = self._scale_target / self._current_scale
+            self.scale("all", 0, 0, factor, factor)
+            self._current_scale = self._scale_target
+        job = getattr(self, '_transition_job', None)
+        if job:
+            self.after_cancel(job)
+            self._transition_job = None
+            self.set_color(self._transition_target)
+        job = getattr(self, '_pulse_job', None)
+        if job:
+            self.after_cancel(job)
+            self._pulse_job = None
+            self.set_color(self._pulse_color)
         
     def _draw_rounded_rect(self, color):
         self.delete("card")
@@ -158,8 +300,13 @@ class RoundedCard(tk.Canvas):
             bright_color = f"#{r:02x}{g:02x}{b:02x}"
             self.set_color(bright_color)
             
+        def restore():
+            self._pulse_job = None
+            self.set_color(original_color)
+            
         brighten()
-        self.after(duration // 2, lambda: self.set_color(original_color))
+        self._pulse_color = original_color
+        self._pulse_job = self.after(duration // 2, restore)
         
     def transition_color(self, target_color, steps=10, delay=20):
         """Smoothly transition to a target color"""
@@ -168,6 +315,7 @@ class RoundedCard(tk.Canvas):
             
         if self._transition_job:
             self.after_cancel(self._transition_job)
+        self._transition_target = target_color
             
         # Parse current and target colors
         current = self.card_bg
@@ -202,20 +350,24 @@ class RoundedCard(tk.Canvas):
 
 class IconCard(tk.Frame):
     """Modern Yuvarlak Köşeli İkon Kartı"""
-    def __init__(self, parent, window, manager, on_update):
+    def __init__(self, parent, window, manager, on_update, tooltip=None, scale=1.0):
         super().__init__(parent, bg=COLORS['bg_dark'])
         
         self.window = window
         self.manager = manager
+        self.scale = scale  # panelin bulunduğu ekranın ölçeği (dpi_aware)
         self.on_update = on_update
         self.img_ref = None
         self.is_active = False
+        self.tint = COLORS['bg_card']  # ikonun baskın rengiyle hafifçe boyanır
+        self.group = None  # gruplu görünümde üyesi olduğu GroupCard
         
         # Create a container frame for shadow effect
         self.shadow_frame = tk.Frame(self, bg="#000000", bd=0)
         self.shadow_frame.pack(padx=4, pady=4)
         
-        self.card = RoundedCard(self.shadow_frame, width=54, height=54, radius=12)
+        edge = int(round(54 * scale))
+        self.card = RoundedCard(self.shadow_frame, width=edge, height=edge, radius=int(round(12 * scale)))
         self.card.pack(padx=0, pady=0)
         
         self._load_icon()
@@ -226,16 +378,20 @@ class IconCard(tk.Frame):
         if window.title in manager.previous_windows:
             self.configure(bg=COLORS['accent'])
         
-        ToolTip(self.card, window.title)
+        if tooltip is not None:
+            tooltip.attach(self.card, window.title,
+                           image_provider=lambda: manager.thumbnails.request(window._hWnd))
 
     def _load_icon(self):
-        size = 32
+        size = self.manager.icon_size(self.scale)
         img = None
         
         if HAS_PILLOW:
-            pil_img = self.manager.get_window_icon(self.window._hWnd)
+            pil_img = self.manager.get_window_icon(self.window._hWnd, self.scale)
             if pil_img:
-                pil_img = pil_img.resize((size, size), Image.Resampling.LANCZOS)
+                self.tint = tint(pil_img.info.get('accent'), COLORS['bg_card'])
+                if pil_img.size != (size, size):
+                    pil_img = pil_img.resize((size, size), Image.Resampling.LANCZOS)
                 img = ImageTk.PhotoImage(pil_img)
         
         if img is None and HAS_PILLOW:
@@ -245,12 +401,13 @@ class IconCard(tk.Frame):
             draw.text((size//3, size//4), char, fill=COLORS['text_muted'])
             img = ImageTk.PhotoImage(fallback)
         
+        center = self.card.w // 2
         if img:
             self.img_ref = img
-            self.card.create_image(27, 27, image=img, tags="icon")
+            self.card.create_image(center, center, image=img, tags="icon")
             self.card.tag_raise("icon")
         else:
-            self.card.create_text(27, 27, text=self.window.title[0].upper() if self.window.title else "?",
+            self.card.create_text(center, center, text=self.window.title[0].upper() if self.window.title else "?",
                                  fill=COLORS['text_muted'], font=("Segoe UI", 14, "bold"), tags="icon")
             self.card.tag_raise("icon")
 
@@ -260,27 +417,42 @@ class IconCard(tk.Frame):
         self.card.bind("<Button-1>", self._on_click)
         self.card.bind("<Button-3>", self._minimize_window)
 
+    def _set_color(self, color):
+        if self.manager.config.animations:
+            self.card.transition_color(color)
+            return
+        job = getattr(self.card, '_transition_job', None)
+        if job:
+            self.card.after_cancel(job)
+            self.card._transition_job = None
+        self.card.set_color(color)
+
     def _on_enter(self, e):
         if not self.is_active:
-            self.card.transition_color(COLORS['bg_hover'])
+            self._set_color(COLORS['bg_hover'])
             # Smooth scale up effect
-            self.card.animate_scale(1.05)
+            if self.manager.config.animations:
+                self.card.animate_scale(1.05)
             # Shadow effect
             self.shadow_frame.configure(bg="#333333")
 
     def _on_leave(self, e):
         # Reset scale effect
-        self.card.animate_scale(1.0)
+        if getattr(self.card, '_current_scale', 1.0) != 1.0:
+            self.card.animate_scale(1.0)
         # Reset shadow effect
         self.shadow_frame.configure(bg="#000000")
         self._update_visual()
 
     def _on_click(self, e):
         # Pulse effect for click
-        self.card.pulse_effect()
+        if self.manager.config.animations:
+            self.card.pulse_effect()
         
         self.manager.toggle_topmost(self.window)
         self._update_visual()
+        if self.group is not None:
+            self.group._update_visual()
         # Update the manager's previous windows list after toggling
         self._update_previous_windows_list()
 
@@ -294,34 +466,138 @@ class IconCard(tk.Frame):
     def _update_visual(self):
         self.is_active = self.manager.is_always_on_top(self.window._hWnd)
         if self.is_active:
-            self.card.transition_color(COLORS['accent_dim'])
+            self._set_color(COLORS['accent_dim'])
             self.configure(bg=COLORS['accent'])
         else:
-            self.card.transition_color(COLORS['bg_card'])
+            self._set_color(self.tint)
             self.configure(bg=COLORS['bg_dark'])
 
     def _update_previous_windows_list(self):
         """Update the list of previous windows in the manager"""
-        # Get all currently active windows from the manager
-        active_windows = []
+        self.manager.save_topmost_titles()
+
+class GroupCard(IconCard):
+    """Bir uygulamanın tüm pencereleri için tek kart (gruplu görünüm).
+
+    Shows the icon of the app's first window and a badge with the number of
+    matching windows. Left click pins the whole group in one batch, or
+    unpins it if every window is already on top. Right click expands or
+    collapses the group. The member cards are created only when the group
+    is first expanded.
+    """
+    def __init__(self, parent, key, entries, manager, on_expand, on_batch, tooltip=None, scale=1.0):
+        self.key = key
+        self.entries = list(entries)
+        self.on_expand = on_expand
+        self.on_batch = on_batch
+        self.expanded = False
+        super().__init__(parent, self.entries[0].window, manager, None, scale=scale)
+        if tooltip is not None:
+            tooltip.attach(self.card, self._tooltip_text)
+        self._draw_badge()
+
+    def _tooltip_text(self):
+        name = self.entries[0].exe or self.entries[0].title
+        return "%s — %d windows\nClick: pin / unpin all   Right click: %s" % (
+            name, len(self.entries), "collapse" if self.expanded else "expand")
+
+    def set_entries(self, entries):
+        """Matching members changed (search box): update the badge and state."""
+        entries = list(entries)
+        if [e.hwnd for e in entries] == [e.hwnd for e in self.entries]:
+            self.entries = entries
+            return
+        recount = len(entries) != len(self.entries)
+        self.entries = entries
+        if recount:
+            self._draw_badge()
+        self._update_visual()
+
+    def _draw_badge(self):
+        self.card.delete("badge")
+        count = len(self.entries)
+        text = str(count) if count < 100 else "99+"
+        w, s = self.card.w, self.scale
+        px = lambda n: int(round(n * s))
+        self.card.create_oval(w - px(22), px(2), w - px(2), px(20), fill=COLORS['accent'], outline="",
+                              tags=("icon", "badge"))
+        self.card.create_text(w - px(12), px(11), text=text, fill=COLORS['bg_dark'],
+                              font=("Segoe UI", 7, "bold"), tags=("icon", "badge"))
+
+    def _on_click(self, e):
+        if self.manager.config.animations:
+            self.card.pulse_effect()
+        pin = not all(self.manager.is_always_on_top(entry.hwnd) for entry in self.entries)
+        self.manager.set_topmost_many(self.entries, topmost=pin)
+        self._update_visual()
+        self.on_batch(self)
+
+    def _minimize_window(self, e):
+        """Right click expands / collapses the group instead of minimizing"""
+        self.expanded = not self.expanded
+        self.shadow_frame.configure(bg=COLORS['accent_dim'] if self.expanded else "#000000")
+        self.on_expand(self)
+
+    def _on_leave(self, e):
+        super()._on_leave(e)
+        if self.expanded:
+            self.shadow_frame.configure(bg=COLORS['accent_dim'])
+
+    def _update_visual(self):
+        entries = getattr(self, 'entries', None)
+        if not entries:
+            return super()._update_visual()
+        pinned = sum(1 for entry in entries if self.manager.is_always_on_top(entry.hwnd))
+        self.is_active = pinned == len(entries)
+        if self.is_active:
+            self._set_color(COLORS['accent_dim'])
+            self.configure(bg=COLORS['accent'])
+        else:
+            self._set_color(self.tint)
+            # Kısmen sabitlenmiş grup: ince vurgu kenarı
+            self.configure(bg=COLORS['accent_dim'] if pinned else COLORS['bg_dark'])
+
+class TopWindowApp:
+    def __init__(self, pinned=()):
+        """``pinned``: windows that are already on top and should stay that way
+        (in-process handoff from the CLI menu)."""
         try:
-            # We need to get the titles of all windows that are currently topmost
-            # Since the manager tracks hwnds, we need to get their titles
-            for hwnd in list(self.manager.topmost_hwnds):
+            self._setup(pinned)
+        except Exception:
+            self._abort_setup()
+            raise
+
+    def _abort_setup(self):
+        """__init__ failed part way: stop the threads it already started.
+
+        The pinned windows are left on top (no ``manager.cleanup()``), so a
+        failed handoff gives them back to the CLI as they were. The hotkey
+        is released before returning so the CLI can register it again.
+        """
+        if getattr(self, "power", None) is not None:
+            self.power.cancel_all()
+        manager = getattr(self, "manager", None)
+        for owner, name, method in ((self, "stall_detector", "stop"), (self, "watcher", "stop"),
+                                    (self, "recorder", "close"), (self, "tray", "stop"),
+                                    (manager, "thumbnails", "stop"), (manager, "history", "close")):
+            service = getattr(owner, name, None)
+            if service is not None:
                 try:
-                    window_title = win32gui.GetWindowText(hwnd)
-                    if window_title:
-                        active_windows.append(window_title)
-                except:
+                    getattr(service, method)()
+                except Exception:
                     pass
-        except:
+        if getattr(self, "hotkey", None) is not None:
+            self.hotkey.stop(timeout=1.0)
+        try:
+            self.root.destroy()
+        except Exception:
             pass
-        
-        # Save to manager
-        self.manager.save_previous_windows(active_windows)
 
-class TopWindowApp:
-    def __init__(self):
+    def _setup(self, pinned):
+        # Ekran başına DPI farkındalığı ilk pencereden önce açılmalı (dpi_aware)
+        early = PerfConfig(config_path(DEFAULT_DATA_FILE))
+        early.reload_if_changed()
+        self._dpi_aware = early.dpi_aware and enable_dpi_awareness()
         self.root = tk.Tk()
         self.root.title("TopWindow")
         self.root.configure(bg=COLORS['bg_dark'])
@@ -346,12 +622,29 @@ class TopWindowApp:
         except: pass
         
         self.manager = WindowManager()
-        self._drag = {"x": 0, "y": 0}
-        self._snap_threshold = 30  # pixels
-        self._snap_margin = 10     # pixels margin from edge
-        self._snap_animation_steps = 20
-        self._snap_animation_delay = 15  # ms
+        self.manager.watchdog.on_release = self._on_topmost_released
+        self.manager.adopt_topmost(pinned)
+        # Panelin ekranının ölçeği: kartlar ve ikonlar bu boyutta çizilir
+        self._scale = self._panel_scale()
+        if self._scale != 1.0:
+            self._resize_panel()
+        self.window_index = WindowIndex()
+        self._cards = {}       # hwnd (or ("app", exe) for a group) -> card
+        self._groups = {}      # app key -> GroupCard (gruplu görünüm)
+        self._grid_order = []  # card keys in their current grid cells
+        self._layout_depth = 0     # iç içe layout_transaction sayısı
+        self._scroll_job = None    # bekleyen scrollregion güncellemesi
+        self._grouped = bool(self.manager.get_setting("grouped_view", False))
+        self._drag = {"x": 0, "y": 0, "win_x": 0, "win_y": 0, "pos": None, "job": None}
+        # Aralıklar ve eşikler top_window_perf.json'dan gelir (bkz. _apply_config):
+        # drag_frame_ms (en fazla kare başına bir konum), snap eşiği / kenar payı (px)
+        self.config = self.manager.config
         self._is_dragging = False  # Track dragging state
+        self._panel_hidden = False
+        # Gizli / boşta / pildeyken zamanlayıcılar yavaşlar veya durur (bkz. _start_timers)
+        self.power = PowerState(self.root)
+        self._refresh_pending = False  # gizliyken istenen yenileme, gösterince yapılır
+        self._thumbnail_ready = False  # işçi thread'i yazar, _drain_inbox okur
         
         # İkonları yükle
         self._icons = {
@@ -360,14 +653,58 @@ class TopWindowApp:
             'logo': load_icon("top_window_icon.png", (24, 24)),
         }
         
-        # Create tray icon
+        # Tepsi ikonu: tek kalıcı thread, komutlar kuyrukla gelir
         self._create_tray_icon()
+        self.tray.start()
+        
+        # Tüm kartların paylaştığı tek tooltip penceresi
+        self.tooltip = ToolTip(self.root)
+        # Olay döngüsü donarsa ana thread'in yığını gui_stall_log.txt'ye yazılır
+        self.stall_detector = StallDetector(self.root, stall_log_path(BASE_DIR),
+                                            on_beat=lambda: self.power.count_wakeup("stall_heartbeat"))
+        # Gün boyu açık kalan panelde büyüyen sayaçlar gui_leak_log.txt'ye raporlanır
+        self.leak_sentinel = LeakSentinel(app_probes(self), log_path=leak_log_path(BASE_DIR))
+        self._apply_config(set())
+        self.config.subscribe(self._apply_config)
         
         self._build_ui()
         self._refresh()
         
-        # Start periodic edge check
-        self._check_edge_position()
+        # Kenar kontrolü, topmost bekçisi, ayar dosyası, sızıntı ve güç durumu
+        self._start_timers()
+        self.power.subscribe(self._on_power_change)
+        # Boştayken panele dokunmak hemen uyandırır
+        self.root.bind("<Enter>", lambda e: self.power.poll() if self.power.state == IDLE else None, add="+")
+        self.power.poll()
+        
+        if self.config.stall_threshold_ms and not self.power.low_power:
+            self.stall_detector.start()
+        
+        # Küçük resimler: işçi thread'i yakalar, pencere olayları önbelleği bozar
+        self.manager.thumbnails.on_ready = self._post_thumbnail_ready
+        self.manager.thumbnails.on_wakeup = lambda: self.power.count_wakeup("thumbnails")
+        self.manager.thumbnails.start()
+        self.watcher = WindowWatcher(accept=self.manager.window_filter,
+                                     accept_title=self.manager.window_filter.accept_title)
+        self.watcher.subscribe(self._on_window_event)
+        self.watcher.start()
+        
+        # Saha izi: TOPWINDOW_TRACE=dosya ile olaylar ve komutlar kaydedilir
+        self.recorder = None
+        trace_path = os.environ.get("TOPWINDOW_TRACE")
+        if trace_path:
+            try:
+                self.recorder = TraceRecorder(trace_path)
+                self.recorder.snapshot(self.watcher.windows, self.manager.topmost_hwnds)
+                self.watcher.subscribe(self.recorder.on_window_event)
+                self.manager.recorder = self.recorder
+            except Exception:
+                self.recorder = None
+        
+        # Global kısayol: ön plandaki pencereyi sabitle / bırak
+        self._hotkey_toggles = queue.Queue()  # hotkey thread -> Tk: (window, topmost)
+        self.hotkey = HotkeyService(self._on_hotkey)
+        self.hotkey.start()
 
     def _build_ui(self):
         # ═══ BAŞLIK ÇUBUĞU ═══
@@ -415,6 +752,15 @@ class TopWindowApp:
         self.hide_show_btn.bind("<Enter>", lambda e: self.hide_show_btn.configure(bg=COLORS['bg_hover']))
         self.hide_show_btn.bind("<Leave>", lambda e: self.hide_show_btn.configure(bg=COLORS['bg_dark']))
         
+        # Gruplama butonu: uygulama başına tek kart / pencere başına kart
+        self.group_btn = tk.Label(header, text="▦", bg=COLORS['bg_dark'],
+                                  fg=COLORS['accent'] if self._grouped else COLORS['text_muted'],
+                                  font=("Arial", 12), cursor="hand2", padx=4)
+        self.group_btn.pack(side=tk.RIGHT, padx=2)
+        self.group_btn.bind("<Button-1>", lambda e: self._set_grouped(not self._grouped))
+        self.group_btn.bind("<Enter>", lambda e: self.group_btn.configure(bg=COLORS['bg_hover']))
+        self.group_btn.bind("<Leave>", lambda e: self.group_btn.configure(bg=COLORS['bg_dark']))
+        
         # Yenile butonu (PNG)
         if self._icons['refresh']:
             refresh = tk.Label(header, image=self._icons['refresh'], bg=COLORS['bg_dark'], cursor="hand2")
@@ -428,6 +774,23 @@ class TopWindowApp:
             refresh.pack(side=tk.RIGHT)
             refresh.bind("<Button-1>", lambda e: self._refresh())
         
+        # ═══ ARAMA KUTUSU ═══
+        search_bar = tk.Frame(self.root, bg=COLORS['bg_dark'])
+        search_bar.pack(fill=tk.X, padx=8)
+        self.filter_var = tk.StringVar()
+        self.filter_entry = tk.Entry(search_bar, textvariable=self.filter_var,
+                                     bg=COLORS['bg_card'], fg=COLORS['text'],
+                                     insertbackground=COLORS['text'], relief=tk.FLAT,
+                                     font=("Segoe UI", 9), highlightthickness=1,
+                                     highlightbackground=COLORS['border'],
+                                     highlightcolor=COLORS['accent'])
+        self.filter_entry.pack(fill=tk.X, ipady=4)
+        # overrideredirect pencereler odağı kendiliğinden almaz
+        self.filter_entry.bind("<Button-1>", lambda e: self.filter_entry.focus_force())
+        self.filter_entry.bind("<Escape>", lambda e: self.filter_var.set(""))
+        self.filter_entry.bind("<Return>", lambda e: self._toggle_first_match())
+        self.filter_var.trace_add("write", lambda *args: self._apply_filter())
+        
         # ═══ İÇERİK ALANI ═══
         container = tk.Frame(self.root, bg=COLORS['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
@@ -435,8 +798,7 @@ class TopWindowApp:
         self.canvas = tk.Canvas(container, bg=COLORS['bg_dark'], highlightthickness=0)
         self.scroll_frame = tk.Frame(self.canvas, bg=COLORS['bg_dark'])
         
-        self.scroll_frame.bind("<Configure>", 
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.scroll_frame.bind("<Configure>", lambda e: self._schedule_scrollregion())
         
         self.canvas.create_window((0, 0), window=self.scroll_frame, anchor="nw")
         self.canvas.pack(fill=tk.BOTH, expand=True)
@@ -445,28 +807,94 @@ class TopWindowApp:
             lambda e: self.canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
 
     def _start_drag(self, e):
-        self._drag["x"], self._drag["y"] = e.x, e.y
+        # Panel konumunu bir kez sor; sürükleme boyunca yerel olarak takip et
+        self._drag.update(x=e.x_root, y=e.y_root, pos=None,
+                          win_x=self.root.winfo_x(), win_y=self.root.winfo_y())
         self._is_dragging = True
 
     def _do_drag(self, e):
-        x = self.root.winfo_x() + e.x - self._drag["x"]
-        y = self.root.winfo_y() + e.y - self._drag["y"]
-        self.root.geometry(f"+{x}+{y}")
+        """Record the pointer; the window itself moves at most once per frame"""
+        self._drag["pos"] = (self._drag["win_x"] + e.x_root - self._drag["x"],
+                             self._drag["win_y"] + e.y_root - self._drag["y"])
+        if self._drag["job"] is None:
+            self._drag["job"] = self.root.after(self._drag_frame_ms, self._apply_drag)
+
+    def _apply_drag(self):
+        self._drag["job"] = None
+        if self._drag["pos"]:
+            self.root.geometry("+%d+%d" % self._drag["pos"])
         
     def _stop_drag(self, e):
         """Handle drag stop with animated snapping to nearest edge"""
         self._is_dragging = False
+        if self._drag["job"] is not None:
+            self.root.after_cancel(self._drag["job"])
+            self._apply_drag()
+        # Son konum zaten biliniyor; snap için tekrar sormaya gerek yok
+        x, y = self._drag["pos"] or (self._drag["win_x"], self._drag["win_y"])
         # Use animated snapping when drag stops
-        self.root.after(10, self._snap_to_nearest_edge_animated)
+        self.root.after(10, lambda: self._snap_to_nearest_edge_animated(x, y))
+
+    @contextlib.contextmanager
+    def layout_transaction(self):
+        """Bulk card changes: one grid layout and one scrollregion update at the end.
+
+        While a transaction is open ``scroll_frame`` does not resize to its
+        cards (no geometry propagation, so no ``<Configure>`` per card) and
+        scrollregion updates are held back. Transactions nest; the
+        outermost one runs the layout.
+        """
+        self._layout_depth += 1
+        if self._layout_depth == 1:
+            self.scroll_frame.grid_propagate(False)
+        try:
+            yield
+        finally:
+            self._layout_depth -= 1
+            if self._layout_depth == 0:
+                self.scroll_frame.grid_propagate(True)
+                self.scroll_frame.update_idletasks()  # tek yerleşim geçişi
+                self._update_scrollregion()
+
+    def _schedule_scrollregion(self):
+        """<Configure> on scroll_frame: coalesce into one update per idle pass"""
+        if self._layout_depth or self._scroll_job is not None:
+            return
+        self._scroll_job = self.root.after_idle(self._update_scrollregion)
+
+    def _update_scrollregion(self):
+        if self._scroll_job is not None:
+            self.root.after_cancel(self._scroll_job)
+            self._scroll_job = None
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
     def _refresh(self):
+        if self.power.state == HIDDEN:
+            # Kart ve ikon işi gösterilene kadar bekler; dizin (profiller) güncel kalır
+            self._refresh_pending = True
+            self._rebuild_index()
+            return
+        self._refresh_pending = False
+        with self.layout_transaction():
+            self._rebuild_cards()
+
+    def _rebuild_index(self):
+        """Window list -> search index only (no cards, no icons); returns the windows"""
+        windows = self.manager.get_visible_windows()
+        self.window_index.rebuild(windows)
+        # En çok sabitlenen uygulamalar önce (geçmiş yoksa sıra değişmez)
+        self.window_index.reorder(self.manager.rank_key())
+        return windows
+
+    def _rebuild_cards(self):
+        self.tooltip.hide()  # sahibi olan kart birazdan yok edilecek
         for w in self.scroll_frame.winfo_children():
             w.destroy()
+        self._cards = {}
+        self._groups = {}
+        self._grid_order = []
         
-        windows = self.manager.get_visible_windows()
-        
-        # Highlight previously selected windows
-        previous_window_titles = set(self.manager.previous_windows)
+        windows = self._rebuild_index()
         
         if not windows:
             tk.Label(self.scroll_frame, text="Açık pencere yok", 
@@ -474,20 +902,272 @@ class TopWindowApp:
                     font=("Segoe UI", 9)).pack(pady=30)
             return
         
-        cols = 4
-        for i, win in enumerate(windows):
-            row, col = divmod(i, cols)
-            card = IconCard(self.scroll_frame, win, self.manager, self._refresh)
-            card.grid(row=row, column=col, padx=1, pady=1, sticky="nsew")
-            
-            # Highlight previously selected windows
-            if win.title in previous_window_titles:
-                card.configure(bg=COLORS['accent'])
+        if self._grouped:
+            self._build_group_cards()
+        else:
+            # Eksik ikonlar tek toplu geçişte (alfa + baskın renk)
+            if HAS_PILLOW:
+                self.manager.prefetch_icons((win._hWnd for win in windows), self._scale)
+            for win in windows:
+                # IconCard previously selected windows'u kendisi vurgular
+                self._make_card(win)
+        self._apply_filter()
+    
+    def _make_card(self, window, group=None):
+        card = IconCard(self.scroll_frame, window, self.manager, self._refresh, tooltip=self.tooltip,
+                        scale=self._scale)
+        card.group = group
+        self._cards[window._hWnd] = card
+        return card
+    
+    def _build_group_cards(self):
+        """One card per app; member cards are only built when a group is expanded"""
+        groups = group_by_app(self.window_index.ordered())
+        if HAS_PILLOW:
+            self.manager.prefetch_icons((members[0].hwnd for members in groups.values()), self._scale)
+        for key, members in groups.items():
+            if len(members) == 1:
+                self._make_card(members[0].window)
+                continue
+            card = GroupCard(self.scroll_frame, key, members, self.manager,
+                             self._on_group_expand, self._on_group_batch, tooltip=self.tooltip,
+                             scale=self._scale)
+            self._groups[key] = card
+            self._cards[("app", key)] = card
+    
+    def _set_grouped(self, grouped):
+        self._grouped = grouped
+        self.group_btn.configure(fg=COLORS['accent'] if grouped else COLORS['text_muted'])
+        self.manager.set_setting("grouped_view", grouped)
+        self._refresh()
+    
+    def _on_group_expand(self, group):
+        if group.expanded and HAS_PILLOW:
+            self.manager.prefetch_icons((e.hwnd for e in group.entries if e.hwnd not in self._cards),
+                                        self._scale)
+        self._apply_filter()
+    
+    def _on_group_batch(self, group):
+        """A group was pinned / unpinned as one batch: member cards and saved titles follow"""
+        for entry in group.entries:
+            card = self._cards.get(entry.hwnd)
+            if card is not None:
+                card._update_visual()
+        self.manager.save_topmost_titles()
+    
+    def _group_cells(self, entries):
+        """Grid keys for the grouped view: each group once, then its members if expanded"""
+        cells, members = [], {}
+        for entry in entries:
+            key = app_key(entry)
+            if key not in self._groups:
+                if entry.hwnd in self._cards:
+                    cells.append(entry.hwnd)
+                continue
+            if key not in members:
+                members[key] = []
+                cells.append(("app", key))
+            members[key].append(entry)
+        result = []
+        for cell in cells:
+            result.append(cell)
+            if isinstance(cell, tuple):
+                group = self._groups[cell[1]]
+                group.set_entries(members[cell[1]])
+                if group.expanded:
+                    for entry in members[cell[1]]:
+                        if entry.hwnd not in self._cards:
+                            self._make_card(entry.window, group)
+                        result.append(entry.hwnd)
+        return result
                 
+    def _apply_filter(self):
+        """Grid only the cards matching the search box, in index (usage-ranked) order"""
+        if not self._cards:
+            return
+        entries = self.window_index.search_entries(self.filter_var.get())
+        with self.layout_transaction():
+            if self._grouped:
+                matches = self._group_cells(entries)
+            else:
+                matches = [e.hwnd for e in entries if e.hwnd in self._cards]
+            old = self._grid_order
+            cols = self.config.grid_columns
+            # Sadece hücresi değişen kartlara dokun
+            for key in set(old) - set(matches):
+                self._cards[key].grid_remove()
+            for i, key in enumerate(matches):
+                if i >= len(old) or old[i] != key:
+                    row, col = divmod(i, cols)
+                    self._cards[key].grid(row=row, column=col, padx=1, pady=1, sticky="nsew")
+        self._grid_order = matches
+        self._update_thumbnail_targets()
+        
+    def _toggle_first_match(self):
+        """Enter in the search box toggles the first visible card"""
+        if self._grid_order:
+            self._cards[self._grid_order[0]]._on_click(None)
+
+    def _update_card_visuals(self):
+        """Re-read topmost state for every card in the grid"""
+        for w in self.scroll_frame.winfo_children():
+            if isinstance(w, IconCard):
+                w._update_visual()
+
+    def _watch_topmost(self):
+        """Periodic topmost sweep; the watchdog backs off while nothing changes"""
+        try:
+            reasserted = self.manager.watchdog.sweep()
+            if reasserted:
+                if self.recorder is not None:
+                    for hwnd in reasserted:
+                        self.recorder.style(hwnd, False)
+                self._update_card_visuals()
+        except Exception:
+            pass
+
+    def _watch_config(self):
+        """Poll the perf config file (one stat per tick); subscribers apply changes"""
+        try:
+            self.config.reload_if_changed()
+        except Exception:
+            pass
+
+    def _watch_leaks(self):
+        """Sample the leak probes every leak_check_s seconds (0: off, checked again later)"""
+        if self.config.leak_check_s:
+            try:
+                self.leak_sentinel.check()
+            except Exception:
+                pass
+
+    def _start_timers(self):
+        """Register the periodic jobs; PowerState slows or suspends them in low power"""
+        c, power, watchdog = self.config, self.power, self.manager.watchdog
+        # Gizliyken durur; boşta / pildeyken low_power_poll_s aralığıyla
+        slow = lambda state: None if state == HIDDEN else c.low_power_poll_s * 1000
+        power.every("edge_check", self._check_edge_position, lambda: c.edge_check_ms, slow)
+        # Sabitlenen pencereler gizliyken de korunur, bekçinin en yavaş hızında
+        power.every("topmost", self._watch_topmost, lambda: watchdog.interval,
+                    lambda state: watchdog.max_interval)
+        power.every("config", self._watch_config, lambda: c.watch_ms, slow)
+        power.every("leaks", self._watch_leaks, lambda: (c.leak_check_s or 60) * 1000)
+        power.every("power", power.poll, lambda: c.low_power_poll_s * 1000, slow)
+        # Diğer thread'ler Tk'ye dokunmaz; kuyruklarını Tk bu işle boşaltır
+        power.every("inbox", self._drain_inbox, lambda: c.inbox_ms,
+                    lambda state: c.inbox_low_power_ms)
+
+    def _drain_inbox(self):
+        """Tk side of the tray, hotkey and thumbnail threads: handle what they queued"""
+        if self._on_tray_command():
+            return
+        if not self._hotkey_toggles.empty():
+            self._on_hotkey_toggled()
+        if self._thumbnail_ready:
+            self._thumbnail_ready = False
+            self._on_thumbnail_ready()
+
+    def _on_power_change(self, old, new):
+        """Low power: no heartbeat, animations settled, no background thumbnails"""
+        if new != ACTIVE:
+            self.stall_detector.stop()
+            self.tooltip.hide()
+            for card in list(self._cards.values()):
+                try:
+                    card.card.finish_animations()
+                except Exception:
+                    pass
+        elif self.config.stall_threshold_ms:
+            self.stall_detector.start()
+        self._update_thumbnail_targets()
+        if new != HIDDEN and self._refresh_pending:
+            self._refresh()
+
+    def _apply_config(self, changed):
+        """Copy perf settings onto the panel; re-grid if the column count changed"""
+        c = self.config
+        self._drag_frame_ms = c.drag_frame_ms
+        self._snap_threshold = c.snap_threshold_px
+        self._snap_margin = c.snap_margin_px
+        self._snap_animation_steps = c.snap_steps
+        self._snap_animation_delay = c.snap_frame_ms
+        self.tooltip.delay = c.tooltip_delay_ms
+        if c.stall_threshold_ms:
+            self.stall_detector.threshold_ms = c.stall_threshold_ms
+        if "stall_threshold_ms" in changed:
+            if c.stall_threshold_ms and not self.power.low_power:
+                self.stall_detector.start()
+            else:
+                self.stall_detector.stop()
+        if c.leak_tracemalloc != tracemalloc.is_tracing():
+            if c.leak_tracemalloc:
+                tracemalloc.start()
+            else:
+                tracemalloc.stop()
+        self.power.enabled = c.low_power
+        self.power.idle_after_s = c.low_power_idle_s
+        self.power.use_battery = c.low_power_on_battery
+        if changed & {"low_power", "low_power_idle_s", "low_power_on_battery"}:
+            self.power.poll()
+        if "grid_columns" in changed and self._cards:
+            self._grid_order = []  # her kartın hücresi değişti
+            self._apply_filter()
+
+    def _on_topmost_released(self, hwnd):
+        """A window kept fighting back; stop tracking it as pinned"""
+        self.manager.forget_topmost(hwnd)
+        self._update_card_visuals()
+
+    def _on_hotkey(self):
+        """Runs on the hotkey thread: only the SetWindowPos, then Tk does the bookkeeping"""
+        toggled = self.manager.toggle_foreground()
+        if toggled:
+            self._hotkey_toggles.put(toggled)
+
+    def _on_hotkey_toggled(self):
+        """Tk side of a hotkey press: tracking sets, history, tray, card state, persist"""
+        while True:
+            try:
+                window, topmost = self._hotkey_toggles.get_nowait()
+            except queue.Empty:
+                break
+            self.manager.finish_toggle(window, topmost)
+        self._update_card_visuals()
+        self.manager.save_topmost_titles()
+
+    def _post_thumbnail_ready(self, hwnd):
+        """Worker thread: a capture finished; the next inbox drain updates the tooltip"""
+        self._thumbnail_ready = True
+
+    def _on_thumbnail_ready(self):
+        if self.tooltip.visible:
+            self.tooltip.update_image()
+
+    def _on_window_event(self, event):
+        """Watcher thread: closed windows lose their thumbnail, renamed ones get recaptured"""
+        if event.kind == DESTROYED:
+            self.manager.thumbnails.invalidate(event.hwnd)
+        elif event.kind == RENAMED:
+            self.manager.thumbnails.mark_stale(event.hwnd)
+
+    def _update_thumbnail_targets(self):
+        """Background refresh only for pinned windows whose cards are on screen"""
+        if self._panel_hidden or self.power.low_power:
+            self.manager.thumbnails.set_visible(())
+        else:
+            pinned = self.manager.topmost_hwnds
+            self.manager.thumbnails.set_visible(h for h in self._grid_order if h in pinned)
+
     def _close(self):
+        self.power.cancel_all()
+        self.stall_detector.stop()
+        self.watcher.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.manager.thumbnails.stop()
+        self.hotkey.stop()
         self.manager.cleanup()
-        if hasattr(self, 'tray_icon'):
-            self.tray_icon.stop()
+        self.tray.stop()
         self.root.quit()
         
     def _create_tray_icon(self):
@@ -500,42 +1180,75 @@ class TopWindowApp:
             # Create a simple icon if file is not found
             image = Image.new('RGB', (64, 64), color=(0, 230, 118))
         
-        # Define menu items
-        menu = (
-            item('Show', self._show_from_tray),
-            item('Exit', self._exit_from_tray)
-        )
-        
-        # Create and run the tray icon
-        self.tray_icon = pystray.Icon("TopWindow", image, "TopWindow", menu)
-        
-    def _show_from_tray(self, icon, item):
-        """Show the application window from tray"""
-        self.manager.show_app_window(self.root)
-        self.hide_show_btn.config(text="−")  # Change to hide icon
-        
-    def _exit_from_tray(self, icon, item):
-        """Exit the application from tray"""
-        icon.stop()
-        self._close()
-        
+        # Menü tepsi thread'inde kurulur; sabitlenen pencereler önbellekten gelir
+        self.tray = TrayService(self.root, image, self.manager.pinned_windows,
+                                get_profiles=self.manager.list_profiles)
+        self.manager.on_pinned_changed = self._on_pinned_changed
+
+    def _on_pinned_changed(self):
+        """Pinned set changed (any thread): tray menu and thumbnail targets follow"""
+        self.tray.refresh_menu()
+        self._update_thumbnail_targets()
+        
+    def _on_tray_command(self):
+        """Tk side of the tray: run the commands queued by menu clicks; True after Exit"""
+        for command, arg in self.tray.drain():
+            if command == SHOW:
+                self._show_panel()
+            elif command == HIDE:
+                self._hide_to_tray()
+            elif command == UNPIN:
+                self.manager.unset_topmost(gw.Win32Window(arg))
+                self._update_card_visuals()
+                self.manager.save_topmost_titles()
+            elif command == PROFILE:
+                self._apply_profile(arg)
+            elif command == SAVE_PROFILE:
+                self._save_profile()
+            elif command == EXIT:
+                self._close()
+                return True
+        return False
+        
+    def _apply_profile(self, name):
+        """Switch to a saved workspace profile (one resolve pass, one batch)"""
+        # Yeni açılan pencereler için yalnızca dizin yenilenir; kartlar aynı kalır
+        self._rebuild_index()
+        result = self.manager.apply_profile(name, self.window_index)
+        if result is not None:
+            self._update_card_visuals()
+
+    def _save_profile(self):
+        from tkinter import simpledialog
+        name = simpledialog.askstring("TopWindow", "Profile name:", parent=self.root)
+        if name and name.strip():
+            self._rebuild_index()  # gizliyken kartlar (ve dizin) eski olabilir
+            self.manager.save_profile(name.strip(), self.window_index)
+            self.tray.refresh_menu()
+
     def _hide_to_tray(self):
-        """Hide the application to system tray"""
+        """Hide the application to system tray (the tray loop is already running)"""
         self.manager.hide_app_window(self.root)
-        if not hasattr(self, 'tray_icon'):
-            self._create_tray_icon()
-        self.tray_icon.run_detached()
+        self.hide_show_btn.config(text="□")  # Change to show icon
+        self._panel_hidden = True
+        self.power.set_hidden(True)
+        self._update_thumbnail_targets()
+
+    def _show_panel(self):
+        self.manager.show_app_window(self.root)
+        self.hide_show_btn.config(text="−")  # Change to hide icon
+        self._panel_hidden = False
+        self.power.set_hidden(False)
+        self._update_thumbnail_targets()
 
     def _toggle_visibility(self):
         """Toggle the visibility of the application window"""
         if self.root.state() == 'normal' or self.root.state() == 'zoomed':
             # Window is visible, so hide it to tray
             self._hide_to_tray()
-            self.hide_show_btn.config(text="□")  # Change to show icon
         else:
             # Window is hidden, so show it
-            self.manager.show_app_window(self.root)
-            self.hide_show_btn.config(text="−")  # Change to hide icon
+            self._show_panel()
         
     # ... (existing imports)
     import win32api
@@ -555,11 +1268,39 @@ class TopWindowApp:
             # Fallback to primary screen
             return (0, 0, self.root.winfo_screenwidth(), self.root.winfo_screenheight())
 
+    def _panel_scale(self):
+        """Display scale of the panel's monitor; 1.0 unless dpi_aware is on."""
+        if not self._dpi_aware:
+            return 1.0
+        try:
+            return quantize_scale(window_scale(ctypes.windll.user32.GetParent(self.root.winfo_id())))
+        except Exception:
+            return 1.0
+
+    def _resize_panel(self):
+        self.width, self.height = int(round(290 * self._scale)), int(round(440 * self._scale))
+        self.root.geometry(f"{self.width}x{self.height}")
+
+    def _check_scale(self):
+        """Panel moved to a monitor with another DPI: redraw cards at the new size.
+
+        Only icons missing at the new size are rendered, in one batch; the
+        sizes already seen stay cached in the manager.
+        """
+        scale = self._panel_scale()
+        if scale == self._scale:
+            return
+        self._scale = scale
+        self._resize_panel()
+        if HAS_PILLOW:
+            self.manager.prefetch_icons((h for h in self._cards if not isinstance(h, tuple)), scale)
+        self._refresh()
+
     def _check_edge_position(self):
-        """Continuously check and snap to nearest edge"""
+        """Check and snap to nearest edge (periodic job, see _start_timers)"""
+        if self._dpi_aware and not self._is_dragging:
+            self._check_scale()
         self._snap_to_nearest_edge()
-        # Check more frequently for immediate snapping
-        self.root.after(100, self._check_edge_position)
         
     def _snap_to_nearest_edge(self):
         """Snap to nearest left or right edge immediately, but only if not dragging or animating"""
@@ -595,6 +1336,9 @@ class TopWindowApp:
             
     def _animate_snap_easeInOut(self, from_x, from_y, to_x, to_y):
         """Animate the snapping motion with ease-in-out interpolation for smoother movement"""
+        if not self.config.animations:
+            self.root.geometry(f"+{to_x}+{to_y}")
+            return
         self._is_animating = True
         
         def easeOutCubic(t):
@@ -603,8 +1347,7 @@ class TopWindowApp:
         dx = to_x - from_x
         dy = to_y - from_y
         
-        # Increase steps for smoothness
-        steps = 40 
+        steps = self._snap_animation_steps
         
         def step(count):
             if count < steps:
@@ -623,17 +1366,18 @@ class TopWindowApp:
                 y = max(m_top - self._snap_margin, min(y, m_bottom - self.height + self._snap_margin))
                 
                 self.root.geometry(f"+{x}+{y}")
-                self.root.after(10, lambda: step(count + 1))
+                self.root.after(self._snap_animation_delay, lambda: step(count + 1))
             else:
                 self.root.geometry(f"+{to_x}+{to_y}")
                 self._is_animating = False
                 
         step(0)
 
-    def _snap_to_nearest_edge_animated(self):
+    def _snap_to_nearest_edge_animated(self, x=None, y=None):
         """Animated snapping to left or right edge after drag stop"""
-        x = self.root.winfo_x()
-        y = self.root.winfo_y()
+        if x is None or y is None:
+            x = self.root.winfo_x()
+            y = self.root.winfo_y()
         width = self.width
         
         # Get current monitor work area
@@ -659,16 +1403,21 @@ class TopWindowApp:
     def run(self):
         self.root.mainloop()
 
+def write_error_log(e):
+    """Append the current exception to gui_error_log.txt (next to this file)"""
+    import traceback
+    import datetime
+    error_log = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui_error_log.txt")
+    with open(error_log, "a") as f:
+        f.write(f"\n\n--- Error at {datetime.datetime.now()} ---\n")
+        f.write(str(e))
+        f.write("\n")
+        traceback.print_exc(file=f)
+    return error_log
+
 if __name__ == "__main__":
     try:
         app = TopWindowApp()
         app.run()
     except Exception as e:
-        import traceback
-        import datetime
-        error_log = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui_error_log.txt")
-        with open(error_log, "a") as f:
-            f.write(f"\n\n--- Error at {datetime.datetime.now()} ---\n")
-            f.write(str(e))
-            f.write("\n")
-            traceback.print_exc(file=f)
+        write_error_log(e)
@@ -0,0 +1,147 @@
+import json
+import os
+
+CONFIG_FILE = "top_window_perf.json"
+
+# name: (type, default, min, max) — dosyada olmayan ayarlar varsayılanda kalır
+FIELDS = {
+    # Panel
+    "edge_check_ms":       (int, 100, 16, 10000),    # kenara yapışma kontrolü
+    "snap_threshold_px":   (int, 30, 0, 500),
+    "snap_margin_px":      (int, 10, 0, 200),
+    "snap_steps":          (int, 40, 1, 200),        # bırakınca kayma animasyonu
+    "snap_frame_ms":       (int, 10, 1, 200),
+    "drag_frame_ms":       (int, 16, 1, 200),
+    "grid_columns":        (int, 4, 1, 16),
+    "animations":          (bool, True, None, None), # False: hover/pulse/snap anında
+    "tooltip_delay_ms":    (int, 350, 0, 5000),
+    "dpi_aware":           (bool, False, None, None),  # keskin ikonlar için ekran başına DPI (yeniden başlatınca)
+    "stall_threshold_ms":  (int, 500, 0, 60000),     # donma kaydı; 0 kapatır
+    "leak_check_s":        (int, 600, 0, 86400),     # sızıntı nöbetçisi örnekleme aralığı; 0 kapatır
+    "leak_tracemalloc":    (bool, False, None, None),  # bellek izleme (yavaşlatır)
+    "low_power":           (bool, True, None, None),   # gizli / boşta / pilde zamanlayıcıları yavaşlat
+    "low_power_idle_s":    (int, 300, 0, 86400),     # bu kadar girişsiz kalınca boşta; 0 kapatır
+    "low_power_on_battery": (bool, True, None, None),
+    "low_power_poll_s":    (int, 5, 1, 600),         # pil/boşta kontrolü ve yavaş modda aralık
+    "inbox_ms":            (int, 50, 10, 5000),      # tepsi/kısayol/küçük resim kuyruklarını boşaltma
+    "inbox_low_power_ms":  (int, 500, 10, 60000),    # aynısı, gizli / boşta / pildeyken
+    # Pencere sorguları
+    "icon_timeout_ms":     (int, 100, 10, 5000),     # WM_GETICON SendMessageTimeout
+    "watchdog_min_ms":     (int, 250, 50, 60000),
+    "watchdog_max_ms":     (int, 4000, 50, 600000),
+    # Önbellekler
+    "icon_cache_max":      (int, 1024, 16, 100000),  # ikon sayısı
+    "icon_variant_cache_mb": (float, 4.0, 0.5, 256.0), # yüksek DPI ikonları
+    "thumbnail_cache_mb":  (float, 8.0, 0.5, 1024.0),
+    "thumbnail_refresh_s": (float, 3.0, 0.2, 600.0),
+    "thumbnail_cpu_share": (float, 0.05, 0.005, 1.0),
+    # Dosyanın kendisi
+    "watch_ms":            (int, 1000, 100, 60000),  # değişiklik kontrol aralığı
+}
+
+
+def config_path(data_file):
+    """Performance config that lives next to the JSON data file."""
+    return os.path.join(os.path.dirname(os.path.abspath(data_file)), CONFIG_FILE)
+
+
+def coerce(name, value):
+    """Validate one setting; returns the typed value or raises ValueError."""
+    kind, _, low, high = FIELDS[name]
+    if kind is bool:
+        if isinstance(value, bool) or value in (0, 1):
+            return bool(value)
+        raise ValueError("%s must be true or false" % name)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError("%s must be a number" % name)
+    if kind is int and value != int(value):
+        raise ValueError("%s must be a whole number" % name)
+    value = kind(value)
+    if not low <= value <= high:
+        raise ValueError("%s must be between %s and %s" % (name, low, high))
+    return value
+
+
+class PerfConfig:
+    """Tipli, canlı yeniden yüklenen performans ayarları.
+
+    Every setting in ``FIELDS`` is a plain attribute (``config.edge_check_ms``),
+    so hot paths pay nothing for reading it. ``reload_if_changed()`` only
+    stats the file; when its mtime or size changed the file is parsed,
+    every value is checked against its type and range, and subscribers are
+    called with the set of names whose value changed. A bad value keeps
+    the previous one and is listed in ``errors``. A file that does not
+    exist means all defaults.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.errors = []
+        self.reloads = 0
+        self._stamp = None
+        self._listeners = []
+        for name, (_, default, _, _) in FIELDS.items():
+            setattr(self, name, default)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def subscribe(self, callback):
+        """``callback(changed_names)`` after every reload that changed something."""
+        self._listeners.append(callback)
+
+    def update(self, values):
+        """Apply a {name: value} dict; returns the names that changed."""
+        errors, changed = [], set()
+        for name, value in values.items():
+            if name not in FIELDS:
+                errors.append("unknown setting %s" % name)
+                continue
+            try:
+                value = coerce(name, value)
+            except ValueError as e:
+                errors.append(str(e))
+                continue
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changed.add(name)
+        self.errors = errors
+        if changed:
+            for callback in list(self._listeners):
+                try:
+                    callback(changed)
+                except Exception:
+                    pass
+        return changed
+
+    def _read_stamp(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except (OSError, TypeError):
+            return None
+
+    def reload_if_changed(self):
+        """Cheap poll: stat the file and reload only if it changed."""
+        stamp = self._read_stamp()
+        if stamp == self._stamp:
+            return set()
+        self._stamp = stamp
+        return self.load()
+
+    def load(self):
+        """Read the file (defaults for anything missing); returns changed names."""
+        self.reloads += 1
+        values = {name: default for name, (_, default, _, _) in FIELDS.items()}
+        if self._stamp is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("top level must be an object")
+                values.update(data)
+            except Exception as e:
+                # Yarım yazılmış / bozuk dosya: eski değerler kalsın
+                self.errors = ["%s: %s" % (os.path.basename(self.path), e)]
+                return set()
+        return self.update(values)
@@ -0,0 +1,203 @@
+import collections
+import ctypes
+import sys
+import threading
+import time
+
+ACTIVE = "active"
+BATTERY = "battery"   # pil ile çalışıyor veya pil tasarrufu açık
+IDLE = "idle"         # kullanıcı bir süredir dokunmadı
+HIDDEN = "hidden"     # panel tepsiye gizlendi
+
+
+class _SystemPowerStatus(ctypes.Structure):
+    _fields_ = [("ACLineStatus", ctypes.c_ubyte), ("BatteryFlag", ctypes.c_ubyte),
+                ("BatteryLifePercent", ctypes.c_ubyte), ("SystemStatusFlag", ctypes.c_ubyte),
+                ("BatteryLifeTime", ctypes.c_ulong), ("BatteryFullLifeTime", ctypes.c_ulong)]
+
+
+class _LastInputInfo(ctypes.Structure):
+    _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+
+def on_battery():
+    """True on battery power or with battery saver on; None off Windows."""
+    if sys.platform != "win32":
+        return None
+    try:
+        status = _SystemPowerStatus()
+        if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+            return None
+        return status.ACLineStatus == 0 or status.SystemStatusFlag == 1
+    except Exception:
+        return None
+
+
+def idle_seconds():
+    """Seconds since the last keyboard or mouse input anywhere; None off Windows."""
+    if sys.platform != "win32":
+        return None
+    try:
+        info = _LastInputInfo()
+        info.cbSize = ctypes.sizeof(info)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        return ((ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+    except Exception:
+        return None
+
+
+class _Timer:
+    def __init__(self, name, func, interval, low):
+        self.name = name
+        self.func = func
+        self.interval = interval  # () -> ms
+        self.low = low            # (state) -> ms, None: askıda
+        self.job = None
+
+
+class PowerState:
+    """Panelin güç durumu ve periyodik zamanlayıcıları.
+
+    Every periodic job of the panel is registered with ``every()`` instead
+    of re-arming its own ``after()``. In the ``active`` state a job runs at
+    its normal ``interval``. In a low-power state (``hidden``, ``idle`` or
+    ``battery``) its ``low(state)`` function gives a longer interval, or
+    None to suspend it completely. Going back to ``active`` runs every
+    job once right away and restores the normal rates. Listeners added
+    with ``subscribe`` get ``(old, new)`` on every change.
+
+    ``hidden`` is set by the app. ``idle`` and ``battery`` come from
+    ``poll()``, which the app registers as a job of its own. Every job
+    run counts as a wakeup. ``count_wakeup`` records wakeups from loops
+    outside this class (the stall detector heartbeat, the thumbnail
+    worker) and ``wakeups_per_minute()`` gives the recent rate.
+    """
+
+    def __init__(self, root, battery=on_battery, idle=idle_seconds, clock=time.monotonic):
+        self.root = root
+        self.battery = battery
+        self.idle = idle
+        self.clock = clock
+        self.enabled = True
+        self.idle_after_s = 300   # 0: boşta algılama kapalı
+        self.use_battery = True
+        self.state = ACTIVE
+        self.hidden = False
+        self.changes = 0
+        self.fired = collections.Counter()  # iş adı -> uyanma sayısı
+        self._timers = {}
+        self._wakeups = collections.deque()  # son dakikanın uyanma zamanları
+        self._wakeup_lock = threading.Lock()  # küçük resim işçisi de sayar
+        self._listeners = []
+
+    @property
+    def low_power(self):
+        return self.state != ACTIVE
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    # ── Zamanlayıcılar ──────────────────────────────────────────
+    def every(self, name, func, interval, low=None):
+        """Run ``func`` every ``interval()`` ms; ``low(state)`` ms (None: suspended) in low power."""
+        self.cancel(name)
+        timer = self._timers[name] = _Timer(name, func, interval, low)
+        self._schedule(timer)
+        return timer
+
+    def cancel(self, name):
+        timer = self._timers.pop(name, None)
+        if timer is not None and timer.job is not None:
+            try:
+                self.root.after_cancel(timer.job)
+            except Exception:
+                pass
+
+    def cancel_all(self):
+        for name in list(self._timers):
+            self.cancel(name)
+
+    def _delay(self, timer):
+        if self.state == ACTIVE or timer.low is None:
+            return timer.interval()
+        return timer.low(self.state)
+
+    def _schedule(self, timer, delay=None):
+        if timer.job is not None:
+            try:
+                self.root.after_cancel(timer.job)
+            except Exception:
+                pass
+            timer.job = None
+        if delay is None:
+            delay = self._delay(timer)
+        if delay is not None:
+            timer.job = self.root.after(max(0, int(delay)), lambda: self._fire(timer))
+
+    def _fire(self, timer):
+        timer.job = None
+        self.count_wakeup(timer.name)
+        try:
+            timer.func()
+        except Exception:
+            pass
+        if self._timers.get(timer.name) is timer and timer.job is None:
+            self._schedule(timer)
+
+    def suspended(self):
+        """Names of the jobs that are not scheduled at all right now."""
+        return sorted(name for name, timer in self._timers.items() if timer.job is None)
+
+    # ── Uyanma sayacı ───────────────────────────────────────────
+    def count_wakeup(self, name="other"):
+        """Record one wakeup; safe to call from other threads."""
+        now = self.clock()
+        with self._wakeup_lock:
+            self.fired[name] += 1
+            self._wakeups.append(now)
+            while self._wakeups and self._wakeups[0] < now - 60.0:
+                self._wakeups.popleft()
+
+    def wakeups_per_minute(self, window_s=60.0):
+        """Wakeups over the last ``window_s`` seconds (at most 60), as a per-minute rate."""
+        now = self.clock()
+        with self._wakeup_lock:
+            recent = sum(1 for t in self._wakeups if t >= now - window_s)
+        return recent * 60.0 / window_s
+
+    # ── Durum ───────────────────────────────────────────────────
+    def set_hidden(self, hidden):
+        self.hidden = hidden
+        self.poll()
+
+    def poll(self):
+        """Re-evaluate the state (battery, idle time, hidden); returns it."""
+        if not self.enabled:
+            state = ACTIVE
+        elif self.hidden:
+            state = HIDDEN
+        else:
+            state = ACTIVE
+            idle = self.idle() if self.idle_after_s else None
+            if idle is not None and idle >= self.idle_after_s:
+                state = IDLE
+            elif self.use_battery and self.battery():
+                state = BATTERY
+        self._set_state(state)
+        return state
+
+    def _set_state(self, state):
+        old = self.state
+        if state == old:
+            return
+        self.state = state
+        self.changes += 1
+        for timer in list(self._timers.values()):
+            # Uyanınca her iş hemen bir kez çalışır (gösterince gecikme olmaz)
+            self._schedule(timer, 0 if state == ACTIVE else None)
+        for callback in list(self._listeners):
+            try:
+                callback(old, state)
+            except Exception:
+                pass
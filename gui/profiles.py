@@ -0,0 +1,148 @@
+import json
+import os
+import time
+
+import win32con
+import win32gui
+try:
+    from .window_batch import apply_window_positions, TOPMOST_FLAGS
+except ImportError:
+    from window_batch import apply_window_positions, TOPMOST_FLAGS
+
+# Konum / boyut uygulanırken pencere etkinleştirilmez
+PLACE_FLAGS = win32con.SWP_NOACTIVATE
+
+
+def read_data_file(path):
+    """Whole data file as a dict ({} if missing or unreadable)."""
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+    except Exception:
+        pass
+    return {}
+
+
+def update_data_file(path, **changes):
+    """Merge ``changes`` into the data file, keeping every other key.
+
+    Written to a temp file and renamed, so a crash never leaves a half
+    written file (and a profile save never wipes ``previous_windows``).
+    """
+    data = read_data_file(path)
+    data.update(changes)
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+    return data
+
+
+def load_profiles(path):
+    return read_data_file(path).get("profiles", {})
+
+
+def save_profile(path, name, windows):
+    """Store ``windows`` (list of dicts from ``capture_entry``) as profile ``name``."""
+    profiles = load_profiles(path)
+    profiles[name] = {"saved": time.strftime("%Y-%m-%d %H:%M:%S"), "windows": list(windows)}
+    update_data_file(path, profiles=profiles)
+    return profiles[name]
+
+
+def delete_profile(path, name):
+    profiles = load_profiles(path)
+    if profiles.pop(name, None) is None:
+        return False
+    update_data_file(path, profiles=profiles)
+    return True
+
+
+def capture_entry(entry):
+    """Profile record for one indexed window: identity plus its normal rect."""
+    record = {"exe": entry.exe, "class": entry.class_name, "title": entry.title, "rect": None}
+    try:
+        if not win32gui.IsIconic(entry.hwnd):
+            left, top, right, bottom = win32gui.GetWindowRect(entry.hwnd)
+            record["rect"] = [left, top, right - left, bottom - top]
+    except Exception:
+        pass
+    return record
+
+
+def resolve_profile(profile, index):
+    """Match profile records to live windows in one pass over the index.
+
+    Returns a list of ``(record, IndexedWindow)`` for the records that found
+    a window, and the list of records that did not. A record prefers a
+    window with the same exe, class and title. If there is none it takes
+    the first unclaimed window of the same exe and class, and then any
+    window of the same exe. Each window is used at most once.
+    """
+    records = profile.get("windows", [])
+    by_app = {}  # (exe, class) -> [entries]; exe -> [entries]
+    for entry in index.ordered():
+        exe = entry.exe.lower()
+        by_app.setdefault((exe, entry.class_name), []).append(entry)
+        by_app.setdefault(exe, []).append(entry)
+
+    claimed = set()
+    matched, missing = [], []
+
+    def take(candidates, title=None):
+        for entry in candidates:
+            if entry.hwnd not in claimed and (title is None or entry.title == title):
+                claimed.add(entry.hwnd)
+                return entry
+        return None
+
+    # Önce tam başlık eşleşmeleri, sonra gevşek eşleşmeler: aynı uygulamanın
+    # iki penceresi kayıt sırasına göre yanlış eşleşmesin
+    pending = []
+    for record in records:
+        exe = (record.get("exe") or "").lower()
+        same_class = by_app.get((exe, record.get("class", "")), [])
+        entry = take(same_class, record.get("title"))
+        if entry:
+            matched.append((record, entry))
+        else:
+            pending.append((record, exe, same_class))
+    for record, exe, same_class in pending:
+        entry = take(same_class) or take(by_app.get(exe, []))
+        if entry:
+            matched.append((record, entry))
+        else:
+            missing.append(record)
+    return matched, missing
+
+
+def plan_activation(matched, pinned_hwnds):
+    """DeferWindowPos entries that pin+place ``matched`` and unpin everything else."""
+    entries = []
+    wanted = set()
+    for record, entry in matched:
+        wanted.add(entry.hwnd)
+        rect = record.get("rect")
+        if rect:
+            x, y, w, h = rect
+            entries.append((entry.hwnd, win32con.HWND_TOPMOST, x, y, w, h, PLACE_FLAGS))
+        else:
+            entries.append((entry.hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0, TOPMOST_FLAGS))
+    for hwnd in pinned_hwnds:
+        if hwnd not in wanted:
+            entries.append((hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0, TOPMOST_FLAGS))
+    return entries
+
+
+def activate_profile(profile, index, pinned_hwnds=()):
+    """Resolve ``profile`` against ``index`` and apply it as one batch.
+
+    Returns ``(matched, missing, results)`` where ``results`` is the
+    {hwnd: success} map from ``apply_window_positions``.
+    """
+    matched, missing = resolve_profile(profile, index)
+    results = apply_window_positions(plan_activation(matched, pinned_hwnds))
+    return matched, missing, results
@@ -0,0 +1,143 @@
+import collections
+import datetime
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+
+STALL_LOG_FILE = "gui_stall_log.txt"
+
+
+def stall_log_path(folder):
+    """Stall log that lives next to gui_error_log.txt."""
+    return os.path.join(folder, STALL_LOG_FILE)
+
+
+class StallDetector:
+    """Tk olay döngüsü donma dedektörü (kalp atışı + bekçi thread'i).
+
+    A heartbeat ``after()`` callback stamps the time every ``heartbeat_ms``.
+    A daemon thread checks the stamp. When the loop has not run for longer
+    than ``threshold_ms`` it samples the main thread's stack with
+    ``sys._current_frames()`` every ``sample_ms`` until the heartbeat comes
+    back. Then it writes the stall duration and the distinct stacks, most
+    seen first, to a rotating log file.
+
+    While the loop is healthy the cost is one float store per heartbeat on
+    the Tk thread and one comparison per wake-up on the watcher thread.
+    Nothing is sampled or written.
+    """
+
+    def __init__(self, root, log_path, threshold_ms=500, sample_ms=20, max_samples=250,
+                 max_bytes=512 * 1024, backups=3, on_beat=None):
+        self.root = root
+        self.log_path = log_path
+        self.threshold_ms = threshold_ms
+        self.sample_ms = sample_ms
+        self.max_samples = max_samples
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.on_beat = on_beat  # her kalp atışında (ör. uyanma sayacı)
+        self.stalls = 0
+        self.last_stall = None  # (süre sn, örnek sayısı, en sık yığın)
+        self._beat_time = time.monotonic()
+        self._job = None
+        self._main_id = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._logger = None
+
+    @property
+    def heartbeat_ms(self):
+        # Eşiğin yarısı: donma en geç eşik + yarım eşikte fark edilir
+        return max(20, min(250, self.threshold_ms // 2))
+
+    # ── Tk tarafı ───────────────────────────────────────────────
+    def _beat(self):
+        self._beat_time = time.monotonic()
+        if self.on_beat is not None:
+            self.on_beat()
+        self._job = self.root.after(self.heartbeat_ms, self._beat)
+
+    def start(self):
+        """Call on the Tk thread."""
+        if self._thread is not None and self._thread.is_alive() and not self._stop.is_set():
+            return
+        self._main_id = threading.get_ident()
+        self._stop = threading.Event()  # eski thread kendi olayını görüp çıkar
+        self._beat()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="StallDetector", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                handler.close()
+                self._logger.removeHandler(handler)
+            self._logger = None
+
+    # ── Bekçi thread'i ──────────────────────────────────────────
+    def blocked_for(self):
+        """Seconds since the loop last ran, beyond the heartbeat interval."""
+        return time.monotonic() - self._beat_time - self.heartbeat_ms / 1000.0
+
+    def sample(self):
+        """The main thread's current stack as a tuple of (file, line, function)."""
+        frame = sys._current_frames().get(self._main_id)
+        if frame is None:
+            return ()
+        return tuple((f.filename, f.lineno, f.name) for f in traceback.extract_stack(frame))
+
+    def _run(self, stop):
+        while not stop.wait(self.heartbeat_ms / 1000.0):
+            if self.blocked_for() * 1000 >= self.threshold_ms:
+                self._watch_stall(stop)
+
+    def _watch_stall(self, stop):
+        """Sample until the heartbeat resumes, then log what was seen."""
+        beat = self._beat_time
+        started = time.time() - self.blocked_for()
+        stacks = collections.Counter()
+        samples = 0
+        while self._beat_time == beat and not stop.is_set():
+            if samples < self.max_samples:
+                stack = self.sample()
+                if stack:
+                    stacks[stack] += 1
+                    samples += 1
+            time.sleep(self.sample_ms / 1000.0)
+        if stop.is_set():
+            return
+        duration = self._beat_time - beat - self.heartbeat_ms / 1000.0
+        self.stalls += 1
+        top = stacks.most_common(1)[0][0] if stacks else ()
+        self.last_stall = (duration, samples, top)
+        self._write(started, duration, samples, stacks)
+
+    def _write(self, started, duration, samples, stacks):
+        try:
+            if self._logger is None:
+                self._logger = logging.getLogger("topwindow.stalls")
+                self._logger.propagate = False
+                self._logger.setLevel(logging.INFO)
+                self._logger.addHandler(logging.handlers.RotatingFileHandler(
+                    self.log_path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8"))
+            lines = ["\n--- Stall %.0f ms at %s (%d samples) ---" % (
+                duration * 1000, datetime.datetime.fromtimestamp(started), samples)]
+            for stack, count in stacks.most_common():
+                lines.append("%d/%d samples:" % (count, samples))
+                lines.extend(line.rstrip("\n") for line in traceback.format_list(
+                    [traceback.FrameSummary(f, n, name) for f, n, name in stack]))
+            self._logger.info("\n".join(lines))
+        except Exception:
+            pass
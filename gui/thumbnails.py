@@ -0,0 +1,267 @@
+import collections
+import ctypes
+import queue
+import threading
+import time
+
+import win32gui
+import win32ui
+from PIL import Image
+
+PW_RENDERFULLCONTENT = 0x00000002  # DirectComposition içeriğini de çizer (Win 8.1+)
+THUMB_SIZE = (220, 140)
+_WAKE = object()  # set_visible() -> işçi: görünür küme artık boş değil
+
+
+def capture_window(hwnd, max_size=THUMB_SIZE):
+    """PrintWindow ile pencerenin küçültülmüş görüntüsünü alır (PIL Image veya None)."""
+    if win32gui.IsIconic(hwnd):
+        return None
+    left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+    width, height = right - left, bottom - top
+    if width <= 0 or height <= 0:
+        return None
+
+    img = None
+    hwnd_dc = win32gui.GetWindowDC(hwnd)
+    try:
+        src_dc = win32ui.CreateDCFromHandle(hwnd_dc)
+        mem_dc = src_dc.CreateCompatibleDC()
+        bmp = win32ui.CreateBitmap()
+        bmp.CreateCompatibleBitmap(src_dc, width, height)
+        mem_dc.SelectObject(bmp)
+        try:
+            if ctypes.windll.user32.PrintWindow(hwnd, mem_dc.GetSafeHdc(), PW_RENDERFULLCONTENT):
+                img = Image.frombuffer('RGB', (width, height), bmp.GetBitmapBits(True), 'raw', 'BGRX', 0, 1)
+        finally:
+            mem_dc.DeleteDC()
+            src_dc.DeleteDC()
+            win32gui.DeleteObject(bmp.GetHandle())
+    finally:
+        win32gui.ReleaseDC(hwnd, hwnd_dc)
+
+    if img is not None:
+        # reduce() önce tam sayı katsayıyla hızlıca küçültür, thumbnail() kalanını yapar
+        factor = max(1, min(width // max_size[0], height // max_size[1]))
+        if factor > 1:
+            img = img.reduce(factor)
+        img.thumbnail(max_size, Image.Resampling.BILINEAR)
+    return img
+
+
+class ThumbnailCache:
+    """Pencere küçük resimleri: arka planda yakalanır, bütçeli önbellekte tutulur.
+
+    Captures run on one worker thread. Finished images are kept per hwnd in
+    an LRU table bounded by ``max_bytes``. ``request(hwnd)`` returns the
+    cached image, or ``None``, and queues a capture if the entry is missing
+    or older than ``refresh_interval``.
+
+    Hwnds handed to ``set_visible()`` are refreshed in the background at
+    that same throttled rate. Other entries are only captured on request.
+    While nothing is visible the worker blocks on its queue without a
+    timeout, so a hidden panel costs no wakeups. ``on_wakeup`` is called
+    on each timed wake-up, e.g. to count them.
+
+    After each capture the worker waits long enough that capture time stays
+    under ``cpu_share`` of one core. Wall time is used because PrintWindow
+    also renders in the target process and DWM, which our thread's CPU time
+    does not see. ``stats()`` reports both the measured share and the
+    thread CPU time. ``on_ready(hwnd)`` runs on the worker thread, so GUI
+    code must hand it over to its own loop.
+    """
+
+    def __init__(self, capture=capture_window, max_bytes=8 * 1024 * 1024,
+                 refresh_interval=3.0, cpu_share=0.05, on_ready=None):
+        self.capture = capture
+        self.max_bytes = max_bytes
+        self.refresh_interval = refresh_interval
+        self.cpu_share = cpu_share
+        self.on_ready = on_ready
+        self.on_wakeup = None
+        self.entries = collections.OrderedDict()  # hwnd -> (image, captured_at, nbytes)
+        self.total_bytes = 0
+        self.visible = set()
+        self.counters = collections.Counter()
+        self.capture_cpu_s = 0.0
+        self.capture_wall_s = 0.0
+        self._started_at = None
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._pending = set()
+        self._thread = None
+        self._stop = threading.Event()
+
+    # ── Önbellek ────────────────────────────────────────────────
+    def __contains__(self, hwnd):
+        return hwnd in self.entries
+
+    def get(self, hwnd):
+        """Cached image or None; never captures."""
+        with self._lock:
+            entry = self.entries.get(hwnd)
+            if entry is None:
+                return None
+            self.entries.move_to_end(hwnd)
+            return entry[0]
+
+    def request(self, hwnd):
+        """Cached image (possibly stale) and queue a refresh if needed."""
+        with self._lock:
+            entry = self.entries.get(hwnd)
+            if entry is not None:
+                self.entries.move_to_end(hwnd)
+            fresh = entry is not None and time.monotonic() - entry[1] < self.refresh_interval
+            self.counters["hits" if entry is not None else "misses"] += 1
+        if not fresh:
+            self._queue(hwnd)
+        return entry[0] if entry is not None else None
+
+    def invalidate(self, hwnd):
+        """Drop a window's thumbnail (closed, renamed, moved...)."""
+        with self._lock:
+            entry = self.entries.pop(hwnd, None)
+            if entry is not None:
+                self.total_bytes -= entry[2]
+                self.counters["invalidated"] += 1
+
+    def mark_stale(self, hwnd):
+        """Keep showing the old image but recapture it on the next chance."""
+        with self._lock:
+            entry = self.entries.get(hwnd)
+            if entry is not None:
+                self.entries[hwnd] = (entry[0], 0.0, entry[2])
+
+    def discard(self, hwnd):
+        """set-style removal so the reaper can treat the cache as a table."""
+        self.invalidate(hwnd)
+
+    def __iter__(self):
+        return iter(list(self.entries))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def set_visible(self, hwnds):
+        """Windows whose cards are on screen; only these are refreshed in the background."""
+        was_empty = not self.visible
+        self.visible = set(hwnds)
+        if was_empty and self.visible:
+            self._jobs.put(_WAKE)  # işçi zaman aşımsız bekliyor olabilir
+
+    def resize(self, max_bytes):
+        """Change the memory budget; evicts least recently used entries if needed."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def _store(self, hwnd, img):
+        nbytes = img.width * img.height * len(img.getbands())
+        with self._lock:
+            old = self.entries.pop(hwnd, None)
+            if old is not None:
+                self.total_bytes -= old[2]
+            self.entries[hwnd] = (img, time.monotonic(), nbytes)
+            self.total_bytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, _, size) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.counters["evicted"] += 1
+
+    # ── İşçi ────────────────────────────────────────────────────
+    def _queue(self, hwnd):
+        with self._lock:
+            if hwnd in self._pending:
+                return
+            self._pending.add(hwnd)
+        self._jobs.put(hwnd)
+
+    def _stalest_visible(self):
+        now = time.monotonic()
+        stalest, oldest = None, None
+        with self._lock:
+            for hwnd in self.visible:
+                if hwnd in self._pending:
+                    continue
+                entry = self.entries.get(hwnd)
+                captured = entry[1] if entry is not None else 0.0
+                if now - captured >= self.refresh_interval and (oldest is None or captured < oldest):
+                    stalest, oldest = hwnd, captured
+        return stalest
+
+    def capture_now(self, hwnd):
+        """Capture one window on the calling thread; returns the seconds it took."""
+        cpu_start, wall_start = time.thread_time(), time.perf_counter()
+        try:
+            img = self.capture(hwnd)
+        except Exception:
+            img = None
+        cost = time.perf_counter() - wall_start
+        self.capture_cpu_s += time.thread_time() - cpu_start
+        self.capture_wall_s += cost
+        self.counters["captures"] += 1
+        if img is None:
+            self.counters["failed"] += 1
+            self.invalidate(hwnd)
+        else:
+            self._store(hwnd, img)
+            if self.on_ready:
+                try:
+                    self.on_ready(hwnd)
+                except Exception:
+                    pass
+        return cost
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Görünür pencere yoksa (panel gizli, düşük güç) istek gelene kadar hiç uyanma
+            timeout = self.refresh_interval / 2 if self.visible else None
+            try:
+                hwnd = self._jobs.get(timeout=timeout)
+            except queue.Empty:
+                if self.on_wakeup is not None:
+                    self.on_wakeup()
+                hwnd = self._stalest_visible()
+                if hwnd is None:
+                    continue
+            if hwnd is None:  # stop() sinyali
+                break
+            if hwnd is _WAKE:
+                continue
+            cost = self.capture_now(hwnd)
+            with self._lock:
+                self._pending.discard(hwnd)
+            # CPU payı: yakalama süresinin (1/pay - 1) katı kadar bekle
+            if self.cpu_share and cost > 0:
+                self._stop.wait(cost * (1.0 / self.cpu_share - 1.0))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="ThumbnailCache", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._jobs.put(None)
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "capture_cpu_s": self.capture_cpu_s,
+            "capture_wall_s": self.capture_wall_s,
+            "cpu_share": self.capture_wall_s / elapsed if elapsed else 0.0,
+            **self.counters,
+        }
@@ -5,7 +5,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('*.png', '.'), ('*.ico', '.')],
-    hiddenimports=['window_manager'],
+    hiddenimports=['window_manager', 'window_info', 'topmost_watchdog', 'window_reaper', 'window_index', 'window_events', 'window_batch', 'hotkey', 'tray', 'thumbnails', 'profiles', 'icon_processing', 'usage_history', 'perf_config', 'async_api', 'window_trace', 'stall_detector', 'leak_sentinel', 'window_filter', 'icon_variants', 'power_state'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
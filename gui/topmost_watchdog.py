@@ -0,0 +1,129 @@
+import collections
+import threading
+import time
+import win32gui
+import win32con
+try:
+    from .window_info import get_app_name
+except ImportError:
+    from window_info import get_app_name
+
+
+class TopmostWatchdog:
+    """Pinned pencerelerin HWND_TOPMOST durumunu koruyan bekçi.
+
+    Some apps drop WS_EX_TOPMOST when they go fullscreen and other tools
+    steal it. Each sweep reads the extended style of the pinned windows only
+    (one GetWindowLong per pinned hwnd) and re-applies topmost where it was
+    lost. The sweep interval doubles up to ``max_interval`` while nothing
+    changes and drops back to ``min_interval`` as soon as something does.
+
+    A window that fights back more than ``max_fights_per_minute`` times is
+    released (``on_release`` is called) instead of being reasserted forever.
+
+    If a ``reaper`` is given it sweeps first, so a dead or reused hwnd is
+    never re-pinned.
+
+    ``sweep()`` holds ``lock``. Code on other threads that pins or unpins
+    must take the same lock and stop tracking a window *before* sending
+    HWND_NOTOPMOST; otherwise a sweep in between sees the window as lost
+    and pins it again.
+    """
+
+    def __init__(self, get_hwnds, min_interval=250, max_interval=4000,
+                 max_fights_per_minute=20, on_release=None, reaper=None):
+        self.get_hwnds = get_hwnds
+        self.min_interval = min_interval  # ms
+        self.max_interval = max_interval  # ms
+        self.interval = min_interval
+        self.max_fights_per_minute = max_fights_per_minute
+        self.on_release = on_release
+        self.reaper = reaper
+        self.fight_counts = collections.Counter()  # app name -> reassert count
+        self.sweeps = 0
+        self._recent_fights = collections.defaultdict(collections.deque)  # hwnd -> timestamps
+        if reaper is not None:
+            reaper.register(self._recent_fights)
+        self.lock = threading.RLock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def lost_topmost(self):
+        """Return pinned hwnds that no longer carry WS_EX_TOPMOST."""
+        lost = []
+        for hwnd in list(self.get_hwnds()):
+            try:
+                ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+            except:
+                continue  # Pencere kapanmış
+            if not ex_style & win32con.WS_EX_TOPMOST:
+                lost.append(hwnd)
+        return lost
+
+    def sweep(self):
+        """Check all pinned windows once; returns the hwnds that were reasserted."""
+        with self.lock:
+            return self._sweep()
+
+    def _sweep(self):
+        self.sweeps += 1
+        reaped = self.reaper.sweep() if self.reaper is not None else []
+        reasserted = []
+        now = time.monotonic()
+        for hwnd in self.lost_topmost():
+            recent = self._recent_fights[hwnd]
+            while recent and now - recent[0] > 60:
+                recent.popleft()
+            if len(recent) >= self.max_fights_per_minute:
+                self._release(hwnd)
+                continue
+            try:
+                win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
+                                      win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE)
+            except:
+                continue
+            recent.append(now)
+            self.fight_counts[get_app_name(hwnd) or hex(hwnd)] += 1
+            reasserted.append(hwnd)
+
+        if reasserted or reaped:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        return reasserted
+
+    def _release(self, hwnd):
+        self._recent_fights.pop(hwnd, None)
+        if self.on_release:
+            self.on_release(hwnd)
+
+    def forget(self, hwnd):
+        """Drop per-window bookkeeping (e.g. after the user unpinned it)."""
+        self._recent_fights.pop(hwnd, None)
+
+    def poke(self):
+        """Reset to the fastest interval, e.g. right after pinning a window."""
+        self.interval = self.min_interval
+
+    # ── Thread mode (CLI) ────────────────────────────────────────
+    def start_thread(self):
+        """Run sweeps on a daemon thread; for callers without an event loop."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TopmostWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Stop the thread and wait for a running sweep to finish."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.wait(self.interval / 1000.0):
+            try:
+                self.sweep()
+            except Exception:
+                pass
@@ -0,0 +1,106 @@
+import queue
+import threading
+
+import pystray
+from pystray import MenuItem as item
+
+# Tepsi menüsünden Tk döngüsüne giden komutlar
+SHOW = "show"
+HIDE = "hide"
+EXIT = "exit"
+UNPIN = "unpin"
+PROFILE = "profile"
+SAVE_PROFILE = "save_profile"
+
+
+class TrayService:
+    """Tek, kalıcı tepsi thread'i; Tk ile yalnızca kuyruk üzerinden konuşur.
+
+    The pystray loop is started once and lives until ``stop()``; hiding the
+    panel no longer starts a new loop. Menu callbacks run on the tray thread,
+    so they never touch Tk: they only put ``(command, arg)`` on ``commands``.
+    The Tk thread empties it with ``drain()`` from a timer of its own
+    (``TopWindowApp._drain_inbox``). The pinned-window submenu is
+    built from ``get_pinned()`` (cached (hwnd, title) pairs, no native
+    queries) every time the menu is refreshed; ``get_profiles()`` fills the
+    Profiles submenu.
+    """
+
+    def __init__(self, root, image, get_pinned, title="TopWindow", get_profiles=None):
+        self.root = root
+        self.get_pinned = get_pinned
+        self.get_profiles = get_profiles or (lambda: [])
+        self.commands = queue.Queue()
+        self.icon = pystray.Icon("TopWindow", image, title, pystray.Menu(self._menu_items))
+        self._thread = None
+
+    # ── Menü ────────────────────────────────────────────────────
+    def _menu_items(self):
+        pinned = list(self.get_pinned())
+        items = [
+            item('Show', lambda icon, i: self.post(SHOW), default=True),
+            item('Hide', lambda icon, i: self.post(HIDE)),
+        ]
+        if pinned:
+            items.append(pystray.Menu.SEPARATOR)
+            items.append(item('On top (%d)' % len(pinned), pystray.Menu(*[
+                item(self._label(title), self._unpin_action(hwnd)) for hwnd, title in pinned
+            ])))
+        profile_items = [item(name, self._profile_action(name)) for name in self.get_profiles()]
+        if profile_items:
+            profile_items.append(pystray.Menu.SEPARATOR)
+        profile_items.append(item('Save current as…', lambda icon, i: self.post(SAVE_PROFILE)))
+        items.append(item('Profiles', pystray.Menu(*profile_items)))
+        items.append(pystray.Menu.SEPARATOR)
+        items.append(item('Exit', lambda icon, i: self.post(EXIT)))
+        return items
+
+    @staticmethod
+    def _label(title, width=48):
+        return title if len(title) <= width else title[:width - 1] + "…"
+
+    def _unpin_action(self, hwnd):
+        return lambda icon, i: self.post(UNPIN, hwnd)
+
+    def _profile_action(self, name):
+        return lambda icon, i: self.post(PROFILE, name)
+
+    def refresh_menu(self):
+        """Rebuild the menu after the pinned set changed (safe from any thread)."""
+        try:
+            self.icon.update_menu()
+        except Exception:
+            pass
+
+    # ── Mesajlaşma ──────────────────────────────────────────────
+    def post(self, command, arg=None):
+        """Tray thread side: queue a command; Tk picks it up on its next drain."""
+        self.commands.put((command, arg))
+
+    def drain(self):
+        """Tk side: return all queued commands."""
+        pending = []
+        while True:
+            try:
+                pending.append(self.commands.get_nowait())
+            except queue.Empty:
+                return pending
+
+    # ── Yaşam döngüsü ───────────────────────────────────────────
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="TrayService", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self.icon.run()
+        except Exception:
+            pass
+
+    def stop(self):
+        try:
+            self.icon.stop()
+        except Exception:
+            pass
@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+import time
+
+HISTORY_FILE = "top_window_history.db"
+HALF_LIFE = 14 * 24 * 3600  # bir sabitlemenin ağırlığı iki haftada yarıya iner
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts     REAL NOT NULL,
+    exe    TEXT NOT NULL,
+    class  TEXT NOT NULL,
+    title  TEXT NOT NULL,
+    pinned INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_app ON events (exe, class, ts);
+CREATE TABLE IF NOT EXISTS usage (
+    exe      TEXT NOT NULL,
+    class    TEXT NOT NULL,
+    pins     INTEGER NOT NULL DEFAULT 0,
+    unpins   INTEGER NOT NULL DEFAULT 0,
+    last_pin REAL,
+    score    REAL NOT NULL DEFAULT 0,
+    score_ts REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (exe, class)
+) WITHOUT ROWID;
+"""
+
+# Yeni skor = eski skorun bugüne sönümlenmiş hali + 1 (tek UPSERT)
+UPSERT_PIN = """
+INSERT INTO usage (exe, class, pins, last_pin, score, score_ts) VALUES (?, ?, 1, ?, 1.0, ?)
+ON CONFLICT (exe, class) DO UPDATE SET
+    pins = pins + 1,
+    last_pin = excluded.last_pin,
+    score = score * power(0.5, (excluded.score_ts - score_ts) / ?) + 1.0,
+    score_ts = excluded.score_ts
+"""
+UPSERT_UNPIN = """
+INSERT INTO usage (exe, class, unpins) VALUES (?, ?, 1)
+ON CONFLICT (exe, class) DO UPDATE SET unpins = unpins + 1
+"""
+
+
+def history_path(data_file):
+    """History database that lives next to the JSON data file."""
+    return os.path.join(os.path.dirname(os.path.abspath(data_file)), HISTORY_FILE)
+
+
+def identity(exe, class_name):
+    """App identity used for ranking: (exe name, window class)."""
+    return ((exe or "").lower(), class_name or "")
+
+
+class UsageHistory:
+    """Sabitleme geçmişi (SQLite): ucuz ekleme, uygulama başına sıralama.
+
+    Every pin and unpin is appended to ``events``. The ``usage`` row of the
+    app identity (exe, window class) is updated in the same transaction,
+    so ranking never scans the event log. The score is a decayed pin count
+    (frequency and recency in one number): each pin adds 1 and the score
+    halves every ``half_life`` seconds.
+
+    Scores are loaded once and then kept in memory, so ``rank_key()`` is a
+    plain dict lookup per window. The database is opened on first use. If it
+    cannot be opened (read-only folder, no sqlite) the history just stays
+    empty.
+    """
+
+    def __init__(self, path, half_life=HALF_LIFE):
+        self.path = path
+        self.half_life = half_life
+        self.enabled = True
+        self._conn = None
+        self._scores = None  # identity -> (score, score_ts)
+        self._lock = threading.Lock()
+
+    # ── Bağlantı ────────────────────────────────────────────────
+    def _connect(self):
+        if self._conn is None and self.enabled:
+            try:
+                folder = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(folder, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.create_function("power", 2, pow, deterministic=True)
+                conn.executescript(SCHEMA)
+                self._conn = conn
+            except Exception:
+                self.enabled = False
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _load(self):
+        if self._scores is None:
+            self._scores = {}
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    for exe, class_name, score, score_ts in conn.execute(
+                            "SELECT exe, class, score, score_ts FROM usage WHERE pins > 0"):
+                        self._scores[(exe, class_name)] = (score, score_ts)
+                except Exception:
+                    pass
+        return self._scores
+
+    # ── Yazma ───────────────────────────────────────────────────
+    def record(self, exe, class_name, title, pinned=True, now=None):
+        """Append one pin/unpin event."""
+        self.record_many([(exe, class_name, title)], pinned, now)
+
+    def record_many(self, windows, pinned=True, now=None):
+        """Append events for ``(exe, class, title)`` tuples in one transaction."""
+        now = time.time() if now is None else now
+        rows = [(identity(exe, class_name), title or "") for exe, class_name, title in windows]
+        if not rows:
+            return
+        with self._lock:
+            scores = self._load()
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("BEGIN")
+                conn.executemany("INSERT INTO events (ts, exe, class, title, pinned) VALUES (?, ?, ?, ?, ?)",
+                                 [(now, exe, class_name, title, int(pinned)) for (exe, class_name), title in rows])
+                if pinned:
+                    conn.executemany(UPSERT_PIN, [(exe, class_name, now, now, self.half_life)
+                                                  for (exe, class_name), _ in rows])
+                else:
+                    conn.executemany(UPSERT_UNPIN, [key for key, _ in rows])
+                conn.execute("COMMIT")
+            except Exception:
+                try:
+                    conn.execute("ROLLBACK")
+                except Exception:
+                    pass
+                return
+            if pinned:
+                for key, _ in rows:
+                    score, score_ts = scores.get(key, (0.0, now))
+                    scores[key] = (self._decay(score, now - score_ts) + 1.0, now)
+
+    # ── Okuma ───────────────────────────────────────────────────
+    def _decay(self, score, age):
+        return score * 0.5 ** (age / self.half_life)
+
+    def scores(self, now=None):
+        """{identity: score decayed to ``now``}"""
+        now = time.time() if now is None else now
+        with self._lock:
+            items = list(self._load().items())
+        return {key: self._decay(score, now - score_ts) for key, (score, score_ts) in items}
+
+    def has_data(self):
+        with self._lock:
+            return bool(self._load())
+
+    def rank_key(self, now=None):
+        """Sort key for IndexedWindow-like entries: most used apps first.
+
+        Ties, including every app that was never pinned, keep their
+        enumeration order because Python's sort is stable.
+        """
+        scores = self.scores(now)
+        if not scores:
+            return lambda entry: 0.0
+        get = scores.get
+        return lambda entry: -get((entry.exe.lower(), entry.class_name), 0.0)
+
+    def top(self, limit=10, now=None):
+        """[(identity, score)] best first"""
+        ranked = sorted(self.scores(now).items(), key=lambda item: -item[1])
+        return ranked[:limit]
@@ -0,0 +1,70 @@
+import ctypes
+import win32gui
+import win32con
+
+TOPMOST_FLAGS = win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE
+
+
+def _user32():
+    """user32 with DeferWindowPos prototypes, or None when unavailable."""
+    try:
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+    except Exception:
+        return None
+    if not getattr(user32, "_defer_prototypes", False):
+        user32.BeginDeferWindowPos.argtypes = [ctypes.c_int]
+        user32.BeginDeferWindowPos.restype = wintypes.HANDLE
+        user32.DeferWindowPos.argtypes = [wintypes.HANDLE, wintypes.HWND, wintypes.HWND,
+                                          ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                          wintypes.UINT]
+        user32.DeferWindowPos.restype = wintypes.HANDLE
+        user32.EndDeferWindowPos.argtypes = [wintypes.HANDLE]
+        user32.EndDeferWindowPos.restype = wintypes.BOOL
+        user32._defer_prototypes = True
+    return user32
+
+
+def _defer(entries):
+    """Apply all entries with one BeginDeferWindowPos/EndDeferWindowPos batch."""
+    user32 = _user32()
+    if user32 is None:
+        return False
+    hdwp = user32.BeginDeferWindowPos(len(entries))
+    if not hdwp:
+        return False
+    for hwnd, insert_after, x, y, cx, cy, flags in entries:
+        # Başarısız olursa sistem yapıyı zaten serbest bırakır
+        hdwp = user32.DeferWindowPos(hdwp, hwnd, insert_after, x, y, cx, cy, flags)
+        if not hdwp:
+            return False
+    return bool(user32.EndDeferWindowPos(hdwp))
+
+
+def apply_window_positions(entries):
+    """Apply ``(hwnd, insert_after, x, y, cx, cy, flags)`` entries as one batch.
+
+    Windows repositions everything in a single pass (one repaint, no
+    intermediate z-order flicker). If the batch is rejected - e.g. one
+    window closed in the meantime - every entry is applied on its own
+    instead. Returns {hwnd: success}.
+    """
+    entries = list(entries)
+    if not entries:
+        return {}
+    if _defer(entries):
+        return {entry[0]: True for entry in entries}
+    results = {}
+    for hwnd, insert_after, x, y, cx, cy, flags in entries:
+        try:
+            win32gui.SetWindowPos(hwnd, insert_after, x, y, cx, cy, flags)
+            results[hwnd] = True
+        except:
+            results[hwnd] = False
+    return results
+
+
+def set_topmost_many(hwnds, topmost=True):
+    """Pin (or unpin) many windows at once; returns {hwnd: success}."""
+    insert_after = win32con.HWND_TOPMOST if topmost else win32con.HWND_NOTOPMOST
+    return apply_window_positions((hwnd, insert_after, 0, 0, 0, 0, TOPMOST_FLAGS) for hwnd in hwnds)
@@ -0,0 +1,219 @@
+import collections
+import ctypes
+import threading
+import time
+import win32gui
+
+# SetWinEventHook sabitleri
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WM_QUIT = 0x0012
+
+# Olay türleri
+CREATED = "created"
+DESTROYED = "destroyed"
+RENAMED = "renamed"
+
+WindowEvent = collections.namedtuple("WindowEvent", "kind hwnd title time")
+
+
+def is_listable(hwnd, title):
+    """Same rule the window lists use: visible, titled and not our own panel."""
+    return bool(title.strip()) and not title.startswith("TopWindow") and win32gui.IsWindowVisible(hwnd)
+
+
+class WindowWatcher:
+    """Üst düzey pencere değişikliklerini (oluşma / kapanma / başlık) bildirir.
+
+    Keeps ``windows`` (hwnd -> title) for the listable top-level windows and
+    calls every subscriber with a ``WindowEvent`` when that set changes.
+    On Windows the changes come from a WinEvent hook (create, destroy,
+    show, hide, name change) running on its own message-loop thread, so
+    nothing is enumerated after the initial snapshot. If the hook cannot be
+    installed the watcher falls back to diffing one EnumWindows pass every
+    ``poll_interval`` seconds. ``accept(hwnd, title)`` decides which
+    windows are listable (``is_listable`` by default, or a ``WindowFilter``).
+    For a name change of a window already in ``windows`` only
+    ``accept_title(hwnd, title)`` runs, when given (``WindowFilter.accept_title``).
+
+    Subscribers are called on the watcher thread; GUI code must hand the
+    event over to its own loop.
+    """
+
+    def __init__(self, poll_interval=1.0, use_hooks=True, accept=None, accept_title=None):
+        self.poll_interval = poll_interval
+        self.use_hooks = use_hooks
+        self.accept = accept or is_listable
+        self.accept_title = accept_title
+        self.windows = {}  # hwnd -> title (listable windows only)
+        self.mode = None   # "hook" | "poll"
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._hook_proc = None
+
+    # ── Abonelik ────────────────────────────────────────────────
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _emit(self, kind, hwnd, title):
+        event = WindowEvent(kind, hwnd, title, time.time())
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+    # ── Durum ───────────────────────────────────────────────────
+    def snapshot(self):
+        """Enumerate once and return {hwnd: title} for listable windows (in z-order)."""
+        found = {}
+
+        def collect(hwnd, _):
+            title = win32gui.GetWindowText(hwnd)
+            if self.accept(hwnd, title):
+                found[hwnd] = title
+            return True
+
+        win32gui.EnumWindows(collect, None)
+        return found
+
+    def update(self, hwnd, renamed=False):
+        """Re-check one window and emit whatever changed about it.
+
+        ``renamed``: the only change is the title (NAMECHANGE), so a listed
+        window is re-checked with ``accept_title`` instead of ``accept``.
+        """
+        accept = self.accept
+        if renamed and self.accept_title is not None and hwnd in self.windows:
+            accept = self.accept_title
+        try:
+            alive = win32gui.IsWindow(hwnd)
+            title = win32gui.GetWindowText(hwnd) if alive else ""
+            listable = alive and accept(hwnd, title)
+        except Exception:
+            listable, title = False, ""
+        with self._lock:
+            old = self.windows.get(hwnd)
+            if listable and old is None:
+                self.windows[hwnd] = title
+                kind = CREATED
+            elif listable and old != title:
+                self.windows[hwnd] = title
+                kind = RENAMED
+            elif not listable and old is not None:
+                del self.windows[hwnd]
+                kind = DESTROYED
+            else:
+                return None
+        self._emit(kind, hwnd, title)
+        return kind
+
+    def poll(self):
+        """Diff one enumeration against the known set; returns the event count."""
+        current = self.snapshot()
+        events = []
+        with self._lock:
+            for hwnd, title in current.items():
+                old = self.windows.get(hwnd)
+                if old is None:
+                    events.append((CREATED, hwnd, title))
+                elif old != title:
+                    events.append((RENAMED, hwnd, title))
+            for hwnd, title in self.windows.items():
+                if hwnd not in current:
+                    events.append((DESTROYED, hwnd, title))
+            self.windows = current
+        for kind, hwnd, title in events:
+            self._emit(kind, hwnd, title)
+        return len(events)
+
+    # ── Çalıştırma ──────────────────────────────────────────────
+    def start(self):
+        """Take the initial snapshot and start following changes."""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            self.windows = self.snapshot()
+        self._stop.clear()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="WindowWatcher", daemon=True)
+        self._thread.start()
+        ready.wait(2.0)
+
+    def stop(self):
+        self._stop.set()
+        if self.mode == "hook" and self._thread_id:
+            try:
+                ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            except Exception:
+                pass
+
+    def _run(self, ready):
+        if self.use_hooks and self._run_hooks(ready):
+            return
+        self.mode = "poll"
+        ready.set()
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception:
+                pass
+
+    def _run_hooks(self, ready):
+        """WinEvent hook + message loop on this thread. False if hooks are unavailable."""
+        try:
+            from ctypes import wintypes
+            user32 = ctypes.windll.user32
+            proc_type = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                           wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        except Exception:
+            return False
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread, ms):
+            if id_object != OBJID_WINDOW or id_child != CHILDID_SELF or not hwnd:
+                return
+            if event == EVENT_OBJECT_DESTROY:
+                if hwnd in self.windows:
+                    self.update(hwnd)
+            elif win32gui.GetParent(hwnd) == 0:
+                self.update(hwnd, renamed=event == EVENT_OBJECT_NAMECHANGE)
+
+        self._hook_proc = proc_type(on_event)
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        hooks = [
+            user32.SetWinEventHook(EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE, 0, self._hook_proc, 0, 0, flags),
+            user32.SetWinEventHook(EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE, 0, self._hook_proc, 0, 0, flags),
+        ]
+        if not all(hooks):
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+            return False
+
+        self.mode = "hook"
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        ready.set()
+        msg = wintypes.MSG()
+        try:
+            while not self._stop.is_set() and user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
+        return True
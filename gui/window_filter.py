@@ -0,0 +1,158 @@
+import collections
+import ctypes
+import fnmatch
+import sys
+import threading
+import win32con
+import win32gui
+try:
+    from .window_info import describe_window
+except ImportError:
+    from window_info import describe_window
+
+DWMWA_CLOAKED = 14
+
+# Veri dosyasındaki "window_filter" ayarının varsayılanları
+DEFAULTS = {
+    "cloaked": True,       # DWM tarafından gizlenmiş (ör. başka masaüstündeki UWP) pencereler
+    "tool_windows": True,  # WS_EX_TOOLWINDOW (WS_EX_APPWINDOW yoksa)
+    "owned": True,         # sahibi olan açılır pencereler (WS_EX_APPWINDOW yoksa)
+    "min_width": 0,
+    "min_height": 0,
+    "exe_allow": [],       # boş değilse sadece bu exe'ler (glob)
+    "exe_deny": [],
+}
+
+
+def is_cloaked(hwnd):
+    """True if DWM cloaks the window (hidden UWP frames, other virtual desktops)."""
+    if sys.platform != "win32":
+        return False
+    try:
+        value = ctypes.c_int(0)
+        ctypes.windll.dwmapi.DwmGetWindowAttribute(ctypes.c_void_p(hwnd), DWMWA_CLOAKED,
+                                                   ctypes.byref(value), ctypes.sizeof(value))
+        return value.value != 0
+    except Exception:
+        return False
+
+
+def _ex_style(hwnd, info):
+    if "ex_style" not in info:
+        try:
+            info["ex_style"] = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+        except Exception:
+            info["ex_style"] = 0
+    return info["ex_style"]
+
+
+class WindowFilter:
+    """Listelenecek pencereleri seçen kural zinciri.
+
+    The rules come from a settings dict (``DEFAULTS`` shows the keys). They
+    are compiled into one ordered list of stages, cheapest first: title
+    checks cost nothing, then come the single native calls, and the exe
+    lookup (OpenProcess) runs last. A window stops at the first stage that
+    rejects it, so the exe is only looked up for windows that passed
+    everything else. ``rejected`` counts windows per stage.
+
+    ``filter(hwnd, title)`` is the predicate. ``windows(iterable)``
+    filters pygetwindow objects. ``accept_title(hwnd, title)`` runs only
+    the title stage; the watcher uses it for renames of windows it already
+    lists, so a rename storm never reaches the exe lookup.
+
+    One instance is shared by the Tk and watcher threads: the per-pass pid
+    cache travels in the stage ``info`` dict and the counters take a lock.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULTS)
+        if isinstance(settings, dict):
+            self.settings.update((k, v) for k, v in settings.items() if k in DEFAULTS)
+        self.rejected = collections.Counter()
+        self.accepted = 0
+        self.stages = self._compile(self.settings)
+        self._count_lock = threading.Lock()
+
+    def _compile(self, s):
+        stages = [
+            ("title", lambda hwnd, title, info: bool(title.strip()) and not title.startswith("TopWindow")),
+            ("hidden", lambda hwnd, title, info: win32gui.IsWindowVisible(hwnd)),
+        ]
+        if s["tool_windows"]:
+            stages.append(("tool_window", self._not_tool_window))
+        if s["owned"]:
+            stages.append(("owned", self._not_owned))
+        if s["cloaked"]:
+            stages.append(("cloaked", lambda hwnd, title, info: not is_cloaked(hwnd)))
+        if s["min_width"] or s["min_height"]:
+            stages.append(("too_small", self._big_enough))
+        if s["exe_allow"] or s["exe_deny"]:
+            self._allow = [p.lower() for p in s["exe_allow"]]
+            self._deny = [p.lower() for p in s["exe_deny"]]
+            stages.append(("exe", self._exe_allowed))
+        return tuple(stages)
+
+    # ── Aşamalar ────────────────────────────────────────────────
+    @staticmethod
+    def _not_tool_window(hwnd, title, info):
+        ex_style = _ex_style(hwnd, info)
+        return not ex_style & win32con.WS_EX_TOOLWINDOW or bool(ex_style & win32con.WS_EX_APPWINDOW)
+
+    @staticmethod
+    def _not_owned(hwnd, title, info):
+        try:
+            owner = win32gui.GetWindow(hwnd, win32con.GW_OWNER)
+        except Exception:
+            owner = 0
+        return not owner or bool(_ex_style(hwnd, info) & win32con.WS_EX_APPWINDOW)
+
+    def _big_enough(self, hwnd, title, info):
+        try:
+            if win32gui.IsIconic(hwnd):
+                return True  # simge durumundaki pencerenin boyutu anlamsız
+            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+        except Exception:
+            return True
+        return right - left >= self.settings["min_width"] and bottom - top >= self.settings["min_height"]
+
+    def _exe_allowed(self, hwnd, title, info):
+        exe, _ = describe_window(hwnd, info.get("pid_cache"))
+        exe = exe.lower()
+        if any(fnmatch.fnmatchcase(exe, p) for p in self._deny):
+            return False
+        return not self._allow or any(fnmatch.fnmatchcase(exe, p) for p in self._allow)
+
+    # ── Kullanım ────────────────────────────────────────────────
+    def filter(self, hwnd, title, pid_cache=None):
+        return self._run_stages(self.stages, hwnd, title, {"pid_cache": pid_cache})
+
+    __call__ = filter
+
+    def accept_title(self, hwnd, title):
+        """Title stage only (rename of a window that already passed the rest)."""
+        return self._run_stages(self.stages[:1], hwnd, title, {})
+
+    def _run_stages(self, stages, hwnd, title, info):
+        for name, stage in stages:
+            try:
+                ok = stage(hwnd, title, info)
+            except Exception:
+                ok = False  # pencere kapanmış
+            if not ok:
+                with self._count_lock:
+                    self.rejected[name] += 1
+                return False
+        with self._count_lock:
+            self.accepted += 1
+        return True
+
+    def windows(self, windows):
+        """Filter pygetwindow objects (one exe lookup per process)."""
+        pid_cache = {}
+        return [w for w in windows if self.filter(w._hWnd, w.title, pid_cache)]
+
+    def stats(self):
+        """{"accepted": n, "rejected": {stage: n}} since creation."""
+        with self._count_lock:
+            return {"accepted": self.accepted, "rejected": dict(self.rejected)}
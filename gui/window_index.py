@@ -0,0 +1,284 @@
+import fnmatch
+import re
+try:
+    from .window_info import describe_window
+except ImportError:
+    from window_info import describe_window
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def ngrams(text):
+    """All 1-, 2- and 3-grams; short queries are then answered by one lookup."""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    grams.update(text[i:i + 3] for i in range(len(text) - 2))
+    return grams
+
+
+class IndexedWindow:
+    """Arama indeksindeki tek pencere kaydı."""
+    __slots__ = ("hwnd", "window", "title", "exe", "class_name", "text", "lower_fields", "seq")
+
+    def __init__(self, window, title, exe, class_name, seq):
+        self.hwnd = window._hWnd
+        self.window = window
+        self.title = title
+        self.exe = exe
+        self.class_name = class_name
+        # Alanları NUL ile çevrele: trigramlar alan sınırını aşmaz, basit
+        # glob'lar ("abc*", "*abc") tek bir alt dize aramasına dönüşür
+        self.lower_fields = (title.lower(), exe.lower(), class_name.lower())
+        self.text = "\0%s\0" % "\0".join(self.lower_fields)
+        self.seq = seq
+
+    def fields(self):
+        return (self.title, self.exe, self.class_name)
+
+
+class Query:
+    """Parsed search query.
+
+    * ``/regex/``  - case-insensitive regex searched in title, exe and class
+    * ``chrome*``  - glob (``*``, ``?``, ``[]``) matched against a whole field
+    * ``foo bar``  - every word must appear somewhere (substring, any field)
+
+    ``required`` holds n-grams every match must contain, used to narrow the
+    candidates through the index before the real check runs. A single word
+    of up to three characters is answered by the index alone (``exact``).
+    """
+
+    def __init__(self, text):
+        self.text = text.strip()
+        self.kind = "words"
+        self.required = set()
+        self.exact = False
+        self._regex = None
+        self._simple_glob = None
+        self._words = ()
+        q = self.text
+        if len(q) >= 2 and q.startswith("/") and q.endswith("/"):
+            self.kind = "regex"
+            self._regex = re.compile(q[1:-1], re.IGNORECASE)
+        elif any(c in q for c in "*?["):
+            self.kind = "glob"
+            self._regex = re.compile(fnmatch.translate(q.lower()))
+            self._simple_glob = self._simple_glob_test(q.lower())
+            self._words = tuple(w for w in re.split(r"[*?]|\[[^\]]*\]", q.lower()) if w)
+            for literal in self._words:
+                self.required |= trigrams(literal) or {literal}
+        else:
+            self._words = tuple(q.lower().split())
+            for word in self._words:
+                self.required |= trigrams(word) or {word}
+            self.exact = len(self._words) == 1 and len(self._words[0]) <= 3
+
+    @staticmethod
+    def _simple_glob_test(pattern):
+        """Substring needle for ``abc*``, ``*abc`` and ``*abc*``; None otherwise."""
+        body = pattern.strip("*")
+        if not body or any(c in body for c in "*?["):
+            return None
+        if pattern == body + "*":
+            return "\0" + body
+        if pattern == "*" + body:
+            return body + "\0"
+        if pattern == "*" + body + "*":
+            return body
+        return None
+
+    def matcher(self):
+        """Return a fast ``entry -> bool`` function for this query."""
+        if self.kind == "words":
+            if len(self._words) == 1:
+                word = self._words[0]
+                return lambda e: word in e.text
+            words = self._words
+            return lambda e: all(w in e.text for w in words)
+        if self.kind == "glob":
+            needle = self._simple_glob
+            if needle is not None:
+                return lambda e: needle in e.text
+            match = self._regex.match
+            return lambda e: any(match(f) for f in e.lower_fields)
+        search = self._regex.search
+        return lambda e: any(search(f) for f in e.fields())
+
+    def matches(self, entry):
+        return self.matcher()(entry)
+
+    def matches_value(self, value):
+        """Match one field value on its own (e.g. only the exe name)."""
+        if self.kind == "regex":
+            return bool(self._regex.search(value))
+        value = value.lower()
+        if self.kind == "glob":
+            return bool(self._regex.match(value))
+        return all(word in value for word in self._words)
+
+    def narrows(self, previous):
+        """True if every match of this query is also a match of ``previous``.
+
+        Holds when each word of the old query is part of some word (or glob
+        literal) of the new one, e.g. ``chr`` -> ``chrome`` -> ``chrome*``.
+        """
+        if previous is None or self.kind == "regex" or previous.kind != "words":
+            return False
+        return all(any(old in new for new in self._words) for old in previous._words)
+
+
+def app_key(entry):
+    """Grouping key for the grouped view: the exe name, or the hwnd if it is unknown."""
+    return entry.exe.lower() if entry.exe else entry.hwnd
+
+
+def group_by_app(entries):
+    """{app_key: [entries]} in order of each app's first entry."""
+    groups = {}
+    for entry in entries:
+        groups.setdefault(app_key(entry), []).append(entry)
+    return groups
+
+
+class WindowIndex:
+    """Başlık, exe ve sınıf adı üzerinde trigram indeksli pencere araması.
+
+    Entries are keyed by hwnd and can be added/removed one at a time, so the
+    index can follow window create/destroy/rename changes without a rebuild.
+    ``search`` remembers the previous query: when the user keeps typing
+    (the new query narrows the old one) only the previous results are
+    re-checked instead of the whole index.
+    """
+
+    def __init__(self):
+        self.entries = {}   # hwnd -> IndexedWindow
+        self.postings = {}  # 1/2/3-gram -> set(hwnd)
+        self._ordered = None  # entries in enumeration order (lazy)
+        self._seq = 0
+        self._last_query = None
+        self._last_results = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, hwnd):
+        return hwnd in self.entries
+
+    def rebuild(self, windows, describe=None):
+        """Index ``windows`` from scratch (in their enumeration order)."""
+        self._invalidate()  # boş liste add()'e hiç ulaşmaz
+        self.entries.clear()
+        self.postings.clear()
+        self._seq = 0
+        describe = describe or describe_window
+        pid_cache = {}
+        for window in windows:
+            exe, class_name = describe(window._hWnd, pid_cache)
+            self.add(window, exe, class_name)
+        self.ordered()
+
+    def add(self, window, exe="", class_name="", title=None):
+        hwnd = window._hWnd
+        if hwnd in self.entries:
+            self.remove(hwnd)
+        entry = IndexedWindow(window, window.title if title is None else title, exe, class_name, self._seq)
+        self._seq += 1
+        self.entries[hwnd] = entry
+        for gram in ngrams(entry.text):
+            self.postings.setdefault(gram, set()).add(hwnd)
+        self._invalidate()
+        return entry
+
+    def remove(self, hwnd):
+        entry = self.entries.pop(hwnd, None)
+        if entry is None:
+            return
+        for gram in ngrams(entry.text):
+            bucket = self.postings.get(gram)
+            if bucket is not None:
+                bucket.discard(hwnd)
+                if not bucket:
+                    del self.postings[gram]
+        self._invalidate()
+
+    def rename(self, hwnd, title):
+        entry = self.entries.get(hwnd)
+        if entry is not None and entry.title != title:
+            seq = entry.seq
+            self.add(entry.window, entry.exe, entry.class_name, title=title).seq = seq
+
+    def get(self, hwnd):
+        return self.entries.get(hwnd)
+
+    def _invalidate(self):
+        self._ordered = None
+        self._last_query = None
+        self._last_results = None
+
+    def ordered(self):
+        """All entries in enumeration order."""
+        if self._ordered is None:
+            self._ordered = sorted(self.entries.values(), key=lambda e: e.seq)
+        return self._ordered
+
+    def reorder(self, key):
+        """Re-sequence entries by ``key`` (stable); search results follow the new order."""
+        ordered = sorted(self.ordered(), key=key)
+        for seq, entry in enumerate(ordered):
+            entry.seq = seq
+        self._seq = len(ordered)
+        self._invalidate()
+        self._ordered = ordered
+        return ordered
+
+    def _in_order(self, hwnds):
+        # Büyük kümelerde sıralı listeyi süzmek, sort'tan ucuzdur
+        if len(hwnds) * 4 > len(self.entries):
+            return [e for e in self.ordered() if e.hwnd in hwnds]
+        entries = self.entries
+        return sorted((entries[h] for h in hwnds), key=lambda e: e.seq)
+
+    def _candidates(self, query):
+        """Hwnd set narrowed through the postings, or None for 'everything'."""
+        if not query.required:
+            return None
+        buckets = []
+        for gram in query.required:
+            bucket = self.postings.get(gram)
+            if not bucket:
+                return set()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        hwnds = set(buckets[0])
+        for bucket in buckets[1:]:
+            hwnds &= bucket
+            if not hwnds:
+                break
+        return hwnds
+
+    def search_entries(self, text):
+        """Return matching ``IndexedWindow`` entries in enumeration order."""
+        if not text.strip():
+            return list(self.ordered())
+        try:
+            query = Query(text)
+        except re.error:
+            return []
+        if query.exact:
+            results = self._in_order(self._candidates(query))
+        else:
+            if query.narrows(self._last_query):
+                pool = self._last_results
+            else:
+                hwnds = self._candidates(query)
+                pool = self.ordered() if hwnds is None else self._in_order(hwnds)
+            match = query.matcher()
+            results = [e for e in pool if match(e)]
+        self._last_query, self._last_results = query, results
+        return results
+
+    def search(self, text):
+        """Return the matching window objects in enumeration order."""
+        return [e.window for e in self.search_entries(text)]
@@ -0,0 +1,95 @@
+import ctypes
+import ntpath
+import sys
+import win32gui
+import win32process
+import win32api
+
+# PROCESS_QUERY_INFORMATION (0x0400) | PROCESS_VM_READ (0x0010)
+PROCESS_QUERY_VM_READ = 0x0410
+# DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2
+PER_MONITOR_AWARE_V2 = -4
+
+
+def get_window_exe_path(hwnd):
+    """Pencerenin ait olduğu exe dosyasının yolunu bulur."""
+    try:
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        h_process = win32api.OpenProcess(PROCESS_QUERY_VM_READ, False, pid)
+        try:
+            path = win32process.GetModuleFileNameEx(h_process, 0)
+        finally:
+            win32api.CloseHandle(h_process)
+        return path
+    except:
+        return None
+
+
+def get_app_name(hwnd):
+    """Short application name (exe file name) for a window, or '' if unknown."""
+    path = get_window_exe_path(hwnd)
+    return ntpath.basename(path) if path else ""
+
+
+def get_window_class_name(hwnd):
+    """Window class name, or '' if the window is gone."""
+    try:
+        return win32gui.GetClassName(hwnd)
+    except:
+        return ""
+
+
+def describe_window(hwnd, pid_cache=None):
+    """(exe file name, class name) for a window.
+
+    ``pid_cache`` maps pid -> exe name so that enumerating many windows of
+    the same process opens the process only once.
+    """
+    exe = ""
+    try:
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        if pid_cache is not None and pid in pid_cache:
+            exe = pid_cache[pid]
+        else:
+            path = get_window_exe_path(hwnd)
+            exe = ntpath.basename(path) if path else ""
+            if pid_cache is not None:
+                pid_cache[pid] = exe
+    except:
+        pass
+    return exe, get_window_class_name(hwnd)
+
+
+def window_scale(hwnd):
+    """Display scale of the monitor a window is on (1.0 = 96 DPI).
+
+    Only a DPI-aware process gets the real value; otherwise Windows reports
+    96 and this returns 1.0. Also 1.0 off Windows or before Windows 10.
+    """
+    if sys.platform != "win32":
+        return 1.0
+    try:
+        dpi = ctypes.windll.user32.GetDpiForWindow(ctypes.c_void_p(hwnd))
+        return dpi / 96.0 if dpi else 1.0
+    except Exception:
+        return 1.0
+
+
+def enable_dpi_awareness():
+    """Make this process per-monitor DPI aware; call before the first window.
+
+    Returns True when Windows accepted it. Without it, Windows stretches
+    the panel bitmap on high-DPI monitors and every icon comes out blurry.
+    """
+    if sys.platform != "win32":
+        return False
+    try:
+        if ctypes.windll.user32.SetProcessDpiAwarenessContext(ctypes.c_void_p(PER_MONITOR_AWARE_V2)):
+            return True
+    except Exception:
+        pass
+    try:
+        # Windows 8.1: PROCESS_PER_MONITOR_DPI_AWARE
+        return ctypes.windll.shcore.SetProcessDpiAwareness(2) == 0
+    except Exception:
+        return False
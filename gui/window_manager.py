@@ -8,18 +8,110 @@ from PIL import Image
 import ctypes
 import json
 import os
+try:
+    from .window_info import get_window_exe_path, describe_window
+except ImportError:
+    from window_info import get_window_exe_path, describe_window
+try:
+    from .topmost_watchdog import TopmostWatchdog
+    from .window_reaper import WindowReaper
+    from .thumbnails import ThumbnailCache
+    from . import profiles
+    from .icon_processing import process_batch
+    from .usage_history import UsageHistory, history_path
+    from .perf_config import PerfConfig, config_path
+    from .window_batch import set_topmost_many
+    from .window_filter import WindowFilter
+    from .icon_variants import IconVariantCache, icon_size
+except ImportError:
+    from topmost_watchdog import TopmostWatchdog
+    from window_reaper import WindowReaper
+    from thumbnails import ThumbnailCache
+    import profiles
+    from icon_processing import process_batch
+    from usage_history import UsageHistory, history_path
+    from perf_config import PerfConfig, config_path
+    from window_batch import set_topmost_many
+    from window_filter import WindowFilter
+    from icon_variants import IconVariantCache, icon_size
+
+# Varsayılan veri dosyası (proje kök dizini)
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "top_window_data.json")
+
+
+def extract_icon_sized(path, size):
+    """Exe'deki ikonun ``size`` piksele en yakın kaynağını çeker; HICON veya 0.
+
+    ``ExtractIconEx`` only returns the 32 px (and 16 px) images. On a
+    high-DPI monitor those would be stretched, so the exact size is asked
+    for with ``PrivateExtractIconsW``, which picks the best image of the
+    icon group. The caller destroys the handle.
+    """
+    try:
+        hicon = ctypes.c_void_p(0)
+        icon_id = ctypes.c_uint(0)
+        found = ctypes.windll.user32.PrivateExtractIconsW(
+            ctypes.c_wchar_p(path), 0, size, size, ctypes.byref(hicon), ctypes.byref(icon_id), 1, 0)
+        if found == 1 and hicon.value:
+            return hicon.value
+    except Exception:
+        pass
+    return 0
+
 
 class WindowManager:
-    def __init__(self):
+    def __init__(self, data_file=None):
         # Üstte tutulan pencerelerin HWND'lerini sakla
         self.topmost_hwnds = set()
+        self.topmost_titles = {} # hwnd -> title (tepsi menüsü için, native sorgu yok)
         self.icon_cache = {} # hwnd -> Image cache
+        # Kapanan pencereleri tüm tablolardan birlikte temizler
+        self.reaper = WindowReaper()
+        self.reaper.register(self.topmost_hwnds)
+        self.reaper.register(self.topmost_titles)
+        self.reaper.register(self.icon_cache)
+        # Üzerine gelinen kartlar için küçük resimler (işçi thread'i GUI başlatır)
+        self.thumbnails = self.reaper.register(ThumbnailCache())
+        # Yüksek DPI ekranlar için büyük ikonlar: (hwnd, boyut) başına, bütçeli
+        self.icon_variants = self.reaper.register(IconVariantCache())
+        self.data_file = data_file or DEFAULT_DATA_FILE
         self.previous_windows = self.load_previous_windows()
+        # Gizli (cloaked), araç ve sahipli pencereler ikon ve kart maliyetine girmeden elenir
+        self.window_filter = WindowFilter(self.get_setting("window_filter"))
+        # Sabitleme geçmişi: ızgara en çok kullanılan uygulamalarla başlar
+        self.history = UsageHistory(history_path(self.data_file))
+        # Topmost durumunu kaybeden pencereleri geri alan bekçi (zamanlama GUI'de)
+        self.watchdog = TopmostWatchdog(lambda: self.topmost_hwnds, reaper=self.reaper)
+        # Sabitlenen küme değişince çağrılır (ör. tepsi menüsünü yenilemek için)
+        self.on_pinned_changed = None
+        # İz kaydı açıksa (TOPWINDOW_TRACE) sabitleme komutları da yazılır
+        self.recorder = None
+        # Aralıklar, önbellek boyutları, animasyonlar (dosya değişince canlı uygulanır)
+        self.config = PerfConfig(config_path(self.data_file))
+        self.config.subscribe(lambda changed: self.apply_config())
+        self.config.reload_if_changed()
+        self.apply_config()
+
+    def apply_config(self):
+        """Push the current PerfConfig values into the manager's services."""
+        c = self.config
+        self.icon_timeout_ms = c.icon_timeout_ms
+        self.icon_cache_max = c.icon_cache_max
+        self.watchdog.min_interval = c.watchdog_min_ms
+        self.watchdog.max_interval = max(c.watchdog_max_ms, c.watchdog_min_ms)
+        self.watchdog.interval = min(max(self.watchdog.interval, self.watchdog.min_interval),
+                                     self.watchdog.max_interval)
+        thumbs = self.thumbnails
+        thumbs.refresh_interval = c.thumbnail_refresh_s
+        thumbs.cpu_share = c.thumbnail_cpu_share
+        thumbs.resize(int(c.thumbnail_cache_mb * 1024 * 1024))
+        self.icon_variants.resize(int(c.icon_variant_cache_mb * 1024 * 1024))
+        self.trim_icon_cache()
         
     def load_previous_windows(self):
         """Load previously selected windows from JSON file"""
         try:
-            window_data_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "top_window_data.json")
+            window_data_file = self.data_file
             if os.path.exists(window_data_file):
                 with open(window_data_file, 'r') as f:
                     data = json.load(f)
@@ -31,61 +123,112 @@ class WindowManager:
     def save_previous_windows(self, window_titles):
         """Save selected window titles to JSON file"""
         try:
-            window_data_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "top_window_data.json")
-            data = {"previous_windows": window_titles}
-            with open(window_data_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Diğer anahtarlar (profiller) korunur
+            profiles.update_data_file(self.data_file, previous_windows=window_titles)
         except Exception as e:
             pass
 
+    def get_setting(self, name, default=None):
+        """A small UI preference stored in the data file (e.g. grouped_view)."""
+        return profiles.read_data_file(self.data_file).get(name, default)
+
+    def set_setting(self, name, value):
+        try:
+            profiles.update_data_file(self.data_file, **{name: value})
+        except Exception as e:
+            print(f"Error saving window data: {e}")
+
+    def list_profiles(self):
+        """Names of the saved workspace profiles"""
+        return sorted(profiles.load_profiles(self.data_file))
+
+    def save_profile(self, name, index):
+        """Store the pinned windows (identity + rect) as profile ``name``"""
+        records = [profiles.capture_entry(index.get(hwnd)) for hwnd in list(self.topmost_hwnds)
+                   if hwnd in index]
+        if not records:
+            return None
+        return profiles.save_profile(self.data_file, name, records)
+
+    def apply_profile(self, name, index):
+        """Pin and place a profile's windows and unpin the rest, in one batch.
+
+        Returns (matched, missing) counts or None if there is no such profile.
+        """
+        profile = profiles.load_profiles(self.data_file).get(name)
+        if profile is None:
+            return None
+        pinned = set(self.topmost_hwnds)
+        matched, missing, results = profiles.activate_profile(profile, index, pinned)
+        wanted = {entry.hwnd for _, entry in matched}
+        for hwnd in pinned - wanted:
+            if not results.get(hwnd):
+                continue  # NOTOPMOST başarısız: hâlâ üstte, izlemeye devam
+            self.topmost_hwnds.discard(hwnd)
+            self.topmost_titles.pop(hwnd, None)
+            self.watchdog.forget(hwnd)
+        for _, entry in matched:
+            if results.get(entry.hwnd):
+                self.reaper.track(entry.hwnd)
+                self.topmost_hwnds.add(entry.hwnd)
+                self.topmost_titles[entry.hwnd] = entry.title
+        self.history.record_many([(e.exe, e.class_name, e.title) for _, e in matched
+                                  if results.get(e.hwnd) and e.hwnd not in pinned])
+        if self.recorder is not None:
+            for hwnd, ok in results.items():
+                if ok:
+                    self.recorder.command(hwnd, hwnd in wanted)
+        self.watchdog.poke()
+        self._pinned_changed()
+        self.save_topmost_titles()
+        return len(matched), len(missing)
+
     def get_window_exe_path(self, hwnd):
         """Pencerenin ait olduğu exe dosyasının yolunu bulur."""
+        return get_window_exe_path(hwnd)
+
+    ICON_SIZE = 32
+
+    def icon_size(self, scale=1.0):
+        """Icon edge in pixels for a display scale (``ICON_SIZE`` at 100%)."""
+        return icon_size(scale)
+
+    def render_icon(self, hicon, backgrounds=(0x000000, 0xFFFFFF), size=None):
+        """HICON'u her arka plan rengi üzerine çizer; ham BGRX tamponları döner."""
+        size = size or self.ICON_SIZE
+        buffers = []
+        screen_dc = win32gui.GetDC(0)
         try:
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            # PROCESS_QUERY_INFORMATION (0x0400) | PROCESS_VM_READ (0x0010)
-            h_process = win32api.OpenProcess(0x0410, False, pid)
+            src_dc = win32ui.CreateDCFromHandle(screen_dc)
+            mem_dc = src_dc.CreateCompatibleDC()
+            hbmp = win32ui.CreateBitmap()
+            hbmp.CreateCompatibleBitmap(src_dc, size, size)
+            mem_dc.SelectObject(hbmp)
             try:
-                path = win32process.GetModuleFileNameEx(h_process, 0)
+                for color in backgrounds:
+                    mem_dc.FillSolidRect((0, 0, size, size), color)
+                    win32gui.DrawIconEx(mem_dc.GetSafeHdc(), 0, 0, hicon, size, size, 0, 0, win32con.DI_NORMAL)
+                    buffers.append(hbmp.GetBitmapBits(True))
             finally:
-                win32api.CloseHandle(h_process)
-            return path
-        except:
-            return None
+                # Kaynakları serbest bırak (önemli)
+                mem_dc.DeleteDC()
+                win32gui.DeleteObject(hbmp.GetHandle())
+        finally:
+            win32gui.ReleaseDC(0, screen_dc)
+        return buffers
 
-    def hicon_to_image(self, hicon):
-        """HICON handle'ını PIL Image'a dönüştürür."""
+    def hicon_to_image(self, hicon, size=None):
+        """HICON handle'ını PIL Image'a dönüştürür (alfa ve baskın renk ile)."""
+        size = size or self.ICON_SIZE
         try:
-            hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-            hbmp = win32ui.CreateBitmap()
-            hbmp.CreateCompatibleBitmap(hdc, 32, 32)
-            hdc = hdc.CreateCompatibleDC()
-            hdc.SelectObject(hbmp)
-            
-            # DrawIconEx ile çiz
-            win32gui.DrawIconEx(hdc.GetSafeHdc(), 0, 0, hicon, 32, 32, 0, 0, win32con.DI_NORMAL)
-
-            bmpinfo = hbmp.GetInfo()
-            bmpstr = hbmp.GetBitmapBits(True)
-            img = Image.frombuffer(
-                'RGB',
-                (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                bmpstr, 'raw', 'BGRX', 0, 1)
-            
-            # Kaynakları serbest bırak (önemli)
-            hdc.DeleteDC()
-            win32gui.DeleteObject(hbmp.GetHandle())
-
-            return img
+            black, white = self.render_icon(hicon, size=size)
+            return process_batch([black], [white], (size, size))[0]
         except Exception as e:
             return None
 
-    def get_window_icon(self, hwnd):
-        """Pencere ikonunu alır ve PIL Image olarak döndürür."""
-        if hwnd in self.icon_cache:
-            return self.icon_cache[hwnd]
-
-        img = None
-        
+    def _find_icon(self, hwnd, size=None):
+        """Pencerenin ikonunu bulur: (hicon, sonra DestroyIcon edilecekler) veya (0, [])."""
+        size = size or self.ICON_SIZE
         # YÖNTEM 1: Exe yolundan Orijinal İkonu Çek (En Kaliteli)
         try:
             exe_path = self.get_window_exe_path(hwnd)
@@ -93,59 +236,121 @@ class WindowManager:
             is_uwp = exe_path and "ApplicationFrameHost.exe" in exe_path
             
             if exe_path and not is_uwp:
+                # Yüksek DPI: 32 px'i büyütmek yerine tam boyutlu kaynağı iste
+                if size > self.ICON_SIZE:
+                    hicon = extract_icon_sized(exe_path, size)
+                    if hicon:
+                        return hicon, [hicon]
                 # ExtractIconEx büyük ikonları döner
                 large_icons, small_icons = win32gui.ExtractIconEx(exe_path, 0)
                 if large_icons:
-                    hicon = large_icons[0]
-                    img = self.hicon_to_image(hicon)
-                    for h in large_icons: win32gui.DestroyIcon(h)
-                    for h in small_icons: win32gui.DestroyIcon(h)
+                    return large_icons[0], list(large_icons) + list(small_icons)
+                for h in small_icons: win32gui.DestroyIcon(h)
         except Exception:
             pass
 
         # YÖNTEM 2: WM_GETICON / GetClassLong (Fallback & UWP)
-        if img is None:
+        hicon = 0
+        # 2.1 WM_GETICON (SendMessageTimeout güvenlidir)
+        # Timeout varsayılanı 100ms (icon_timeout_ms ayarı)
+        try:
+            res, hicon = win32gui.SendMessageTimeout(hwnd, win32con.WM_GETICON, win32con.ICON_BIG, 0, 0x0002,
+                                                     self.icon_timeout_ms)
+            if hicon == 0:
+                res, hicon = win32gui.SendMessageTimeout(hwnd, win32con.WM_GETICON, win32con.ICON_SMALL, 0, 0x0002,
+                                                         self.icon_timeout_ms)
+        except: pass
+
+        # 2.2 GetClassLong (Mesaj döngüsü cevap vermezse)
+        if hicon == 0:
             try:
-                hicon = 0
-                # 2.1 WM_GETICON (SendMessageTimeout güvenlidir)
-                # Timeout süresini 100ms'ye indirdik (daha hızlı yanıt için)
-                try:
-                    res, hicon = win32gui.SendMessageTimeout(hwnd, win32con.WM_GETICON, win32con.ICON_BIG, 0, 0x0002, 100)
-                    if hicon == 0:
-                        res, hicon = win32gui.SendMessageTimeout(hwnd, win32con.WM_GETICON, win32con.ICON_SMALL, 0, 0x0002, 100)
-                except: pass
-
-                # 2.2 GetClassLong (Mesaj döngüsü cevap vermezse)
-                if hicon == 0:
-                    try:
-                        hicon = win32gui.GetClassLong(hwnd, win32con.GCL_HICON)
-                    except: pass
-                
-                if hicon == 0:
-                    try:
-                        # GCL_HICONSM = -34
-                        hicon = win32gui.GetClassLong(hwnd, -34)
-                    except: pass
-                
-                if hicon != 0:
-                    img = self.hicon_to_image(hicon)
-            except:
+                hicon = win32gui.GetClassLong(hwnd, win32con.GCL_HICON)
+            except: pass
+        
+        if hicon == 0:
+            try:
+                # GCL_HICONSM = -34
+                hicon = win32gui.GetClassLong(hwnd, -34)
+            except: pass
+        return hicon, []
+
+    def has_icon(self, hwnd, scale=1.0):
+        size = self.icon_size(scale)
+        if size == self.ICON_SIZE:
+            return hwnd in self.icon_cache
+        return self.icon_variants.has(hwnd, size)
+
+    def prefetch_icons(self, hwnds, scale=1.0):
+        """Önbellekte olmayan ikonları tek toplu geçişte işler.
+
+        Every missing icon is rendered on black and on white, then all of them
+        go through one NumPy pass (alpha recovery + dominant accent color,
+        stored in ``img.info['accent']``). Returns the number of new icons.
+
+        ``scale`` is the display scale of the panel's monitor. 100% icons go
+        to ``icon_cache``; larger ones are extracted at their real size and
+        kept per (hwnd, size) in ``icon_variants``, so moving the panel to a
+        monitor with another scale only renders the sizes not seen before.
+        """
+        size = self.icon_size(scale)
+        base = size == self.ICON_SIZE
+        hwnds = list(hwnds)
+        missing, blacks, whites = [], [], []
+        for hwnd in hwnds:
+            if self.has_icon(hwnd, scale):
+                continue
+            hicon, owned = self._find_icon(hwnd, size)
+            try:
+                if hicon:
+                    black, white = self.render_icon(hicon, size=size)
+                    missing.append(hwnd)
+                    blacks.append(black)
+                    whites.append(white)
+            except Exception:
                 pass
+            finally:
+                for h in owned: win32gui.DestroyIcon(h)
+        if not missing:
+            return 0
+        images = process_batch(blacks, whites, (size, size))
+        for hwnd, img in zip(missing, images):
+            self.reaper.track(hwnd)
+            if base:
+                self.icon_cache[hwnd] = img
+            else:
+                self.icon_variants.put(hwnd, size, img)
+        if base:
+            self.trim_icon_cache(keep=hwnds)
+        return len(missing)
 
-        if img:
-            self.icon_cache[hwnd] = img
-            return img
-        
-        return None
+    def trim_icon_cache(self, keep=()):
+        """En eski ikonları ``icon_cache_max``a kadar atar (``keep`` içindekiler kalır)."""
+        excess = len(self.icon_cache) - self.icon_cache_max
+        if excess <= 0:
+            return 0
+        keep = set(keep)
+        victims = [h for h in self.icon_cache if h not in keep][:excess]
+        for hwnd in victims:
+            del self.icon_cache[hwnd]
+        return len(victims)
+
+    def get_window_icon(self, hwnd, scale=1.0):
+        """Pencere ikonunu alır ve PIL Image olarak döndürür."""
+        if not self.has_icon(hwnd, scale):
+            self.prefetch_icons([hwnd], scale)
+        size = self.icon_size(scale)
+        if size == self.ICON_SIZE:
+            return self.icon_cache.get(hwnd)
+        return self.icon_variants.get(hwnd, size)
+
+    def reap_dead_windows(self):
+        """Kapanmış / yeniden kullanılmış hwnd'leri tüm tablolardan çıkarır."""
+        return self.reaper.sweep()
 
     def get_visible_windows(self):
         """Görünür ve geçerli pencereleri listeler."""
-        windows = gw.getAllWindows()
-        valid_windows = []
-        for win in windows:
-            if win.title.strip() and win.visible and not win.title.startswith("TopWindow"):
-                valid_windows.append(win)
-        return valid_windows
+        self.reap_dead_windows()
+        return self.window_filter.windows(gw.getAllWindows())
 
     def is_always_on_top(self, hwnd):
         """Bir pencerenin zaten topmost olup olmadığını kontrol eder (win32 API)."""
@@ -162,15 +367,144 @@ class WindowManager:
         else:
             self.set_topmost(window)
 
-    def set_topmost(self, window):
+    def toggle_foreground(self):
+        """Ön plandaki pencereyi sabitler / bırakır (numaralandırma yok).
+
+        Runs on the hotkey thread, so only the SetWindowPos happens here.
+        Returns (window, now_topmost) for ``finish_toggle`` on the GUI
+        thread, or None if the foreground window is not something we should
+        touch (desktop, taskbar, our own panel).
+
+        An unpinned window leaves ``topmost_hwnds`` under the watchdog lock
+        before HWND_NOTOPMOST is sent; otherwise a sweep in between would
+        see it as lost and pin it again.
+        """
+        hwnd = win32gui.GetForegroundWindow()
+        if not hwnd:
+            return None
+        window = gw.Win32Window(hwnd)
+        title = window.title
+        if not title.strip() or title.startswith("TopWindow"):
+            return None
+        pin = not self.is_always_on_top(hwnd)
         try:
+            with self.watchdog.lock:
+                if not pin:
+                    self.topmost_hwnds.discard(hwnd)
+                win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST if pin else win32con.HWND_NOTOPMOST,
+                                      0, 0, 0, 0, win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+        except Exception:
+            return None
+        return window, pin
+
+    def finish_toggle(self, window, topmost):
+        """GUI-thread bookkeeping for a ``toggle_foreground()``: tables, history, tray."""
+        if topmost:
+            self._track_pinned(window)
+        else:
+            self._untrack_pinned(window)
+
+    def adopt_topmost(self, windows):
+        """Take over windows that are already on top (CLI -> GUI handoff).
+
+        No SetWindowPos is issued, so the windows never drop out of the
+        topmost band during the switch.
+        """
+        for window in windows:
             hwnd = window._hWnd
-            win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
-                                 win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+            self.reaper.track(hwnd)
             self.topmost_hwnds.add(hwnd)
-            # Add window title to previous windows list
+            self.topmost_titles[hwnd] = window.title
             if window.title not in self.previous_windows:
                 self.previous_windows.append(window.title)
+        self.watchdog.poke()
+        self._pinned_changed()
+
+    def _pinned_changed(self):
+        if self.on_pinned_changed:
+            try:
+                self.on_pinned_changed()
+            except Exception:
+                pass
+
+    def forget_topmost(self, hwnd):
+        """Stop tracking a window as pinned without touching it"""
+        self.topmost_hwnds.discard(hwnd)
+        self.topmost_titles.pop(hwnd, None)
+        self._pinned_changed()
+
+    def pinned_windows(self):
+        """(hwnd, title) pairs of the pinned windows, from the cache only"""
+        titles = self.topmost_titles
+        return sorted(((hwnd, titles.get(hwnd, "")) for hwnd in list(self.topmost_hwnds)),
+                      key=lambda pair: pair[1].lower())
+
+    def save_topmost_titles(self):
+        """Persist the titles of the currently pinned windows"""
+        active_windows = []
+        for hwnd in list(self.topmost_hwnds):
+            try:
+                window_title = win32gui.GetWindowText(hwnd)
+                if window_title:
+                    active_windows.append(window_title)
+            except:
+                pass
+        self.save_previous_windows(active_windows)
+
+    def _record_usage(self, hwnd, title, pinned):
+        if self.recorder is not None:
+            self.recorder.command(hwnd, pinned)
+        try:
+            exe, class_name = describe_window(hwnd)
+            self.history.record(exe, class_name, title, pinned)
+        except Exception:
+            pass
+
+    def rank_key(self):
+        """Sort key for WindowIndex.reorder: most used apps first."""
+        return self.history.rank_key()
+
+    def set_topmost_many(self, entries, topmost=True):
+        """Pin / unpin many IndexedWindow entries in one batch; returns {hwnd: ok}.
+
+        The bookkeeping matches ``set_topmost``/``unset_topmost``, but the
+        history is written in one transaction and listeners hear about the
+        change only once.
+        """
+        entries = list(entries)
+        if not entries:
+            return {}
+        results = set_topmost_many([e.hwnd for e in entries], topmost)
+        done = [e for e in entries if results.get(e.hwnd)]
+        for e in done:
+            if topmost:
+                self.reaper.track(e.hwnd)
+                self.topmost_hwnds.add(e.hwnd)
+                self.topmost_titles[e.hwnd] = e.title
+                if e.title not in self.previous_windows:
+                    self.previous_windows.append(e.title)
+            else:
+                self.topmost_hwnds.discard(e.hwnd)
+                self.topmost_titles.pop(e.hwnd, None)
+                self.watchdog.forget(e.hwnd)
+                if e.title in self.previous_windows:
+                    self.previous_windows.remove(e.title)
+        if done:
+            if topmost:
+                self.watchdog.poke()
+            self.history.record_many([(e.exe, e.class_name, e.title) for e in done], pinned=topmost)
+            if self.recorder is not None:
+                for e in done:
+                    self.recorder.command(e.hwnd, topmost)
+            self._pinned_changed()
+        return results
+
+    def set_topmost(self, window):
+        try:
+            hwnd = window._hWnd
+            win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
+                                 win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+            self._track_pinned(window)
             return True
         except:
             return False
@@ -178,17 +512,38 @@ class WindowManager:
     def unset_topmost(self, window):
         try:
             hwnd = window._hWnd
-            win32gui.SetWindowPos(hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0,
-                                 win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-            if hwnd in self.topmost_hwnds:
-                self.topmost_hwnds.remove(hwnd)
-            # Remove window title from previous windows list
-            if window.title in self.previous_windows:
-                self.previous_windows.remove(window.title)
+            with self.watchdog.lock:
+                self.topmost_hwnds.discard(hwnd)
+                win32gui.SetWindowPos(hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0,
+                                     win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+            self._untrack_pinned(window)
             return True
         except:
             return False
 
+    def _track_pinned(self, window):
+        hwnd = window._hWnd
+        self.reaper.track(hwnd)
+        self.topmost_hwnds.add(hwnd)
+        self.topmost_titles[hwnd] = window.title
+        self.watchdog.poke()
+        self._pinned_changed()
+        self._record_usage(hwnd, window.title, True)
+        # Add window title to previous windows list
+        if window.title not in self.previous_windows:
+            self.previous_windows.append(window.title)
+
+    def _untrack_pinned(self, window):
+        hwnd = window._hWnd
+        self.topmost_hwnds.discard(hwnd)
+        self.topmost_titles.pop(hwnd, None)
+        self.watchdog.forget(hwnd)
+        self._pinned_changed()
+        self._record_usage(hwnd, window.title, False)
+        # Remove window title from previous windows list
+        if window.title in self.previous_windows:
+            self.previous_windows.remove(window.title)
+
     def minimize_window(self, window):
         """Minimize the specified window"""
         try:
@@ -200,6 +555,7 @@ class WindowManager:
 
     def cleanup(self):
         """Çıkışta tüm pencereleri eski haline getirir."""
+        self.reap_dead_windows()
         for hwnd in list(self.topmost_hwnds):
             try:
                 win32gui.SetWindowPos(hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0,
@@ -207,6 +563,8 @@ class WindowManager:
             except:
                 pass
         self.topmost_hwnds.clear()
+        self.topmost_titles.clear()
+        self.history.close()
 
     def hide_app_window(self, root):
         """Hide the application window"""
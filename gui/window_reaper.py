@@ -0,0 +1,80 @@
+import win32gui
+import win32process
+
+
+def get_window_identity(hwnd):
+    """(thread id, process id) of a window, or None if the handle is dead."""
+    try:
+        if not win32gui.IsWindow(hwnd):
+            return None
+        tid, pid = win32process.GetWindowThreadProcessId(hwnd)
+        return (tid, pid) if pid else None
+    except:
+        return None
+
+
+class WindowReaper:
+    """Kapanan pencereleri tüm hwnd tablolarından tek seferde temizler.
+
+    Every dict or set keyed by hwnd is registered once. ``track`` records the
+    owning thread/process of a window when it enters one of them; ``sweep``
+    then checks each known hwnd with IsWindow plus that identity. Dead
+    handles, and handles Windows has since reused for a different window,
+    are evicted from every registered structure together, so a new window
+    never inherits the old one's pinned state or icon.
+    """
+
+    def __init__(self):
+        self._containers = []
+        self._identities = {}  # hwnd -> (tid, pid)
+        self.reaped = 0
+
+    def register(self, container):
+        """Register a dict or set keyed by hwnd; returns it for convenience."""
+        self._containers.append(container)
+        return container
+
+    def track(self, hwnd):
+        """Remember who owns ``hwnd`` right now (call when it is first stored)."""
+        if hwnd not in self._identities:
+            identity = get_window_identity(hwnd)
+            if identity:
+                self._identities[hwnd] = identity
+
+    def is_stale(self, hwnd):
+        identity = get_window_identity(hwnd)
+        if identity is None:
+            return True
+        known = self._identities.get(hwnd)
+        return known is not None and known != identity
+
+    def known_hwnds(self):
+        hwnds = set()
+        for container in self._containers:
+            hwnds.update(list(container))
+        return hwnds
+
+    def sweep(self):
+        """Check every known hwnd once and evict stale ones; returns them."""
+        hwnds = self.known_hwnds()
+        # Hiçbir tabloda kalmayan kimlikleri unut
+        for hwnd in [h for h in self._identities if h not in hwnds]:
+            del self._identities[hwnd]
+        stale = [hwnd for hwnd in hwnds if self.is_stale(hwnd)]
+        if stale:
+            self.evict(stale)
+        return stale
+
+    def evict(self, hwnds):
+        """Drop ``hwnds`` from every registered structure."""
+        for hwnd in hwnds:
+            for container in self._containers:
+                if isinstance(container, dict):
+                    container.pop(hwnd, None)
+                else:
+                    container.discard(hwnd)
+            self._identities.pop(hwnd, None)
+            self.reaped += 1
+
+    def __len__(self):
+        return len(self._identities)
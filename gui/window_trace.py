@@ -0,0 +1,143 @@
+"""Pencere olayı izi: sahada kaydet, benchmarks/replay.py ile tekrar oynat.
+
+A trace is a text file (gzip if the name ends in ``.gz``). The first line
+is a JSON header; every other line is one compact JSON array::
+
+    {"trace": 1, "start": 1718000000.0}
+    [0,"C",65536,"Chat | Microsoft Teams","Teams.exe","TeamsWebView"]
+    [1520,"R",65536,"Chat (1) | Microsoft Teams"]
+    [1533,"S",65540,0]
+    [2010,"P",65536]
+
+The first field is milliseconds since the start. The second is the event
+code:
+
+- ``C`` created, with title, exe and class.
+- ``D`` destroyed.
+- ``R`` renamed.
+- ``S`` style: the window lost (0) or regained (1) topmost.
+- ``P`` pin command.
+- ``U`` unpin command.
+
+The windows that already exist when recording starts are written as ``C``
+events at t=0, so a replay can rebuild the desktop. The ones already
+pinned then (adopted from the CLI, for example) follow as ``P`` events at
+t=0.
+"""
+import gzip
+import json
+import threading
+import time
+
+try:
+    from .window_events import CREATED, DESTROYED, RENAMED
+    from .window_info import describe_window
+except ImportError:
+    from window_events import CREATED, DESTROYED, RENAMED
+    from window_info import describe_window
+
+TRACE_VERSION = 1
+CREATE, DESTROY, RENAME, STYLE, PIN, UNPIN = "C", "D", "R", "S", "P", "U"
+EVENT_NAMES = {CREATE: "create", DESTROY: "destroy", RENAME: "rename",
+               STYLE: "style", PIN: "pin", UNPIN: "unpin"}
+_FROM_WATCHER = {CREATED: CREATE, DESTROYED: DESTROY, RENAMED: RENAME}
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_trace(path):
+    """(header dict, list of event lists) from a trace file."""
+    with _open(path, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        events = [json.loads(line) for line in f if line.strip()]
+    return header, events
+
+
+class TraceRecorder:
+    """Pencere olaylarını ve sabitleme komutlarını iz dosyasına yazar.
+
+    ``on_window_event`` is a ``WindowWatcher`` subscriber, called on the
+    watcher thread. ``style`` and ``command`` are called by the app. Lines
+    are buffered and written every ``flush_every`` events, and on
+    ``close()``. One lock makes every method safe from any thread.
+    """
+
+    def __init__(self, path, flush_every=64, describe=describe_window):
+        self.path = path
+        self.flush_every = flush_every
+        self.describe = describe
+        self.count = 0
+        self._start = time.monotonic()
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._file = _open(path, "w")
+        self._file.write(json.dumps({"trace": TRACE_VERSION, "start": time.time()}) + "\n")
+
+    def _write(self, *record, at=None):
+        if at is None:
+            at = int((time.monotonic() - self._start) * 1000)
+        line = json.dumps([at] + list(record),
+                          ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer.append(line)
+            self.count += 1
+            if len(self._buffer) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer = []
+
+    def _created(self, hwnd, title):
+        try:
+            exe, class_name = self.describe(hwnd)
+        except Exception:
+            exe, class_name = "", ""
+        self._write(CREATE, hwnd, title, exe, class_name)
+
+    def snapshot(self, windows, pinned=()):
+        """Write ``{hwnd: title}`` (e.g. ``watcher.windows``) as the starting desktop.
+
+        ``pinned`` hwnds among them are written as pin commands at t=0.
+        """
+        windows = dict(windows)
+        pid_cache = {}
+        for hwnd, title in windows.items():
+            try:
+                exe, class_name = self.describe(hwnd, pid_cache)
+            except Exception:
+                exe, class_name = "", ""
+            self._write(CREATE, hwnd, title, exe, class_name, at=0)
+        for hwnd in list(pinned):
+            if hwnd in windows:
+                self._write(PIN, hwnd, at=0)
+
+    def on_window_event(self, event):
+        code = _FROM_WATCHER.get(event.kind)
+        if code == CREATE:
+            self._created(event.hwnd, event.title)
+        elif code == RENAME:
+            self._write(RENAME, event.hwnd, event.title)
+        elif code == DESTROY:
+            self._write(DESTROY, event.hwnd)
+
+    def style(self, hwnd, topmost):
+        self._write(STYLE, hwnd, int(bool(topmost)))
+
+    def command(self, hwnd, pinned):
+        self._write(PIN if pinned else UNPIN, hwnd)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+                self._file.close()
+                self._file = None
@@ -5,6 +5,16 @@ import win32gui
 import win32con
 import json
 import os
+import re
+from gui.topmost_watchdog import TopmostWatchdog
+from gui.window_reaper import WindowReaper
+from gui.window_index import WindowIndex, Query
+from gui.window_batch import set_topmost_many
+from gui.hotkey import HotkeyService
+from gui import profiles
+from gui.usage_history import UsageHistory, history_path
+from gui.window_info import describe_window
+from gui.window_filter import WindowFilter
 
 # ANSI color codes for terminal coloring
 class Colors:
@@ -21,9 +31,57 @@ class Colors:
 # Store references to windows that are kept on top
 topmost_windows = {}
 
+def _release_window(hwnd):
+    """Stop tracking a window that keeps dropping topmost on its own"""
+    topmost_windows.pop(hwnd, None)
+
+# Evicts closed windows from topmost_windows (and anything else registered)
+reaper = WindowReaper()
+reaper.register(topmost_windows)
+
+# Reasserts topmost on windows that lost it (runs on a background thread)
+watchdog = TopmostWatchdog(lambda: topmost_windows, on_release=_release_window, reaper=reaper)
+
 # JSON file for persisting window data
 WINDOW_DATA_FILE = "top_window_data.json"
 
+# Pin/unpin history (SQLite, next to WINDOW_DATA_FILE); ranks window lists
+_history = None
+
+def usage_history():
+    """The usage history for the current WINDOW_DATA_FILE"""
+    global _history
+    path = history_path(WINDOW_DATA_FILE)
+    if _history is None or _history.path != path:
+        if _history is not None:
+            _history.close()
+        _history = UsageHistory(path)
+    return _history
+
+def _record_usage(window, pinned):
+    try:
+        exe, class_name = describe_window(window._hWnd)
+        usage_history().record(exe, class_name, window.title, pinned)
+    except Exception:
+        pass
+
+def window_filter():
+    """WindowFilter built from the "window_filter" setting in WINDOW_DATA_FILE"""
+    return WindowFilter(profiles.read_data_file(WINDOW_DATA_FILE).get("window_filter"))
+
+def rank_windows(windows):
+    """Most used apps first (stable); the order is unchanged without history"""
+    windows = list(windows)
+    history = usage_history()
+    if not history.has_data():
+        return windows
+    index = WindowIndex()
+    index.rebuild(windows)
+    return [entry.window for entry in index.reorder(history.rank_key())]
+
+# Non-interactive subcommands (see run_command)
+SUBCOMMANDS = ('list', 'pin', 'unpin', 'restore-all', 'profile')
+
 MENU_OPTIONS = {
     '1': 'Keep window(s) on top',
     '2': 'Restore window(s) from top',
@@ -42,11 +100,9 @@ def load_window_data():
     return {"previous_windows": []}
 
 def save_window_data(window_titles):
-    """Save selected window titles to JSON file"""
+    """Save selected window titles to JSON file (other keys such as profiles are kept)"""
     try:
-        data = {"previous_windows": window_titles}
-        with open(WINDOW_DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        profiles.update_data_file(WINDOW_DATA_FILE, previous_windows=window_titles)
     except Exception as e:
         print(f"Error saving window data: {e}")
 
@@ -68,23 +124,20 @@ def display_menu():
 
 def list_windows():
     """List all available windows"""
-    windows = gw.getAllWindows()
+    # Only show windows with titles that are not empty and not the current console,
+    # most used apps first
+    valid_windows = rank_windows(window_filter().windows(gw.getAllWindows()))
     print(f"\n{Colors.OKBLUE}{Colors.BOLD}Available Windows:{Colors.ENDC}")
     print(f"{Colors.OKCYAN}{'-' * 50}{Colors.ENDC}")
-    valid_windows = []
-    count = 1
-    for window in windows:
-        # Only show windows with titles that are not empty and not the current console
-        if window.title.strip() and not window.title.startswith("TopWindow"):
-            status = f"{Colors.WARNING}[ON TOP]{Colors.ENDC}" if window._hWnd in topmost_windows else ""
-            print(f"{Colors.OKGREEN}{count}.{Colors.ENDC} {window.title} {status}")
-            valid_windows.append(window)
-            count += 1
+    for count, window in enumerate(valid_windows, 1):
+        status = f"{Colors.WARNING}[ON TOP]{Colors.ENDC}" if window._hWnd in topmost_windows else ""
+        print(f"{Colors.OKGREEN}{count}.{Colors.ENDC} {window.title} {status}")
     return valid_windows
 
 def select_multiple_windows(windows):
-    """Allow user to select multiple windows"""
-    print("\nEnter window numbers separated by commas (e.g., 1,3,5) or 'all' for all windows:")
+    """Allow user to select multiple windows by number, search query or 'all'"""
+    print("\nEnter window numbers separated by commas (e.g., 1,3,5) or 'all' for all windows.")
+    print("You can also search title/exe/class: chrome, chrome*, /regex/ (e.g., 2,notepad*)")
     print("Press Enter to return to menu.")
     
     user_input = input(">>> ").strip()
@@ -95,27 +148,51 @@ def select_multiple_windows(windows):
     if user_input.lower() == 'all':
         return windows
     
-    try:
-        indices = [int(x.strip()) - 1 for x in user_input.split(',')]
-        selected_windows = []
-        for idx in indices:
+    # A /regex/ may itself contain commas
+    if len(user_input) > 1 and user_input.startswith('/') and user_input.endswith('/'):
+        tokens = [user_input]
+    else:
+        tokens = [x.strip() for x in user_input.split(',') if x.strip()]
+    
+    index = None
+    selected_windows = []
+    for token in tokens:
+        if token.isdigit():
+            idx = int(token) - 1
             if 0 <= idx < len(windows):
                 selected_windows.append(windows[idx])
             else:
                 print(f"Invalid window number: {idx + 1}")
-        return selected_windows
-    except ValueError:
-        print("Please enter valid numbers separated by commas!")
-        return []
+            continue
+        if index is None:
+            # Only pay for exe/class lookups when a search is actually used
+            index = WindowIndex()
+            index.rebuild(windows)
+        matches = index.search(token)
+        if matches:
+            print(f"'{token}' matched {len(matches)} window(s).")
+            selected_windows.extend(matches)
+        else:
+            print(f"No window matches '{token}'.")
+    
+    # Remove duplicates, keep order
+    unique = {}
+    for window in selected_windows:
+        unique.setdefault(window._hWnd, window)
+    return list(unique.values())
 
 def set_window_always_on_top(window):
     """Set a window to always stay on top using Windows API"""
     try:
         hwnd = window._hWnd
         if hwnd:
-            win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0, 
-                                 win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-            topmost_windows[hwnd] = window  # Keep reference
+            with watchdog.lock:  # bekçi thread'i tabloyu aynı anda gezmesin
+                win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0, 
+                                     win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+                reaper.track(hwnd)
+                topmost_windows[hwnd] = window  # Keep reference
+                watchdog.poke()
+            _record_usage(window, True)
             return True
     except Exception as e:
         print(f"Error setting window to topmost: {e}")
@@ -125,11 +202,16 @@ def unset_window_always_on_top(window):
     """Remove the always on top setting"""
     try:
         hwnd = window._hWnd
-        if hwnd and hwnd in topmost_windows:
+        with watchdog.lock:
+            if not hwnd or hwnd not in topmost_windows:
+                return None
+            # Önce takipten çıkar: araya giren bir tarama pencereyi yeniden sabitlemesin
+            del topmost_windows[hwnd]  # Remove reference
+            watchdog.forget(hwnd)
             win32gui.SetWindowPos(hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0, 
                                  win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-            del topmost_windows[hwnd]  # Remove reference
-            return True
+        _record_usage(window, False)
+        return True
     except Exception as e:
         print(f"Error unsetting window from topmost: {e}")
         return False
@@ -151,8 +233,9 @@ def keep_selected_windows_on_top(windows):
             print(f"{Colors.FAIL}Failed to set window '{window.title}' on top.{Colors.ENDC}")
     
     if success_count > 0:
-        # Save the selected window titles for persistence
-        save_window_data(selected_titles)
+        # Merge the selected window titles into the saved list
+        titles = load_window_data().get("previous_windows", [])
+        save_window_data(titles + [t for t in selected_titles if t not in titles])
         print(f"\n{Colors.OKGREEN}Successfully set {success_count} window(s) on top.{Colors.ENDC}")
     else:
         print(f"\n{Colors.FAIL}No windows were successfully set on top.{Colors.ENDC}")
@@ -176,66 +259,111 @@ def restore_selected_windows(windows):
     else:
         print(f"\n{Colors.FAIL}No windows were successfully restored.{Colors.ENDC}")
 
-def launch_gui_version():
-    """Launch the GUI version of the application"""
-    print(f"\n{Colors.OKBLUE}Launching GUI version...{Colors.ENDC}")
+def handoff_to_gui():
+    """Build the GUI in this process and hand it the pinned windows.
+    
+    The windows are never unpinned: the GUI's manager adopts them as they
+    are and its watchdog takes over from ours. Returns the app (not yet
+    running) with ``handoff_ms`` set to the switch time.
+    """
+    start = time.perf_counter()
+    from gui import modern_ui  # tkinter + PIL only load when the GUI is actually used
+    watchdog.stop()
+    hotkey.stop(timeout=1.0)  # the GUI registers the same hotkey
+    reaper.sweep()
     try:
-        restore_all_windows()  # Clean up before switching to GUI
-        
-        import subprocess
-        import sys
-        import os
-        import ctypes
-        
-        # Get console window handle
-        kernel32 = ctypes.WinDLL('kernel32')
-        user32 = ctypes.WinDLL('user32')
-        hwnd = kernel32.GetConsoleWindow()
-        
-        cmd = []
-        if getattr(sys, 'frozen', False):
-            # Running as compiled executable
-            cmd = [sys.executable, '--gui']
-        else:
-            # Running as script
-            gui_script = os.path.join(os.path.dirname(__file__), 'gui', 'modern_ui.py')
-            cmd = [sys.executable, gui_script]
+        app = modern_ui.TopWindowApp(pinned=list(topmost_windows.values()))
+    except Exception:
+        watchdog.start_thread()
+        hotkey.start()
+        raise
+    topmost_windows.clear()  # the GUI owns them now (and restores them on exit)
+    app.handoff_ms = (time.perf_counter() - start) * 1000.0
+    return app
 
-        # Launch GUI process (removed DETACHED_PROCESS to allow waiting)
-        # We pass the current environment to ensure it inherits necessary context
-        process = subprocess.Popen(cmd)
-        
+def _show_console(show):
+    """Hide (SW_HIDE) or show (SW_SHOW) this process's console window"""
+    try:
+        import ctypes
+        hwnd = ctypes.WinDLL('kernel32').GetConsoleWindow()
         if hwnd:
-            # Hide the console window
-            # SW_HIDE = 0
-            user32.ShowWindow(hwnd, 0)
-            
-        # Wait for the GUI process to finish
-        exit_code = process.wait()
-        
-        # If exit code indicates error, show console again
-        if exit_code != 0 and hwnd:
-            # SW_SHOW = 5
-            user32.ShowWindow(hwnd, 5)
-            print(f"\n{Colors.FAIL}GUI Process exited with error code: {exit_code}{Colors.ENDC}")
-            print(f"{Colors.WARNING}Check 'gui_error_log.txt' in the 'gui' folder for details.{Colors.ENDC}")
-            input("Press Enter to exit...")
-            
-        sys.exit(exit_code)
-        
+            ctypes.WinDLL('user32').ShowWindow(hwnd, 5 if show else 0)
+    except Exception:
+        pass
+
+def _log_gui_error(e):
+    try:
+        from gui.modern_ui import write_error_log
+        return write_error_log(e)
+    except Exception:
+        return None
+
+def launch_gui_version():
+    """Switch to the GUI version in this process; returns True once the GUI has run"""
+    print(f"\n{Colors.OKBLUE}Launching GUI version...{Colors.ENDC}")
+    try:
+        app = handoff_to_gui()
     except Exception as e:
+        log = _log_gui_error(e)
         print(f"{Colors.FAIL}Error launching GUI version: {e}{Colors.ENDC}")
-        # Ensure console is visible if we crashed here
-        try:
-            kernel32 = ctypes.WinDLL('kernel32')
-            user32 = ctypes.WinDLL('user32')
-            hwnd = kernel32.GetConsoleWindow()
-            if hwnd: user32.ShowWindow(hwnd, 5)
-        except: pass
+        if log:
+            print(f"{Colors.WARNING}Details were written to '{log}'.{Colors.ENDC}")
+        print(f"{Colors.WARNING}Your pinned windows were kept; back to the menu.{Colors.ENDC}")
+        return False
+    
+    _show_console(False)
+    try:
+        app.run()
+    except Exception as e:
+        app.manager.cleanup()
+        log = _log_gui_error(e)
+        _show_console(True)
+        print(f"\n{Colors.FAIL}The GUI stopped with an error: {e}{Colors.ENDC}")
+        if log:
+            print(f"{Colors.WARNING}Check '{log}' for details.{Colors.ENDC}")
         input("Press Enter to exit...")
+    return True
+
+def toggle_foreground_window():
+    """Pin/unpin the foreground window without enumerating anything (hotkey).
+    
+    Returns a follow-up that reports and persists the change, so printing and
+    file I/O are not counted in the hotkey latency.
+    """
+    hwnd = win32gui.GetForegroundWindow()
+    if not hwnd:
+        return None
+    window = gw.Win32Window(hwnd)
+    title = window.title
+    if not title.strip() or title.startswith("TopWindow"):
+        return None
+    if hwnd in topmost_windows:
+        unset_window_always_on_top(window)
+        return lambda: print(f"\n{Colors.WARNING}[hotkey] '{title}' restored to normal.{Colors.ENDC}")
+    if not set_window_always_on_top(window):
+        return None
+    
+    def report():
+        print(f"\n{Colors.OKGREEN}[hotkey] '{title}' is now on top.{Colors.ENDC}")
+        titles = load_window_data().get("previous_windows", [])
+        if title not in titles:
+            save_window_data(titles + [title])
+    return report
+
+# Global hotkey that toggles the foreground window (registered in main())
+hotkey = HotkeyService(toggle_foreground_window)
+
+def print_fight_summary():
+    """Show which apps kept dropping topmost during this session"""
+    if watchdog.fight_counts:
+        print(f"\n{Colors.WARNING}Topmost was reapplied for:{Colors.ENDC}")
+        for app, count in watchdog.fight_counts.most_common():
+            print(f"  {app}: {count}x")
 
 def restore_all_windows():
     """Restore all windows when exiting"""
+    watchdog.stop()  # no sweep may re-pin a window while we restore
+    reaper.sweep()  # Skip windows that were closed in the meantime
     if topmost_windows:
         print("\nRestoring all windows...")
         # Create a copy of the dictionary items to avoid modification during iteration
@@ -249,6 +377,10 @@ def main():
     print(f"{Colors.OKBLUE}{Colors.BOLD}TopWindow - Keep Any Window On Top{Colors.ENDC}")
     print(f"{Colors.OKCYAN}{'=' * 40}{Colors.ENDC}")
     
+    watchdog.start_thread()
+    if hotkey.start():
+        print(f"{Colors.OKCYAN}Press {hotkey.hotkey.upper()} to pin/unpin the active window.{Colors.ENDC}")
+    goodbye = False
     try:
         while True:
             display_menu()
@@ -271,7 +403,8 @@ def main():
                     continue
                     
                 # Create list of topmost windows for selection
-                topmost_list = list(topmost_windows.values())
+                with watchdog.lock:
+                    topmost_list = list(topmost_windows.values())
                 print(f"\n{Colors.OKBLUE}{Colors.BOLD}Currently Topmost Windows:{Colors.ENDC}")
                 print(f"{Colors.OKCYAN}{'-' * 30}{Colors.ENDC}")
                 for i, window in enumerate(topmost_list, 1):
@@ -281,15 +414,14 @@ def main():
                 restore_selected_windows(selected_windows)
                 
             elif choice == '3':
-                # Launch GUI version
-                launch_gui_version()
-                break
+                # Switch to the GUI in this process (pinned windows stay on top)
+                if launch_gui_version():
+                    break
                 
             elif choice == '4':
                 # Exit program
                 print(f"\n{Colors.OKGREEN}Exiting program...{Colors.ENDC}")
-                restore_all_windows()
-                print(f"{Colors.OKGREEN}Goodbye!{Colors.ENDC}")
+                goodbye = True
                 break
                 
             else:
@@ -297,14 +429,240 @@ def main():
                 
     except KeyboardInterrupt:
         print(f"\n\n{Colors.WARNING}Program interrupted by user.{Colors.ENDC}")
-        restore_all_windows()
     except Exception as e:
         print(f"{Colors.FAIL}An unexpected error occurred: {e}{Colors.ENDC}")
+    finally:
+        # Ctrl+C ve hata çıkışları da özeti görür (kavgalar asıl orada önemli)
+        print_fight_summary()
         restore_all_windows()
+    if goodbye:
+        print(f"{Colors.OKGREEN}Goodbye!{Colors.ENDC}")
+
+# ═══════════════════════════════════════════════════════════════
+# Scriptable subcommands: top_window.py list|pin|unpin|restore-all
+# ═══════════════════════════════════════════════════════════════
+def build_arg_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="top_window.py",
+        description="Keep windows on top. Without a subcommand the interactive menu starts.",
+        epilog="Patterns: plain words (substring), globs like chrome* or /regex/. "
+               "Repeating a flag ORs its patterns; different flags are ANDed. "
+               "Output is one JSON object per line (NDJSON).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("list", "list windows"),
+                            ("pin", "keep matching windows on top"),
+                            ("unpin", "restore matching windows"),
+                            ("restore-all", "restore the windows TopWindow put on top")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("query", nargs="*", help="search title, exe and class")
+        cmd.add_argument("-t", "--title", action="append", default=[], help="match the window title")
+        cmd.add_argument("-e", "--exe", action="append", default=[], help="match the exe file name")
+        cmd.add_argument("-c", "--class", dest="class_name", action="append", default=[],
+                         help="match the window class")
+        if name == "list":
+            cmd.add_argument("--pinned", action="store_true", help="only windows that are on top")
+        else:
+            if name == "restore-all":
+                cmd.add_argument("--any", action="store_true",
+                                 help="also windows that other apps or the user put on top")
+            cmd.add_argument("-n", "--dry-run", action="store_true", help="show matches, change nothing")
+    cmd = sub.add_parser("profile", help="save / apply named sets of pinned windows",
+                         description="save stores the windows that are on top now (optionally "
+                                     "filtered) with their positions; apply pins and places them "
+                                     "again in one batch and unpins the previous profile's windows.")
+    cmd.add_argument("action", choices=("save", "apply", "list", "delete"))
+    cmd.add_argument("name", nargs="?")
+    cmd.add_argument("query", nargs="*", help="save: only pinned windows matching this")
+    cmd.add_argument("-t", "--title", action="append", default=[], help="match the window title")
+    cmd.add_argument("-e", "--exe", action="append", default=[], help="match the exe file name")
+    cmd.add_argument("-c", "--class", dest="class_name", action="append", default=[],
+                     help="match the window class")
+    cmd.add_argument("-n", "--dry-run", action="store_true", help="show what apply would do")
+    return parser
+
+def _compile_matchers(args):
+    """-t/-e/-c patterns as Query objects, compiled once; raises re.error"""
+    return [([Query(p) for p in patterns], field)
+            for patterns, field in ((args.title, "title"), (args.exe, "exe"),
+                                    (args.class_name, "class_name")) if patterns]
+
+def _matches_all(entry, matchers):
+    """AND across flags, OR within a repeated flag"""
+    for queries, field in matchers:
+        value = getattr(entry, field)
+        if not any(q.matches_value(value) for q in queries):
+            return False
+    return True
+
+def _window_record(entry, **extra):
+    record = {"hwnd": entry.hwnd, "title": entry.title, "exe": entry.exe, "class": entry.class_name}
+    record.update(extra)
+    return record
+
+def _is_topmost(hwnd):
+    try:
+        return bool(win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOPMOST)
+    except Exception:
+        return False
+
+def run_command(argv, out=None):
+    """Run one non-interactive subcommand; returns the process exit code.
+
+    Windows are enumerated exactly once; pin/unpin apply every match in a
+    single DeferWindowPos batch. Windows pinned here stay on top after the
+    process exits.
+    """
+    out = out or sys.stdout
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    try:
+        matchers = _compile_matchers(args)
+    except re.error as e:
+        parser.error("invalid /regex/ pattern: %s" % e)
+    if args.command == "profile" and args.action != "list" and not args.name:
+        parser.error("profile %s needs a name" % args.action)
+    if args.command == "profile" and args.action in ("list", "delete"):
+        return _profile_command(args, None, out)
+    if args.command in ("pin", "unpin") and not (args.query or args.title or args.exe or args.class_name):
+        # Boş eşleştirici masaüstündeki her pencereyi değiştirirdi
+        parser.error("%s needs a query or -t/-e/-c" % args.command)
+    
+    index = WindowIndex()
+    index.rebuild(window_filter().windows(gw.getAllWindows()))
+    if usage_history().has_data():
+        index.reorder(usage_history().rank_key())
+    entries = index.search_entries(" ".join(args.query))
+    entries = [e for e in entries if _matches_all(e, matchers)]
+    
+    if args.command == "profile":
+        return _profile_command(args, index, out, entries)
+    if args.command == "list":
+        for entry in entries:
+            topmost = _is_topmost(entry.hwnd)
+            if topmost or not args.pinned:
+                out.write(json.dumps(_window_record(entry, topmost=topmost), ensure_ascii=False) + "\n")
+        out.flush()
+        return 0
+    
+    pin = args.command == "pin"
+    if not pin:
+        entries = [e for e in entries if _is_topmost(e.hwnd)]
+    if args.command == "restore-all" and not args.any:
+        # Sadece TopWindow'un sabitledikleri: kayıtlı başlıklar ve etkin profil
+        data = load_window_data()
+        titles = set(data.get("previous_windows", []))
+        hwnds = set(data.get("active_profile", {}).get("hwnds", []))
+        entries = [e for e in entries if e.title in titles or e.hwnd in hwnds]
+    if not entries:
+        out.write(json.dumps({"action": args.command, "matched": 0}) + "\n")
+        out.flush()
+        return 1
+    
+    results = {} if args.dry_run else set_topmost_many([e.hwnd for e in entries], topmost=pin)
+    action = "pin" if pin else "unpin"
+    for entry in entries:
+        ok = None if args.dry_run else results.get(entry.hwnd, False)
+        out.write(json.dumps(_window_record(entry, action=action, ok=ok), ensure_ascii=False) + "\n")
+    out.flush()
+    
+    if not args.dry_run:
+        usage_history().record_many([(e.exe, e.class_name, e.title) for e in entries
+                                     if results.get(e.hwnd)], pinned=pin)
+    if not args.dry_run:
+        titles = load_window_data().get("previous_windows", [])
+        changed = [e.title for e in entries if results.get(e.hwnd)]
+        if pin:
+            # Merge into the saved list instead of replacing it
+            titles += [t for t in dict.fromkeys(changed) if t not in titles]
+        else:
+            titles = [t for t in titles if t not in changed]
+        save_window_data(titles)
+    return 0 if args.dry_run or all(results.values()) else 1
+
+def _emit(out, record):
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def _profile_command(args, index, out, entries=()):
+    """profile save|apply|list|delete (see build_arg_parser)"""
+    if args.action == "list":
+        for name, profile in sorted(profiles.load_profiles(WINDOW_DATA_FILE).items()):
+            _emit(out, {"profile": name, "saved": profile.get("saved"),
+                        "windows": len(profile.get("windows", []))})
+        out.flush()
+        return 0
+    if args.action == "delete":
+        ok = profiles.delete_profile(WINDOW_DATA_FILE, args.name)
+        _emit(out, {"action": "delete", "profile": args.name, "ok": ok})
+        out.flush()
+        return 0 if ok else 1
+    
+    if args.action == "save":
+        records = [profiles.capture_entry(e) for e in entries if _is_topmost(e.hwnd)]
+        if not records:
+            _emit(out, {"action": "save", "profile": args.name, "windows": 0})
+            out.flush()
+            return 1
+        profiles.save_profile(WINDOW_DATA_FILE, args.name, records)
+        for record in records:
+            _emit(out, dict(record, action="save", profile=args.name))
+        out.flush()
+        return 0
+    
+    # apply: the previous profile's windows (and ours) are unpinned in the same batch
+    data = load_window_data()
+    profile = data.get("profiles", {}).get(args.name)
+    if profile is None:
+        _emit(out, {"action": "apply", "profile": args.name, "error": "no such profile"})
+        out.flush()
+        return 1
+    previous = [h for h in data.get("active_profile", {}).get("hwnds", []) if h in index]
+    pinned = set(previous) | set(topmost_windows)
+    matched, missing = profiles.resolve_profile(profile, index)
+    if args.dry_run:
+        results = {}
+    else:
+        results = profiles.apply_window_positions(profiles.plan_activation(matched, pinned))
+    for record, entry in matched:
+        _emit(out, _window_record(entry, action="pin", profile=args.name, rect=record.get("rect"),
+                                  ok=None if args.dry_run else results.get(entry.hwnd, False)))
+    wanted = {entry.hwnd for _, entry in matched}
+    for hwnd in sorted(pinned - wanted):
+        _emit(out, _window_record(index.get(hwnd), action="unpin", profile=args.name,
+                                  ok=None if args.dry_run else results.get(hwnd, False)))
+    for record in missing:
+        _emit(out, {"action": "pin", "profile": args.name, "title": record.get("title"),
+                    "exe": record.get("exe"), "class": record.get("class"), "ok": False,
+                    "error": "no matching window"})
+    out.flush()
+    if args.dry_run:
+        return 0
+    
+    for hwnd in pinned - wanted:
+        topmost_windows.pop(hwnd, None)
+        watchdog.forget(hwnd)
+    for _, entry in matched:
+        if results.get(entry.hwnd):
+            reaper.track(entry.hwnd)
+            topmost_windows[entry.hwnd] = entry.window
+    watchdog.poke()
+    usage_history().record_many([(e.exe, e.class_name, e.title) for _, e in matched
+                                 if results.get(e.hwnd) and e.hwnd not in pinned])
+    profiles.update_data_file(WINDOW_DATA_FILE, active_profile={
+        "name": args.name, "hwnds": [h for h in wanted if results.get(h)]})
+    return 0 if not missing and all(results.values()) else 1
 
 if __name__ == "__main__":
+    # Let helper modules that 'import top_window' share this module's state
+    sys.modules.setdefault('top_window', sys.modules[__name__])
+    
     # Check if we should launch the GUI directly
-    if len(sys.argv) > 1 and sys.argv[1] == '--gui':
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS + ('-h', '--help'):
+        sys.exit(run_command(sys.argv[1:]))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--tui':
+        import top_window_tui
+        sys.exit(top_window_tui.run_tui())
+    elif len(sys.argv) > 1 and sys.argv[1] == '--gui':
         # Launch GUI directly
         try:
             # Setup logging for startup
@@ -11,7 +11,7 @@ a = Analysis(
         ('*.ico', '.'),
         ('*.png', '.')
     ],
-    hiddenimports=['gui.window_manager', 'gui.modern_ui', 'win32api', 'win32con', 'win32gui'],
+    hiddenimports=['gui.window_manager', 'gui.modern_ui', 'gui.window_info', 'gui.topmost_watchdog', 'gui.window_reaper', 'gui.window_index', 'gui.window_events', 'gui.window_batch', 'gui.hotkey', 'gui.tray', 'gui.thumbnails', 'gui.profiles', 'gui.icon_processing', 'gui.usage_history', 'gui.perf_config', 'gui.async_api', 'gui.window_trace', 'gui.stall_detector', 'gui.leak_sentinel', 'gui.window_filter', 'gui.icon_variants', 'gui.power_state', 'top_window_tui', 'win32api', 'win32con', 'win32gui'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
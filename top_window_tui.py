@@ -0,0 +1,229 @@
+"""Full-screen terminal UI for TopWindow (``python top_window.py --tui``).
+
+The window list is enumerated once at start-up; after that it follows the
+changes reported by ``WindowWatcher`` and only the rows that changed are
+redrawn. Keys:
+
+    Up/Down, j/k   move            Space/Enter   toggle topmost
+    /              filter          Esc           clear filter
+    r              restore all     q             quit
+"""
+import queue
+
+import pygetwindow as gw
+
+import top_window
+from gui.window_events import WindowWatcher, CREATED, DESTROYED, RENAMED
+from gui.window_index import WindowIndex
+from gui.window_info import describe_window
+
+try:
+    import curses
+    HAS_CURSES = True
+except ImportError:  # Windows'ta 'windows-curses' paketi gerekir
+    HAS_CURSES = False
+
+HELP = " ↑↓ move  Space toggle  / filter  Esc clear  r restore all  q quit "
+
+
+class WindowListTUI:
+    def __init__(self, stdscr, watcher):
+        self.stdscr = stdscr
+        self.watcher = watcher
+        self.events = queue.Queue()
+        self.index = WindowIndex()
+        self.filter_text = ""
+        self.filtering = False
+        self.rows = []        # hwnds currently shown, in order
+        self.cursor = 0
+        self.top = 0          # first visible row (scrolling)
+        self.rendered = {}    # screen line -> (text, attr) last drawn
+        self.status = ""
+
+        self.index.rebuild(gw.Win32Window(hwnd) for hwnd in watcher.windows)
+        history = top_window.usage_history()
+        if history.has_data():
+            self.index.reorder(history.rank_key())
+        watcher.subscribe(self.events.put)
+        self._apply_filter()
+
+    # ── Model ───────────────────────────────────────────────────
+    def _apply_filter(self):
+        current = self.rows[self.cursor] if self.rows else None
+        self.rows = [e.hwnd for e in self.index.search_entries(self.filter_text)]
+        self.cursor = self.rows.index(current) if current in self.rows else min(self.cursor, max(len(self.rows) - 1, 0))
+
+    def _drain_events(self):
+        changed = False
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            changed = True
+            if event.kind == CREATED:
+                exe, class_name = describe_window(event.hwnd)
+                self.index.add(gw.Win32Window(event.hwnd), exe, class_name, title=event.title)
+            elif event.kind == DESTROYED:
+                self.index.remove(event.hwnd)
+                with top_window.watchdog.lock:  # bekçi thread'i aynı tabloları tarıyor
+                    top_window.reaper.evict([event.hwnd])
+            elif event.kind == RENAMED:
+                self.index.rename(event.hwnd, event.title)
+        if changed:
+            self._apply_filter()
+        return changed
+
+    def _toggle(self, hwnd):
+        window = gw.Win32Window(hwnd)
+        if hwnd in top_window.topmost_windows:
+            ok = top_window.unset_window_always_on_top(window)
+            self.status = ("Restored: " if ok else "Failed to restore: ") + self.index.get(hwnd).title
+        else:
+            ok = top_window.set_window_always_on_top(window)
+            self.status = ("On top: " if ok else "Failed: ") + self.index.get(hwnd).title
+
+    # ── Çizim ───────────────────────────────────────────────────
+    def _put(self, line, text, attr=0):
+        """Write one screen line, skipping it if it is unchanged."""
+        height, width = self.stdscr.getmaxyx()
+        text = text[:width - 1].ljust(width - 1)
+        if self.rendered.get(line) == (text, attr):
+            return
+        self.rendered[line] = (text, attr)
+        try:
+            self.stdscr.addstr(line, 0, text, attr)
+        except curses.error:
+            pass
+
+    def draw(self):
+        height, width = self.stdscr.getmaxyx()
+        list_height = max(height - 3, 1)
+        if self.cursor < self.top:
+            self.top = self.cursor
+        elif self.cursor >= self.top + list_height:
+            self.top = self.cursor - list_height + 1
+
+        pinned = len(top_window.topmost_windows)
+        header = " TopWindow — %d windows, %d on top" % (len(self.rows), pinned)
+        if self.filter_text or self.filtering:
+            header += "   filter: %s%s" % (self.filter_text, "_" if self.filtering else "")
+        self._put(0, header, curses.A_BOLD | curses.A_REVERSE)
+
+        for i in range(list_height):
+            pos = self.top + i
+            if pos < len(self.rows):
+                hwnd = self.rows[pos]
+                entry = self.index.get(hwnd)
+                on_top = hwnd in top_window.topmost_windows
+                text = " %s %s" % ("[ON TOP]" if on_top else "        ", entry.title if entry else "?")
+                attr = curses.color_pair(1) if on_top else 0
+                if pos == self.cursor:
+                    attr |= curses.A_REVERSE
+            else:
+                text, attr = "", 0
+            self._put(1 + i, text, attr)
+
+        self._put(height - 2, " " + self.status, curses.A_DIM)
+        self._put(height - 1, HELP, curses.A_REVERSE)
+        self.stdscr.refresh()
+
+    # ── Döngü ───────────────────────────────────────────────────
+    def handle_key(self, key):
+        """Handle one key from get_wch (str for characters, int for special keys)."""
+        enter = key in ("\n", "\r", curses.KEY_ENTER)
+        if self.filtering:
+            if key == "\x1b":
+                self.filter_text, self.filtering = "", False
+            elif enter:
+                self.filtering = False
+            elif key in ("\x7f", "\b", curses.KEY_BACKSPACE):
+                self.filter_text = self.filter_text[:-1]
+            elif isinstance(key, str) and key.isprintable():
+                self.filter_text += key
+            else:
+                return True
+            self._apply_filter()
+            return True
+
+        last = max(len(self.rows) - 1, 0)
+        page = self.stdscr.getmaxyx()[0] - 3
+        if key in ("q", "Q"):
+            return False
+        if key in (curses.KEY_UP, "k"):
+            self.cursor = max(self.cursor - 1, 0)
+        elif key in (curses.KEY_DOWN, "j"):
+            self.cursor = min(self.cursor + 1, last)
+        elif key == curses.KEY_PPAGE:
+            self.cursor = max(self.cursor - page, 0)
+        elif key == curses.KEY_NPAGE:
+            self.cursor = min(self.cursor + page, last)
+        elif (key == " " or enter) and self.rows:
+            self._toggle(self.rows[self.cursor])
+        elif key == "/":
+            self.filtering = True
+        elif key == "\x1b":
+            self.filter_text = ""
+            self._apply_filter()
+        elif key in ("r", "R"):
+            # Bekçi durdurulur: geri alınan bir pencereyi yeniden sabitleyemez
+            top_window.watchdog.stop()
+            try:
+                for hwnd in list(top_window.topmost_windows):
+                    top_window.unset_window_always_on_top(gw.Win32Window(hwnd))
+            finally:
+                top_window.watchdog.start_thread()
+            self.status = "All windows restored."
+        elif key == curses.KEY_RESIZE:
+            self.rendered.clear()
+            self.stdscr.clear()
+        return True
+
+    def run(self):
+        self.draw()
+        while True:
+            try:
+                key = self.stdscr.get_wch()  # timeout ile: olaylar da işlenir
+            except curses.error:
+                key = None
+            dirty = self._drain_events()
+            if key is not None:
+                if not self.handle_key(key):
+                    break
+                dirty = True
+            if dirty:
+                self.draw()
+
+
+def _main(stdscr):
+    curses.curs_set(0)
+    curses.use_default_colors()
+    curses.init_pair(1, curses.COLOR_GREEN, -1)
+    stdscr.timeout(100)
+    stdscr.keypad(True)
+    if hasattr(curses, "set_escdelay"):
+        curses.set_escdelay(25)
+
+    window_filter = top_window.window_filter()
+    watcher = WindowWatcher(accept=window_filter, accept_title=window_filter.accept_title)
+    watcher.start()
+    top_window.watchdog.start_thread()
+    try:
+        WindowListTUI(stdscr, watcher).run()
+    finally:
+        watcher.stop()
+        top_window.watchdog.stop()  # joins; run_tui restores afterwards
+
+
+def run_tui():
+    """Entry point; restores all windows when the TUI exits."""
+    if not HAS_CURSES:
+        print("The TUI needs curses. On Windows install it with: pip install windows-curses")
+        return 1
+    try:
+        curses.wrapper(_main)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        top_window.restore_all_windows()
+    return 0